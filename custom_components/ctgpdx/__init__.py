@@ -1,17 +1,72 @@
+import asyncio
+
+from aiohttp import ClientError
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    callback,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN, PLATFORMS
+from .const import (
+    ATTR_ARCHIVE,
+    ATTR_TARGET,
+    CONF_DOWNLOAD_DIR,
+    CONF_DOWNLOAD_RATE_LIMIT,
+    CONF_STREAMING,
+    DEFAULT_DOWNLOAD_DIR,
+    DEFAULT_DOWNLOAD_RATE_LIMIT,
+    DEFAULT_STREAMING,
+    DOMAIN,
+    PLATFORMS,
+    SERVICE_DEPLOY_RELEASE,
+    SERVICE_DOWNLOAD_RELEASE,
+    SERVICE_PROFILE_REFRESH,
+)
 from .coordinator import CtgpdxUpdateCoordinator
+from .deploy import DeployError, deploy_archive
+from .download import DownloadState, ReleaseDownloader
+from .openmetrics import CtgpdxMetricsView
+from .profiling import async_profile_refresh
+
+# Only set up from the UI, async_setup just registers the metrics endpoint
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the metrics endpoint, which serves whichever entry is loaded."""
+    hass.http.register_view(CtgpdxMetricsView(hass))
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up CTGP-DX from a config entry."""
-    coordinator = CtgpdxUpdateCoordinator(hass)
+    coordinator = CtgpdxUpdateCoordinator(
+        hass, streaming=entry.options.get(CONF_STREAMING, DEFAULT_STREAMING)
+    )
 
-    # Fetch initial data so we have it when the sensor is set up
+    # Publish the data of the last run right away, so a restart does not wait
+    # for the website. The next refresh follows the persisted schedule.
+    if await coordinator.async_restore() is None:
+        # Fetch initial data so we have it when the sensor is set up
+        await coordinator.async_config_entry_first_refresh()
 
-    await coordinator.async_config_entry_first_refresh()
+    # Downloading the release archive is opt-in
+    if download_dir := entry.options.get(CONF_DOWNLOAD_DIR, DEFAULT_DOWNLOAD_DIR):
+        rate_limit = entry.options.get(
+            CONF_DOWNLOAD_RATE_LIMIT, DEFAULT_DOWNLOAD_RATE_LIMIT
+        )
+        coordinator.downloader = ReleaseDownloader(
+            hass, download_dir, rate_limit=rate_limit * 1000
+        )
+        _async_setup_download_services(hass, entry, coordinator)
+    _async_setup_profile_service(hass, entry, coordinator)
 
     # Store the coordinator object
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
@@ -19,11 +74,124 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Set up the platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Reload the entry when the options change
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     return True
 
 
+def _async_setup_download_services(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: CtgpdxUpdateCoordinator
+) -> None:
+    """Register the services downloading and deploying the release archive."""
+    downloader = coordinator.downloader
+    assert downloader is not None
+    deploy_lock = asyncio.Lock()
+
+    async def _async_download_release(call: ServiceCall) -> None:
+        """Start downloading the archive linked on the website."""
+        if downloader.running:
+            raise HomeAssistantError("The CTGP-DX release is already being downloaded")
+        if not hass.config.is_allowed_path(str(downloader.directory)):
+            raise HomeAssistantError(
+                f"{downloader.directory} is not in allowlist_external_dirs"
+            )
+        if (url := coordinator.download_url) is None:
+            raise HomeAssistantError("No download link found on the CTGP-DX website")
+
+        # Progress is reported by the download progress sensor. Starting eagerly
+        # marks the download as running before another call can check it.
+        entry.async_create_background_task(
+            hass,
+            downloader.async_download(url),
+            f"{DOMAIN}_download_release",
+            eager_start=True,
+        )
+
+    async def _async_deploy_release(call: ServiceCall) -> ServiceResponse:
+        """Update a directory, e.g. on an SD card, with the changed files."""
+        if not (target := call.data.get(ATTR_TARGET)):
+            raise HomeAssistantError(f"The {ATTR_TARGET} directory is required")
+        if not (archive := call.data.get(ATTR_ARCHIVE)):
+            if downloader.progress.state is not DownloadState.COMPLETE:
+                raise HomeAssistantError(
+                    "Download the CTGP-DX release first or pass an archive"
+                )
+            archive = downloader.progress.path
+        for path in (target, archive):
+            if not hass.config.is_allowed_path(str(path)):
+                raise HomeAssistantError(f"{path} is not in allowlist_external_dirs")
+        if deploy_lock.locked():
+            raise HomeAssistantError("The CTGP-DX release is already being deployed")
+
+        async with deploy_lock:
+            try:
+                result = await hass.async_add_executor_job(
+                    deploy_archive, archive, target
+                )
+            except DeployError as err:
+                raise HomeAssistantError(str(err)) from err
+        return result.as_dict()
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_DOWNLOAD_RELEASE, _async_download_release
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DEPLOY_RELEASE,
+        _async_deploy_release,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    @callback
+    def _async_remove_services() -> None:
+        hass.services.async_remove(DOMAIN, SERVICE_DOWNLOAD_RELEASE)
+        hass.services.async_remove(DOMAIN, SERVICE_DEPLOY_RELEASE)
+
+    entry.async_on_unload(_async_remove_services)
+
+
+def _async_setup_profile_service(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: CtgpdxUpdateCoordinator
+) -> None:
+    """Register the service profiling a refresh."""
+    profile_lock = asyncio.Lock()
+
+    async def _async_profile_refresh(call: ServiceCall) -> ServiceResponse:
+        """Fetch and process the page once under the profilers."""
+        if profile_lock.locked():
+            raise HomeAssistantError("A CTGP-DX refresh is already being profiled")
+
+        async with profile_lock:
+            try:
+                return await async_profile_refresh(hass, coordinator)
+            except (ClientError, TimeoutError) as err:
+                raise HomeAssistantError(
+                    f"Error communicating with CTGP-DX server: {err}"
+                ) from err
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE_REFRESH,
+        _async_profile_refresh,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    @callback
+    def _async_remove_service() -> None:
+        hass.services.async_remove(DOMAIN, SERVICE_PROFILE_REFRESH)
+
+    entry.async_on_unload(_async_remove_service)
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Handle options update."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator: CtgpdxUpdateCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_shutdown()
     return unload_ok
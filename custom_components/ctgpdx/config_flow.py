@@ -2,10 +2,20 @@
 
 from __future__ import annotations
 
+import voluptuous as vol
+
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 
-from .const import DOMAIN
+from .const import (
+    CONF_DOWNLOAD_DIR,
+    CONF_DOWNLOAD_RATE_LIMIT,
+    CONF_STREAMING,
+    DEFAULT_DOWNLOAD_DIR,
+    DEFAULT_DOWNLOAD_RATE_LIMIT,
+    DEFAULT_STREAMING,
+    DOMAIN,
+)
 
 
 async def _async_has_devices(hass: HomeAssistant) -> bool:
@@ -20,6 +30,14 @@ class CtgpdxConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ignor
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> CtgpdxOptionsFlow:
+        """Get the options flow for this handler."""
+        return CtgpdxOptionsFlow()
+
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
         # Check if an entry is already configured
@@ -33,3 +51,38 @@ class CtgpdxConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ignor
 
         # Show the user a form with no fields, just a submit button.
         return self.async_show_form(step_id="user")
+
+
+class CtgpdxOptionsFlow(config_entries.OptionsFlow):
+    """Handle the options for CTGP Deluxe Version."""
+
+    async def async_step_init(self, user_input=None):
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_STREAMING,
+                        default=self.config_entry.options.get(
+                            CONF_STREAMING, DEFAULT_STREAMING
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_DOWNLOAD_DIR,
+                        default=self.config_entry.options.get(
+                            CONF_DOWNLOAD_DIR, DEFAULT_DOWNLOAD_DIR
+                        ),
+                    ): str,
+                    vol.Optional(
+                        CONF_DOWNLOAD_RATE_LIMIT,
+                        default=self.config_entry.options.get(
+                            CONF_DOWNLOAD_RATE_LIMIT, DEFAULT_DOWNLOAD_RATE_LIMIT
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                }
+            ),
+        )
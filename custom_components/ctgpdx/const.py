@@ -9,17 +9,99 @@ DOMAIN = "ctgpdx"
 LOGGER = logging.getLogger(__package__)
 
 # Configuration constants
-PLATFORMS = [Platform.SENSOR]
+PLATFORMS = [Platform.SENSOR, Platform.UPDATE]
 
-# Update interval
+# Update interval, used as long as no release has been observed
 UPDATE_INTERVAL = timedelta(hours=6)
 
+# Adaptive polling, see scheduler.py
+HOT_UPDATE_INTERVAL = timedelta(hours=1)
+MAX_UPDATE_INTERVAL = timedelta(hours=24)
+RETRY_INTERVAL = timedelta(minutes=5)
+RELEASE_WINDOW = timedelta(days=1)
+POLL_JITTER = 0.1
+MAX_RELEASE_HISTORY = 10
+
+# Minimum time between two requests, more frequent refreshes reuse the data
+MIN_FETCH_INTERVAL = timedelta(minutes=1)
+
+# Retries within one refresh, with delays in seconds
+FETCH_ATTEMPTS = 3
+FETCH_BACKOFF = 2.0
+FETCH_MAX_DELAY = 30.0
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Circuit breaker around the page fetch
+BREAKER_THRESHOLD = 3
+BREAKER_COOLDOWN = timedelta(minutes=30)
+
 # Website to scrape
 URL = "https://www.ctgpdx.com/download"
 
+# File hosters linked as fallback for the release archive
+MIRROR_HOSTS = frozenset({"drive.google.com", "docs.google.com"})
+
+# Persistent cache for HTTP validators and the last extracted data
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.cache"
+ZIP_INDEX_STORAGE_KEY = f"{DOMAIN}.zip_index"
+
+# Largest central directory read from the release archive, see zip_index.py
+MAX_CENTRAL_DIRECTORY_SIZE = 16 * 1024 * 1024
+
+# Options
+CONF_STREAMING = "streaming"
+DEFAULT_STREAMING = False
+CONF_DOWNLOAD_DIR = "download_dir"
+CONF_DOWNLOAD_RATE_LIMIT = "download_rate_limit"
+DEFAULT_DOWNLOAD_DIR = ""
+DEFAULT_DOWNLOAD_RATE_LIMIT = 0
+
+# Services
+SERVICE_DOWNLOAD_RELEASE = "download_release"
+SERVICE_DEPLOY_RELEASE = "deploy_release"
+SERVICE_PROFILE_REFRESH = "profile_refresh"
+ATTR_TARGET = "target"
+ATTR_ARCHIVE = "archive"
+
+# Parser backend turning the page into text, BeautifulSoup is the fallback
+DEFAULT_PARSER_BACKEND = "html_parser"
+
+# Size of the chunks read from the page when streaming
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Number of versions whose release notes are kept in memory
+RELEASE_NOTES_CACHE_SIZE = 8
+
+# Downloading the release archive, see download.py
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_ATTEMPTS = 5
+DOWNLOAD_PROGRESS_INTERVAL = 1.0
+
+# Probing the mirrors of the release archive, see mirrors.py
+MIRROR_PROBE_INTERVAL = timedelta(hours=24)
+MIRROR_PROBE_CONCURRENCY = 4
+MIRROR_PROBE_BUDGET = 10.0
+MIRROR_PROBE_BYTES = 256 * 1024
+
+# Extracting the release archive onto an SD card, see deploy.py
+DEPLOY_CHUNK_SIZE = 1024 * 1024
+DEPLOY_WORKERS = 4
+
+# Number of refreshes whose timings are kept, see metrics.py
+METRICS_SAMPLES = 50
+# Upper bounds of the histogram buckets served to Prometheus, see openmetrics.py
+METRICS_LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRICS_SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576)
+
+# Length of the lists returned by the profile_refresh service, see profiling.py
+PROFILE_TOP_FUNCTIONS = 15
+PROFILE_TOP_ALLOCATIONS = 10
+
 # Sensor identifiers
 ATTR_VERSION = "version"
 ATTR_DOWNLOAD_SIZE = "download_size"
 ATTR_UNPACKED_SIZE = "unpacked_size"
 ATTR_RELEASE_DATE = "release_date"
+ATTR_FILE_COUNT = "file_count"
 ATTR_DATA_PROVIDED_BY = "data_provided_by"
@@ -2,14 +2,32 @@
 
 from __future__ import annotations
 
+import asyncio
+import codecs
+import hashlib
+import random
 import re
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
 from datetime import datetime, timezone, timedelta
+from email.utils import parsedate_to_datetime
+from html.parser import HTMLParser
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, NamedTuple
+from urllib.parse import urljoin, urlsplit
 
-from aiohttp import ClientError, ClientTimeout
+from aiohttp import (
+    ClientError,
+    ClientResponseError,
+    ClientSession,
+    ClientTimeout,
+    hdrs,
+)
 from bs4 import BeautifulSoup
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
 from homeassistant.helpers.issue_registry import (
     async_create_issue,
     async_delete_issue,
@@ -19,41 +37,657 @@ from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
+from homeassistant.helpers.storage import Store
 
 from .const import (
     DOMAIN,
     LOGGER,
     URL,
     UPDATE_INTERVAL,
+    MIRROR_HOSTS,
+    MIRROR_PROBE_INTERVAL,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    ZIP_INDEX_STORAGE_KEY,
+    STREAM_CHUNK_SIZE,
+    DEFAULT_PARSER_BACKEND,
+    FETCH_ATTEMPTS,
+    FETCH_BACKOFF,
+    FETCH_MAX_DELAY,
+    MIN_FETCH_INTERVAL,
+    RELEASE_NOTES_CACHE_SIZE,
+    RETRY_STATUSES,
     ATTR_VERSION,
     ATTR_DOWNLOAD_SIZE,
     ATTR_UNPACKED_SIZE,
     ATTR_RELEASE_DATE,
+    ATTR_FILE_COUNT,
+)
+from .metrics import (
+    OUTCOME_CACHED,
+    OUTCOME_ERROR,
+    OUTCOME_NOT_MODIFIED,
+    OUTCOME_UNCHANGED,
+    OUTCOME_UPDATED,
+    PHASE_CONNECT,
+    PHASE_DECODE,
+    PHASE_DNS,
+    PHASE_EXTRACT,
+    PHASE_PARSE,
+    PHASE_TRANSFER,
+    PHASE_TTFB,
+    BufferMeter,
+    RefreshMetrics,
+    RefreshSample,
+    connection_time,
+    held,
+    timed,
+    trace_config,
+)
+from .models import CtgpdxData
+from .scheduler import CircuitBreaker, PollScheduler
+from .mirrors import MirrorProbe, async_probe_mirrors, fastest_mirror
+from .zip_index import ZipIndex, ZipIndexError, async_read_zip_index
+
+if TYPE_CHECKING:
+    from .download import ReleaseDownloader
+
+
+# Start of markup whose content is never shown and commonly carries nonces,
+# tracking snippets or rotating ads
+_NOISE_START_PATTERN = re.compile(
+    r"<(script|style|noscript|iframe|template)\b|<!--", re.I
+)
+_NOISE_END_PATTERNS = {
+    tag: re.compile(f"</{tag}", re.I)
+    for tag in ("script", "style", "noscript", "iframe", "template")
+}
+# A tag cannot contain "<", so an unclosed one fails at the next tag
+_TAG_PATTERN = re.compile(r"<[^<>]*>")
+# Characters of the page copied at a time to hash and to parse it
+_FINGERPRINT_WINDOW = _PARSER_WINDOW = 64 * 1024
+
+
+REGION_RELEASE = "release"
+REGION_CHANGELOG = "changelog"
+
+
+class RegionSpec(NamedTuple):
+    """A section of the page that is located by an anchor keyword.
+
+    Every occurrence of the anchor opens a window of ``length`` characters of
+    text starting at the anchor. Overlapping windows are merged.
+    """
+
+    name: str
+    anchor: str
+    length: int
+
+
+# Sections the fields are extracted from. Text outside of them is only
+# searched for the anchors, so the cost of an extraction depends on the size
+# of these sections and not on the size of the page.
+REGION_SPECS: tuple[RegionSpec, ...] = (
+    # The "Latest Release" block with the version and the download sizes
+    RegionSpec(
+        REGION_RELEASE,
+        r"(?i:latest release|version\s{0,3}:|ctgp deluxe \(|download|unpacked)",
+        1024,
+    ),
+    # The changelog, newest entry first
+    RegionSpec(REGION_CHANGELOG, r"(?i:changelogs?)", 2048),
 )
+# Letters the anchors above start with. Checking them first lets the anchor
+# search skip most positions of the page with a single set lookup.
+_ANCHOR_START = "[CDLUVcdluv]"
+
+
+class FieldSpec(NamedTuple):
+    """One alternative pattern for an extracted field.
+
+    The pattern captures the value in a ``value`` group. Lower tiers take
+    precedence over higher ones. If ``key`` names another field, the pattern
+    must also capture a ``key`` group that has to equal that field's value.
+    The pattern is only matched inside the given regions.
+    """
+
+    field: str
+    tier: int
+    pattern: str
+    key: str | None = None
+    regions: tuple[str, ...] = (REGION_RELEASE,)
+
+
+# Declarative extraction table. The order only matters for alternatives that
+# can start at the same position, where the first one listed wins.
+#
+# Every quantifier is bounded, so a match can never span more than
+# _MAX_MATCH_LENGTH characters. Trying all alternatives at one position is
+# therefore constant work and a scan is linear in the length of the text, no
+# matter how often keywords like "Download" occur without a size after them.
+# Runs that cannot overlap what follows them are possessive ("+") to keep
+# that constant small.
+FIELD_SPECS: tuple[FieldSpec, ...] = (
+    # Version: followed by digits, dots, and internal spaces,
+    # stopping before next keyword or uppercase word like "Download" or "Unpacked"
+    FieldSpec(
+        ATTR_VERSION,
+        0,
+        r"(?i:Version:)\s{0,3}(?P<value>[\d\.a-z\s]{1,32}?)"
+        r"(?=\s{1,3}(?:[A-Z]|Download|Unpacked)|$)",
+    ),
+    # "CTGP Deluxe (1.1.1)"
+    FieldSpec(ATTR_VERSION, 1, r"(?i:CTGP Deluxe \()(?P<value>[\d\.a-z\s]{1,32}?)\)"),
+    # Keywords "Download size" and "Unpacked size" can have internal spaces or
+    # typos like "Download size :", "Unpacked s ize:", etc.
+    FieldSpec(
+        ATTR_DOWNLOAD_SIZE,
+        0,
+        r"(?i:Download.{0,12}?s\s{0,3}ize\s{0,3}:\s{0,3}"
+        r"(?P<value>[\d\.]{1,16}+\s{0,3}[KMGT]?B))",
+    ),
+    FieldSpec(
+        ATTR_UNPACKED_SIZE,
+        0,
+        r"(?i:Unpacked.{0,12}?s\s{0,3}ize\s{0,3}:\s{0,3}"
+        r"(?P<value>[\d\.]{1,16}+\s{0,3}[KMGT]?B))",
+    ),
+    # Any string that looks like a version after "v"
+    FieldSpec(
+        ATTR_VERSION,
+        2,
+        r"(?i:\bv(?P<value>[\d\.a-z\s]{1,32}?)\b)",
+        regions=(REGION_RELEASE, REGION_CHANGELOG),
+    ),
+    # Changelog entry of the extracted version: "v1.1.1 - March 23rd, 2025"
+    FieldSpec(
+        ATTR_RELEASE_DATE,
+        0,
+        r"(?i:(?<![\d\.])v?(?P<key>\d[\d\.a-z]{0,31}+)\s{0,3}-\s{0,3}"
+        r"(?P<value>[A-Za-z]{1,12}+\s{1,3}\d{1,2}+[a-z]{0,2}+,\s{1,3}\d{4}))",
+        key=ATTR_VERSION,
+        regions=(REGION_CHANGELOG,),
+    ),
+    # Any date, e.g. "January 1st, 2026"
+    FieldSpec(
+        ATTR_RELEASE_DATE,
+        1,
+        r"(?P<value>[A-Z][a-z]{1,11}+\s{1,3}\d{1,2}+(?:st|nd|rd|th)?,\s{1,3}20\d{2})",
+        regions=(REGION_RELEASE, REGION_CHANGELOG),
+    ),
+)
+
+# Upper bound for the length of any match of the patterns above
+_MAX_MATCH_LENGTH = 128
+
+
+def _compile_field_specs(specs: tuple[FieldSpec, ...], region: str) -> re.Pattern[str]:
+    """Combine the alternatives of a region into one pattern for one scan.
+
+    Every alternative is wrapped in a lookahead, so a match never consumes
+    text another field could start in. Groups are renamed per alternative:
+    ``a<index>`` for the whole match, ``v<index>`` and ``k<index>`` for the
+    value and key, with the index into ``specs``.
+    """
+    parts = []
+    for index, spec in enumerate(specs):
+        if region not in spec.regions:
+            continue
+        pattern = spec.pattern.replace("(?P<value>", f"(?P<v{index}>").replace(
+            "(?P<key>", f"(?P<k{index}>"
+        )
+        parts.append(f"(?P<a{index}>{pattern})")
+    return re.compile(f"(?=(?:{'|'.join(parts)}))")
+
+
+def _compile_region_specs(specs: tuple[RegionSpec, ...]) -> re.Pattern[str]:
+    """Combine the anchors of all regions into one pattern for one scan."""
+    anchors = "|".join(
+        f"(?P<r{index}>{spec.anchor})" for index, spec in enumerate(specs)
+    )
+    return re.compile(f"(?={_ANCHOR_START})(?:{anchors})")
+
 
+_REGION_PATTERN = _compile_region_specs(REGION_SPECS)
+_FIELD_PATTERNS = {
+    spec.name: _compile_field_specs(FIELD_SPECS, spec.name) for spec in REGION_SPECS
+}
+_PRIMARY_SPECS = tuple(spec for spec in FIELD_SPECS if spec.tier == 0)
 
-class CtgpdxUpdateCoordinator(DataUpdateCoordinator[dict[str, str]]):
+
+class CtgpdxUpdateCoordinator(DataUpdateCoordinator[CtgpdxData]):
     """Class to manage fetching CTGP-DX data."""
 
-    def __init__(self, hass: HomeAssistant) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        streaming: bool = False,
+        parser_backend: str = DEFAULT_PARSER_BACKEND,
+    ) -> None:
         """Initialize."""
         super().__init__(
             hass,
             LOGGER,
             name=DOMAIN,
             update_interval=UPDATE_INTERVAL,
+            # Listeners are only notified if the extracted data changed
+            always_update=False,
+        )
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._cache: dict[str, Any] | None = None
+        # Own session for the page, so connecting can be traced
+        self._session: ClientSession | None = None
+        self.streaming = streaming
+        self._parser_backend = PARSER_BACKENDS[parser_backend]
+        self.scheduler = PollScheduler()
+        self.breaker = CircuitBreaker()
+        self._poll_task: asyncio.Task[dict[str, str]] | None = None
+        # Monotonic time of the last poll that succeeded
+        self._last_success: float | None = None
+        self._model: CtgpdxData | None = None
+        self._release_notes: OrderedDict[str, str] = OrderedDict()
+        self._zip_index_store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, ZIP_INDEX_STORAGE_KEY
         )
-        self._last_success_time: datetime | None = datetime.now(timezone.utc)
+        self.zip_index: ZipIndex | None = None
+        self._zip_index_task: asyncio.Task[None] | None = None
+        self._zip_index_unsupported: set[str] = set()
+        self.mirrors: list[MirrorProbe] = []
+        self._mirror_task: asyncio.Task[None] | None = None
+        self._mirrors_probed: tuple[str, float] | None = None
+        # Set up by the integration if downloading the release is enabled
+        self.downloader: ReleaseDownloader | None = None
+        self.fingerprint_hits = 0
+        self.fingerprint_misses = 0
+        self.metrics = RefreshMetrics()
+
+    @property
+    def session(self) -> ClientSession:
+        """Return the client session fetching the page, created on first use."""
+        if self._session is None:
+            self._session = async_create_clientsession(
+                self.hass, trace_configs=[trace_config()]
+            )
+        return self._session
+
+    async def async_shutdown(self) -> None:
+        """Stop refreshing, cancel the background work and close the session.
+
+        Called when the entry unloads, so the poll, indexing and probing of
+        this coordinator do not outlive a reload.
+        """
+        await super().async_shutdown()
+        tasks = [
+            task
+            for task in (self._poll_task, self._zip_index_task, self._mirror_task)
+            if task is not None
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @property
+    def parser_backend(self) -> ParserBackend:
+        """Return the backend extracting the text of the page."""
+        return self._parser_backend
+
+    @property
+    def fingerprint_hit_ratio(self) -> float | None:
+        """Return the share of fetched pages that did not need to be parsed."""
+        total = self.fingerprint_hits + self.fingerprint_misses
+        if not total:
+            return None
+        return self.fingerprint_hits / total
+
+    async def async_restore(self) -> float | None:
+        """Publish the data persisted by the last run.
+
+        Returns the number of seconds until the next refresh is due, or None if
+        nothing was persisted and the first refresh has to fetch the page. The
+        timer of the coordinator runs until then, the polls after it plan their
+        own interval.
+        """
+        cache = await self._async_load_cache()
+        if not (data := cache.get("data")):
+            return None
+
+        LOGGER.debug("Restored CTGP-DX data of the last run: %s", data)
+        # Looking into the archive waits for a poll, only its index is restored
+        if stored := await self._zip_index_store.async_load():
+            self.zip_index = ZipIndex.from_dict(stored)
+        next_due = cache.get("next_due") or 0
+        delay = max(0.0, next_due - datetime.now(timezone.utc).timestamp())
+        # A zero interval would stop the timer instead of refreshing right away
+        self.update_interval = timedelta(seconds=max(delay, 1))
+        self.async_set_updated_data(self._to_model(data))
+        return delay
+
+    async def async_get_release_notes(self, version: str) -> str | None:
+        """Return the changelog entry of a version as Markdown.
+
+        The page is only read up to the end of that entry. The notes of the
+        most recently viewed versions are kept, so opening the dialog again does
+        not fetch the page again.
+        """
+        if (notes := self._release_notes.get(version)) is not None:
+            self._release_notes.move_to_end(version)
+            return notes
+
+        try:
+            notes = await self._async_scan_page(
+                lambda charset: _ReleaseNotesReader(charset, version)
+            )
+        except (ClientError, TimeoutError) as err:
+            LOGGER.warning("Could not fetch CTGP-DX release notes: %s", err)
+            return None
+
+        if notes is None:
+            LOGGER.debug("No changelog entry found for CTGP-DX %s", version)
+            return None
+        self._release_notes[version] = notes
+        if len(self._release_notes) > RELEASE_NOTES_CACHE_SIZE:
+            self._release_notes.popitem(last=False)
+        return notes
+
+    @property
+    def download_url(self) -> str | None:
+        """Return the link to the release archive found by the last poll."""
+        return next((url for url in self.mirror_urls if _is_archive(url)), None)
+
+    @property
+    def mirror_urls(self) -> list[str]:
+        """Return the links to the release archive and its fallback mirrors.
+
+        They are collected while the regular poll parses the page, so they
+        follow its validators and fingerprint.
+        """
+        return list((self._cache or {}).get("links") or [])
+
+    async def _async_scan_page(
+        self, reader_factory: Callable[[str | None], Any]
+    ) -> Any:
+        """Stream the page into a reader until it has found what it needs.
+
+        The reader is created for the charset of the response. Its feed method
+        returns whether it is done, which closes the connection early, and its
+        close method returns the result.
+        """
+        async with self.session.get(URL, timeout=ClientTimeout(total=10)) as response:
+            response.raise_for_status()
+            reader = reader_factory(_charset(response.headers))
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                if await self.hass.async_add_executor_job(reader.feed, chunk):
+                    response.close()
+                    break
+            return await self.hass.async_add_executor_job(reader.close)
+
+    async def _async_load_cache(self) -> dict[str, Any]:
+        """Load the persisted validators and last result once per run."""
+        if self._cache is None:
+            self._cache = await self._store.async_load() or {}
+            self.scheduler.restore(self._cache.get("changes", []))
+            if self._cache.get("data") and "links" not in self._cache:
+                # Persisted before the links were kept, parse the page once more
+                for key in ("etag", "last_modified", "expires", "fingerprint"):
+                    self._cache.pop(key, None)
+        return self._cache
+
+    async def _async_save_cache(
+        self,
+        headers: Any,
+        data: dict[str, str],
+        revalidated: bool = False,
+        fingerprint: dict[str, str] | None = None,
+        links: list[str] | None = None,
+    ) -> None:
+        """Persist the HTTP validators of a response together with its data.
+
+        The links to the archive only change with a parsed page, otherwise the
+        previous ones are kept. Without a response, as when the cached copy is
+        still fresh, only the schedule is updated.
+        """
+        # A 304 may omit validators, in which case the previous ones stay valid
+        cache = self._cache if revalidated and self._cache else {}
+        if headers is None:
+            cache = self._cache or {}
+            expires = cache.get("expires")
+            headers = {}
+        else:
+            expires = _fresh_until(headers.get(hdrs.CACHE_CONTROL))
+        if links is None:
+            links = (self._cache or {}).get("links", [])
+        next_poll = self.scheduler.next_poll or datetime.now(timezone.utc) + (
+            self.update_interval or UPDATE_INTERVAL
+        )
+        self._cache = {
+            "etag": headers.get(hdrs.ETAG) or cache.get("etag"),
+            "last_modified": headers.get(hdrs.LAST_MODIFIED)
+            or cache.get("last_modified"),
+            "expires": expires,
+            "fingerprint": fingerprint or cache.get("fingerprint"),
+            "data": data,
+            "links": links,
+            "changes": self.scheduler.as_timestamps(),
+            "next_due": next_poll.timestamp(),
+        }
+        await self._store.async_save(self._cache)
+
+    def _mark_success(self, data: dict[str, str]) -> None:
+        """Record a successful update, plan the next one and clear any issue."""
+        self.breaker.record_success()
+        self._last_success = time.monotonic()
+        # The cache still holds the data of the previous poll at this point
+        previous = (self._cache or {}).get("data")
+        changed = previous is not None and data != previous
+        self.update_interval = self.scheduler.record_success(changed)
+        LOGGER.debug("Next CTGP-DX poll planned at %s", self.scheduler.next_poll)
+        async_delete_issue(self.hass, DOMAIN, "website_change")
+
+    async def _async_update_data(self) -> CtgpdxData:
+        """Fetch data from the CTGP-DX website.
+
+        Concurrent refreshes, e.g. from automations calling update_entity while
+        a scheduled poll runs, share a single poll and its result.
+        """
+        if self._poll_task is None:
+            self._poll_task = asyncio.create_task(self._async_poll())
+            self._poll_task.add_done_callback(self._poll_done)
+        else:
+            LOGGER.debug("Joining the CTGP-DX poll that is already running")
+        # Shielded, so a cancelled caller does not cancel the poll for the others
+        model = self._to_model(await asyncio.shield(self._poll_task))
+        self._async_schedule_release_tasks()
+        return model
 
-    async def _async_update_data(self) -> dict[str, str]:
-        """Fetch data from the CTGP-DX website."""
+    def _to_model(self, data: dict[str, str]) -> CtgpdxData:
+        """Return the model of extracted data, reusing it if nothing changed.
+
+        Once the archive of the version has been indexed, its exact unpacked
+        size replaces the one typed on the website.
+        """
+        generation = self._model.generation + 1 if self._model else 1
+        values = normalize_data(data)
+        if (index := self.zip_index) and index.version == values.get(ATTR_VERSION):
+            values[ATTR_UNPACKED_SIZE] = index.unpacked_size
+            values[ATTR_FILE_COUNT] = index.file_count
+        model = CtgpdxData.from_dict(values, generation)
+        if model != self._model:
+            self._model = model
+        return self._model
+
+    @property
+    def fastest_mirror(self) -> MirrorProbe | None:
+        """Return the mirror the archive downloads fastest from."""
+        return fastest_mirror(self.mirrors)
+
+    @property
+    def estimated_download_time(self) -> float | None:
+        """Return the seconds downloading the archive from the fastest mirror takes."""
+        if (
+            self._model is None
+            or (mirror := self.fastest_mirror) is None
+            or not (throughput := mirror.throughput)
+        ):
+            return None
+        size = self._model.download_size
+        if (index := self.zip_index) and index.version == self._model.version:
+            size = index.archive_size
+        if size is None:
+            return None
+        if self.downloader is not None and self.downloader.rate_limit:
+            throughput = min(throughput, self.downloader.rate_limit)
+        return size / throughput
+
+    @callback
+    def _async_schedule_release_tasks(self) -> None:
+        """Look into the archive of the published version in the background.
+
+        Its central directory is indexed once per version. The mirrors are
+        probed once per version and then once per probe interval. Both use
+        the links of the last poll and only start after a successful one.
+        """
+        if self._model is None or (version := self._model.version) is None:
+            return
+        if (
+            (self.zip_index is None or self.zip_index.version != version)
+            and version not in self._zip_index_unsupported
+            and self._zip_index_task is None
+        ):
+            self._zip_index_task = self.hass.async_create_background_task(
+                self._async_update_zip_index(version), f"{DOMAIN}_zip_index"
+            )
+        if self._mirror_task is None and (
+            self._mirrors_probed is None
+            or self._mirrors_probed[0] != version
+            or time.monotonic() - self._mirrors_probed[1]
+            >= MIRROR_PROBE_INTERVAL.total_seconds()
+        ):
+            self._mirror_task = self.hass.async_create_background_task(
+                self._async_probe_mirrors(version), f"{DOMAIN}_probe_mirrors"
+            )
+
+    async def _async_probe_mirrors(self, version: str) -> None:
+        """Measure how fast the mirrors of the archive are."""
+        try:
+            self.mirrors = await async_probe_mirrors(self.hass, self.mirror_urls)
+        finally:
+            self._mirror_task = None
+        self._mirrors_probed = (version, time.monotonic())
+        self.async_update_listeners()
+
+    async def _async_update_zip_index(self, version: str) -> None:
+        """Read the central directory of the archive of a version.
+
+        The index is persisted, so it is only read once per version. If it
+        cannot be read, the values from the website stay in place.
+        """
+        try:
+            stored = await self._zip_index_store.async_load()
+            if stored and stored.get("version") == version:
+                index = ZipIndex.from_dict(stored)
+            else:
+                if (url := self.download_url) is None:
+                    return
+                index = await async_read_zip_index(self.hass, url, version)
+                await self._zip_index_store.async_save(index.as_dict())
+                LOGGER.debug(
+                    "Indexed %s files of the CTGP-DX %s archive",
+                    len(index.entries),
+                    version,
+                )
+        except ZipIndexError as err:
+            LOGGER.warning(
+                "Cannot index the CTGP-DX %s archive, using the sizes from the "
+                "website: %s",
+                version,
+                err,
+            )
+            self._zip_index_unsupported.add(version)
+            return
+        except (ClientError, TimeoutError) as err:
+            LOGGER.debug("Could not index the CTGP-DX %s archive: %s", version, err)
+            return
+        finally:
+            self._zip_index_task = None
+
+        self.zip_index = index
+        if data := (self._cache or {}).get("data"):
+            self.async_set_updated_data(self._to_model(data))
+
+    def _poll_done(self, task: asyncio.Task[dict[str, str]]) -> None:
+        """Let the next refresh start a new poll."""
+        self._poll_task = None
+        if not task.cancelled():
+            # Retrieve the exception, so it is not logged if nobody waits anymore
+            task.exception()
+
+    async def _async_poll(self) -> dict[str, str]:
+        """Poll the CTGP-DX website once, recording how long it took."""
+        sample = RefreshSample(started=datetime.now(timezone.utc))
+        started = time.perf_counter()
         try:
-            session = async_get_clientsession(self.hass)
-            async with session.get(URL, timeout=ClientTimeout(total=10)) as response:
-                response.raise_for_status()
-                html = await response.text()
-        except ClientError as err:
+            return await self._async_poll_page(sample)
+        except Exception as err:
+            sample.outcome = OUTCOME_ERROR
+            sample.error = str(err)
+            sample.error_type = type(err.__cause__ or err).__name__
+            raise
+        finally:
+            sample.duration = time.perf_counter() - started
+            self.metrics.record(sample)
+
+    async def _async_poll_page(self, sample: RefreshSample) -> dict[str, str]:
+        """Fetch and process the page, setting the outcome of the sample."""
+        cache = await self._async_load_cache()
+        cached_data: dict[str, str] | None = cache.get("data")
+
+        if (
+            cached_data
+            and self._last_success is not None
+            and time.monotonic() - self._last_success
+            < MIN_FETCH_INTERVAL.total_seconds()
+        ):
+            # Only after a success, a failed poll is not hidden behind the cache
+            LOGGER.debug("CTGP-DX page was polled just now, reusing its data")
+            sample.outcome = OUTCOME_CACHED
+            return cached_data
+
+        if cached_data and (expires := cache.get("expires")):
+            if datetime.now(timezone.utc).timestamp() < expires:
+                LOGGER.debug("Cached CTGP-DX page is still fresh, skipping request")
+                self._mark_success(cached_data)
+                await self._async_save_cache(None, cached_data)
+                sample.outcome = OUTCOME_CACHED
+                return cached_data
+
+        headers: dict[str, str] = {}
+        if cached_data:
+            # Only ask for a conditional response if we can serve a 304 from cache
+            if etag := cache.get("etag"):
+                headers[hdrs.IF_NONE_MATCH] = etag
+            if last_modified := cache.get("last_modified"):
+                headers[hdrs.IF_MODIFIED_SINCE] = last_modified
+        sample.conditional = bool(headers)
+
+        if not self.breaker.allow_request():
             await self._async_handle_failure()
+            raise UpdateFailed(
+                "CTGP-DX server kept failing, pausing requests until "
+                f"{self.breaker.open_until}"
+            )
+
+        try:
+            status, response_headers, body, page = await self._async_fetch(
+                headers, sample
+            )
+        except (ClientError, TimeoutError) as err:
+            retry_after = None
+            if isinstance(err, ClientResponseError):
+                retry_after = _retry_after(err.headers)
+            await self._async_handle_failure(retry_after)
             raise UpdateFailed(
                 f"Error communicating with CTGP-DX server: {err}"
             ) from err
@@ -61,67 +695,57 @@ class CtgpdxUpdateCoordinator(DataUpdateCoordinator[dict[str, str]]):
             await self._async_handle_failure()
             raise UpdateFailed(f"Unexpected error fetching data: {err}") from err
 
-        try:
-            soup = BeautifulSoup(html, "html.parser")
-            data = {}
-
-            # Normalize text: strip HTML and collapse whitespace
-            raw_text = soup.get_text(separator=" ", strip=True)
-            normalized_text = " ".join(raw_text.split())
-
-            # 1. Extract Version
-            # Match Version: followed by digits, dots, and internal spaces,
-            # stopping before next keyword or uppercase word like "Download" or "Unpacked"
-            version_pattern = (
-                r"(?i:Version:)\s*([\d\.a-z\s]+?)(?=\s+(?:[A-Z]|Download|Unpacked)|$)"
+        sample.bytes_received = (
+            page.bytes_read if page is not None else len(body or b"")
+        )
+        if cached_data and status == HTTPStatus.NOT_MODIFIED:
+            LOGGER.debug("CTGP-DX page not modified, reusing cached data")
+            self._mark_success(cached_data)
+            await self._async_save_cache(
+                response_headers, cached_data, revalidated=True
             )
-            version_match = re.search(version_pattern, normalized_text)
-            if not version_match:
-                # Priority 2: "CTGP Deluxe (1.1.1)"
-                version_match = re.search(
-                    r"(?i:CTGP Deluxe \()([\d\.a-z\s]+?)\)", normalized_text
-                )
+            sample.outcome = OUTCOME_NOT_MODIFIED
+            return cached_data
 
-            if not version_match:
-                # Priority 3: any string that looks like a version after "v"
-                version_match = re.search(
-                    r"\bv([\d\.a-z\s]+?)\b", normalized_text, re.I
+        try:
+            # Only compare fingerprints if there is data to fall back on
+            previous = cache.get("fingerprint") if cached_data else None
+            if page is not None:
+                fingerprint, data = await self.hass.async_add_executor_job(
+                    _finish_stream, page, previous
                 )
-
-            if version_match:
-                # Clean up extracted version by removing internal spaces
-                data[ATTR_VERSION] = version_match.group(1).replace(" ", "").strip()
+                sample.peak_buffer_bytes = page.buffers.peak
+                links = page.links
             else:
-                LOGGER.warning("Could not find version number in page content")
-
-            # 2. Extract Sizes
-            # Keywords "Download size" and "Unpacked size" can have internal spaces or typos
-            # like "Download size :", "Unpacked s ize:", etc.
-            size_pattern = r"Download.*?s\s*ize\s*:\s*([\d\.]+\s*[KMGT]?B)"
-            size_match = re.search(size_pattern, normalized_text, re.I)
-            if size_match:
-                data[ATTR_DOWNLOAD_SIZE] = size_match.group(1)
-
-            unpacked_pattern = r"Unpacked.*?s\s*ize\s*:\s*([\d\.]+\s*[KMGT]?B)"
-            unpacked_match = re.search(unpacked_pattern, normalized_text, re.I)
-            if unpacked_match:
-                data[ATTR_UNPACKED_SIZE] = unpacked_match.group(1)
-
-            # 3. Extract Release Date
-            if ATTR_VERSION in data:
-                ver_escaped = re.escape(data[ATTR_VERSION])
-                date_pattern = rf"v?{ver_escaped}\s*-\s*([A-Za-z]+\s+\d+\w*,\s+\d{{4}})"
-                date_match = re.search(date_pattern, normalized_text, re.I)
-                if date_match:
-                    data[ATTR_RELEASE_DATE] = date_match.group(1)
-
-            if ATTR_RELEASE_DATE not in data:
-                generic_date_match = re.search(
-                    r"([A-Z][a-z]+\s+\d{1,2}(?:st|nd|rd|th)?,\s+20\d{2})",
-                    normalized_text,
+                buffers = BufferMeter()
+                links = []
+                fingerprint, data = await self.hass.async_add_executor_job(
+                    process_page,
+                    body or b"",
+                    _charset(response_headers),
+                    self._parser_backend,
+                    previous,
+                    sample.phases,
+                    buffers,
+                    links,
                 )
-                if generic_date_match:
-                    data[ATTR_RELEASE_DATE] = generic_date_match.group(1)
+                sample.peak_buffer_bytes = buffers.peak
+
+            # Fingerprints are only compared if there is cached data
+            if data is None and cached_data:
+                self.fingerprint_hits += 1
+                LOGGER.debug(
+                    "CTGP-DX page content unchanged, skipping parse "
+                    "(fingerprint hit ratio: %.0f%%)",
+                    (self.fingerprint_hit_ratio or 0) * 100,
+                )
+                self._mark_success(cached_data)
+                await self._async_save_cache(
+                    response_headers, cached_data, fingerprint=fingerprint
+                )
+                sample.outcome = OUTCOME_UNCHANGED
+                return cached_data
+            self.fingerprint_misses += 1
 
             if not data:
                 await self._async_handle_failure()
@@ -130,13 +754,19 @@ class CtgpdxUpdateCoordinator(DataUpdateCoordinator[dict[str, str]]):
                 )
 
             # Success!
-            self._last_success_time = datetime.now(timezone.utc)
-            async_delete_issue(self.hass, DOMAIN, "website_change")
+            self._mark_success(data)
+            await self._async_save_cache(
+                response_headers,
+                data,
+                fingerprint=fingerprint,
+                links=links,
+            )
 
             if ATTR_VERSION not in data:
                 LOGGER.warning("Version not found, but extracted other data: %s", data)
 
             LOGGER.debug("Successfully fetched CTGP-DX data: %s", data)
+            sample.outcome = OUTCOME_UPDATED
             return data
 
         except UpdateFailed:
@@ -146,13 +776,108 @@ class CtgpdxUpdateCoordinator(DataUpdateCoordinator[dict[str, str]]):
             LOGGER.error("Error parsing CTGP-DX website: %s", err)
             raise UpdateFailed(f"Error parsing website: {err}") from err
 
-    async def _async_handle_failure(self) -> None:
+    async def _async_fetch(
+        self, headers: dict[str, str], sample: RefreshSample
+    ) -> tuple[int, Any, bytes | None, _PageStream | None]:
+        """Request the page, retrying transient errors within this refresh."""
+        attempt = 0
+        while True:
+            sample.attempts = attempt + 1
+            try:
+                return await self._async_request(headers, sample.phases, self.streaming)
+            except (ClientError, TimeoutError) as err:
+                attempt += 1
+                delay = retry_delay(err, attempt)
+                if delay is None or attempt >= FETCH_ATTEMPTS:
+                    raise
+                LOGGER.debug(
+                    "Fetching CTGP-DX page failed (%s), retrying in %.1f s",
+                    err,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+
+    async def async_fetch_page(
+        self, phases: dict[str, float]
+    ) -> tuple[bytes, str | None]:
+        """Fetch the whole page once, without validators or retries.
+
+        Used to profile processing a page, so it leaves the schedule and the
+        cache of the regular refreshes alone.
+        """
+        _, headers, body, _ = await self._async_request({}, phases, streaming=False)
+        return body or b"", _charset(headers)
+
+    async def _async_request(
+        self,
+        headers: dict[str, str],
+        phases: dict[str, float],
+        streaming: bool,
+    ) -> tuple[int, Any, bytes | None, _PageStream | None]:
+        """Send one request and return its status, headers and content.
+
+        The session records resolving the host and connecting into the phases,
+        the time to first byte is what remains until the response headers.
+        """
+        # A retry may reuse the connection of the failed attempt
+        phases.pop(PHASE_DNS, None)
+        phases.pop(PHASE_CONNECT, None)
+        started = time.perf_counter()
+        async with self.session.get(
+            URL,
+            headers=headers,
+            timeout=ClientTimeout(total=10),
+            trace_request_ctx=phases,
+        ) as response:
+            phases[PHASE_TTFB] = time.perf_counter() - started - connection_time(phases)
+            if response.status == HTTPStatus.NOT_MODIFIED:
+                return response.status, response.headers, None, None
+
+            response.raise_for_status()
+            if streaming:
+                page = await self._async_read_streaming(response, phases)
+                return response.status, response.headers, None, page
+            started = time.perf_counter()
+            body = await response.read()
+            phases[PHASE_TRANSFER] = time.perf_counter() - started
+            return response.status, response.headers, body, None
+
+    async def _async_read_streaming(
+        self, response: Any, phases: dict[str, float]
+    ) -> _PageStream:
+        """Read the page in chunks until every release field has been found.
+
+        The transfer time only counts waiting for chunks, not processing them.
+        """
+        page = _PageStream(_charset(response.headers), phases)
+        started = time.perf_counter()
+        processing = 0.0
+        async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+            fed = time.perf_counter()
+            # Tokenizing runs in the executor so large chunks never block the loop
+            done = await self.hass.async_add_executor_job(page.feed, chunk)
+            processing += time.perf_counter() - fed
+            if done:
+                LOGGER.debug(
+                    "Found all CTGP-DX fields after %d bytes, closing connection",
+                    page.bytes_read,
+                )
+                response.close()
+                break
+        phases[PHASE_TRANSFER] = time.perf_counter() - started - processing
+        return page
+
+    async def _async_handle_failure(self, retry_after: float | None = None) -> None:
         """Handle a failed update."""
-        if self._last_success_time is None:
-            # Should not happen as we initialize it, but just in case
-            return
+        self.breaker.record_failure()
+        not_before = max(
+            timedelta(seconds=retry_after or 0), self.breaker.cooldown_remaining
+        )
+        self.update_interval = self.scheduler.record_failure(not_before)
+        LOGGER.debug("Retrying CTGP-DX poll at %s", self.scheduler.next_poll)
 
-        if datetime.now(timezone.utc) - self._last_success_time > timedelta(hours=24):
+        # Only a lasting outage, not a single failed poll, hints at a change
+        if self.breaker.outage > timedelta(hours=24):
             async_create_issue(
                 self.hass,
                 DOMAIN,
@@ -162,3 +887,694 @@ class CtgpdxUpdateCoordinator(DataUpdateCoordinator[dict[str, str]]):
                 translation_key="website_change",
                 learn_more_url="https://github.com/FaserF/ha-ctgpdx/issues",
             )
+
+
+class _TextExtractor(HTMLParser):
+    """Incremental tokenizer collecting the visible text of a page.
+
+    HTMLParser splits text where one fed piece ends, so a token is only
+    collected once the markup after it, or closing, ends its text. With
+    ``blocks``, only block elements end a token, so inline markup like
+    ``<b>`` stays within the text around it.
+    """
+
+    # Same elements BeautifulSoup leaves out of get_text()
+    _SKIPPED_TAGS = frozenset({"script", "style", "template"})
+    # Elements that start a new line of text
+    _BLOCK_TAGS = frozenset(
+        {
+            "address",
+            "article",
+            "aside",
+            "blockquote",
+            "br",
+            "dd",
+            "div",
+            "dl",
+            "dt",
+            "footer",
+            "h1",
+            "h2",
+            "h3",
+            "h4",
+            "h5",
+            "h6",
+            "header",
+            "hr",
+            "li",
+            "main",
+            "nav",
+            "ol",
+            "p",
+            "pre",
+            "section",
+            "table",
+            "td",
+            "th",
+            "tr",
+            "ul",
+        }
+    )
+
+    def __init__(self, links: list[str] | None = None, blocks: bool = False) -> None:
+        """Initialize the tokenizer, collecting the release links in links."""
+        super().__init__(convert_charrefs=True)
+        self.tokens: list[str] = []
+        self.links = links
+        self._blocks = blocks
+        self._skip_depth = 0
+        self._text: list[str] = []
+
+    def close(self) -> None:
+        """Handle any buffered input and collect the last token."""
+        super().close()
+        self._end_text()
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        """Start skipping content of invisible elements and collect links."""
+        self._end_markup_text(tag)
+        if tag in self._SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == "a" and self.links is not None:
+            if href := dict(attrs).get("href"):
+                _add_release_link(self.links, href)
+
+    def handle_endtag(self, tag: str) -> None:
+        """Stop skipping content once an invisible element is closed."""
+        self._end_markup_text(tag)
+        if tag in self._SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data: str) -> None:
+        """Collect text until the markup after it."""
+        if not self._skip_depth:
+            self._text.append(data)
+
+    def handle_comment(self, data: str) -> None:
+        """End the text before a comment."""
+        self._end_markup_text()
+
+    def handle_decl(self, decl: str) -> None:
+        """End the text before a declaration."""
+        self._end_markup_text()
+
+    def handle_pi(self, data: str) -> None:
+        """End the text before a processing instruction."""
+        self._end_markup_text()
+
+    def unknown_decl(self, data: str) -> None:
+        """End the text before a CDATA section or similar."""
+        self._end_markup_text()
+
+    def _end_markup_text(self, tag: str | None = None) -> None:
+        """End the text at markup, unless it is inline and blocks are kept."""
+        if not self._blocks or tag in self._BLOCK_TAGS:
+            self._end_text()
+
+    def _end_text(self) -> None:
+        """Collect the text read since the last markup as a stripped token."""
+        if self._text:
+            if text := "".join(self._text).strip():
+                self.tokens.append(text)
+            self._text.clear()
+
+
+class ParserBackend:
+    """Turn an HTML document into normalized visible text."""
+
+    name: str
+
+    def get_text(self, html: str, links: list[str] | None = None) -> str:
+        """Return the visible text with whitespace collapsed.
+
+        The links to the release archive and its mirrors are collected in
+        links, if given.
+        """
+        raise NotImplementedError
+
+
+class HTMLParserBackend(ParserBackend):
+    """Tokenize with the stdlib HTMLParser without building a tree."""
+
+    name = "html_parser"
+
+    def get_text(self, html: str, links: list[str] | None = None) -> str:
+        """Return the visible text with whitespace collapsed.
+
+        The page is fed in windows, as HTMLParser copies what it is fed, and
+        the tokens of each window are joined right away, as each of the many
+        small strings costs more than its text.
+        """
+        parser = _TextExtractor(links)
+        pieces = []
+        for start in range(0, len(html), _PARSER_WINDOW):
+            parser.feed(html[start : start + _PARSER_WINDOW])
+            pieces.append(" ".join(" ".join(parser.tokens).split()))
+            parser.tokens.clear()
+        parser.close()
+        pieces.append(" ".join(" ".join(parser.tokens).split()))
+        return " ".join(filter(None, pieces))
+
+
+class BeautifulSoupBackend(ParserBackend):
+    """Build a full BeautifulSoup tree and read its text."""
+
+    name = "beautifulsoup"
+
+    def get_text(self, html: str, links: list[str] | None = None) -> str:
+        """Return the visible text with whitespace collapsed."""
+        soup = BeautifulSoup(html, "html.parser")
+        if links is not None:
+            for link in soup("a", href=True):
+                _add_release_link(links, str(link["href"]))
+        return " ".join(soup.get_text(separator=" ", strip=True).split())
+
+
+PARSER_BACKENDS: dict[str, ParserBackend] = {
+    backend.name: backend for backend in (HTMLParserBackend(), BeautifulSoupBackend())
+}
+FALLBACK_PARSER_BACKEND = PARSER_BACKENDS[BeautifulSoupBackend.name]
+
+
+class _PageStream:
+    """Decode, tokenize and scan a page while it is being downloaded.
+
+    Only the current chunk and a short tail of text are kept in memory. The
+    links to the release archive and its mirrors are collected in ``links``.
+    """
+
+    def __init__(
+        self, charset: str | None, phases: dict[str, float] | None = None
+    ) -> None:
+        """Initialize the stream, adding the time of each phase to phases."""
+        self._decoder = codecs.getincrementaldecoder(charset or "utf-8")(
+            errors="replace"
+        )
+        self._phases = phases
+        self.links: list[str] = []
+        self._parser = _TextExtractor(self.links)
+        self._scanner = _FieldScanner()
+        self._raw_hash = hashlib.sha256()
+        self._text_hash = hashlib.sha256()
+        self._has_text = False
+        self.bytes_read = 0
+        self.buffers = BufferMeter()
+
+    def feed(self, chunk: bytes) -> bool:
+        """Feed a chunk and return whether all release fields were found."""
+        self.bytes_read += len(chunk)
+        with timed(self._phases, PHASE_DECODE):
+            self._raw_hash.update(chunk)
+            text = self._decoder.decode(chunk)
+        with timed(self._phases, PHASE_PARSE), held(self.buffers, chunk, text):
+            self._parser.feed(text)
+        return self._scan_tokens()
+
+    def close(self) -> dict[str, str]:
+        """Flush any buffered input and return the extracted fields."""
+        with timed(self._phases, PHASE_DECODE):
+            text = self._decoder.decode(b"", final=True)
+        with timed(self._phases, PHASE_PARSE):
+            self._parser.feed(text)
+            self._parser.close()
+        self._scan_tokens(final=True)
+        return self._scanner.result()
+
+    def fingerprint(self) -> dict[str, str]:
+        """Return hashes of the bytes read and of the normalized text."""
+        return {
+            "raw": self._raw_hash.hexdigest(),
+            "text": self._text_hash.hexdigest(),
+        }
+
+    def _scan_tokens(self, final: bool = False) -> bool:
+        """Move new text tokens into the text hash and the field scanner."""
+        with timed(self._phases, PHASE_EXTRACT):
+            text = ""
+            if words := " ".join(self._parser.tokens).split():
+                self._parser.tokens.clear()
+                text = " ".join(words)
+                if self._has_text:
+                    text = f" {text}"
+                self._has_text = True
+                self._text_hash.update(text.encode())
+            return self._scanner.feed(text, final)
+
+
+class _FieldScanner:
+    """Single scan of REGION_SPECS and FIELD_SPECS over text in pieces.
+
+    A position is only matched once enough text follows it for the longest
+    possible match, so every position is tried exactly once and the total
+    work is linear in the length of the text. Only that tail is buffered.
+
+    Anchors are searched in all of the text. The field patterns only run
+    inside the regions the anchors open, which are recorded in ``regions`` as
+    (start, end) offsets into the text.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scanner."""
+        self._buffer = ""
+        # Offset of the start of the buffer in the text
+        self._offset = 0
+        # Offset up to which the text has been scanned
+        self._scanned = 0
+        self._found: dict[str, tuple[int, str]] = {}
+        self._keyed: dict[str, dict[str, tuple[int, str]]] = {}
+        self.regions: dict[str, list[tuple[int, int]]] = {
+            spec.name: [] for spec in REGION_SPECS
+        }
+        self.complete = False
+
+    def feed(self, text: str, final: bool = False) -> bool:
+        """Scan more text and return whether every primary field matched."""
+        if self.complete:
+            return True
+
+        buffer = self._buffer + text
+        offset = self._offset
+        start = self._scanned - offset
+        limit = len(buffer) if final else len(buffer) - _MAX_MATCH_LENGTH
+        if limit <= start:
+            self._buffer = "" if final else buffer
+            return False
+        endpos = min(len(buffer), limit + _MAX_MATCH_LENGTH)
+
+        for anchor in _REGION_PATTERN.finditer(buffer, start, endpos):
+            if anchor.start() >= limit:
+                break
+            self._open_region(
+                REGION_SPECS[int((anchor.lastgroup or "")[1:])],
+                offset + anchor.start(),
+            )
+
+        matches = []
+        for name, spans in self.regions.items():
+            for span_start, span_end in reversed(spans):
+                if span_end - offset <= start:
+                    break
+                for match in _FIELD_PATTERNS[name].finditer(
+                    buffer, max(start, span_start - offset), endpos
+                ):
+                    if match.start() >= min(limit, span_end - offset):
+                        break
+                    matches.append(match)
+        # Record the matches of all regions in the order of the text
+        matches.sort(key=lambda match: match.start())
+
+        for match in matches:
+            self._record(match)
+            if _is_final(self._found, self._keyed):
+                # Nothing later in the text could replace a primary match
+                self.complete = True
+                break
+
+        # Keep one character before the first unscanned position for \b
+        self._buffer = "" if final else buffer[limit - 1 :]
+        self._offset = offset + limit - 1
+        self._scanned = offset + limit
+        return self.complete
+
+    def _open_region(self, spec: RegionSpec, start: int) -> None:
+        """Open a region window at an anchor, merging it with the last one."""
+        spans = self.regions[spec.name]
+        end = start + spec.length
+        if spans and spans[-1][1] >= start:
+            spans[-1] = (spans[-1][0], end)
+        else:
+            spans.append((start, end))
+
+    def _record(self, match: re.Match[str]) -> None:
+        """Record a match unless the field already has a better one."""
+        group = match.lastgroup or ""
+        index = int(group[1:])
+        spec = FIELD_SPECS[index]
+        if spec.field in self._found and self._found[spec.field][0] <= spec.tier:
+            return
+
+        value = match.group(f"v{index}")
+        if spec.key is None:
+            self._found[spec.field] = (spec.tier, value)
+        else:
+            # Keep the first value per key, resolved once the key field is known
+            self._keyed.setdefault(spec.field, {}).setdefault(
+                match.group(f"k{index}").lower(), (spec.tier, value)
+            )
+
+    def result(self) -> dict[str, str]:
+        """Return the best value of every field that matched."""
+        found = dict(self._found)
+        data = {field: _clean(field, value) for field, (_, value) in found.items()}
+
+        for spec in FIELD_SPECS:
+            if spec.key is None or spec.key not in data:
+                continue
+            candidate = self._keyed.get(spec.field, {}).get(data[spec.key].lower())
+            if (
+                candidate
+                and candidate[0] < found.get(spec.field, (len(FIELD_SPECS),))[0]
+            ):
+                found[spec.field] = candidate
+                data[spec.field] = _clean(spec.field, candidate[1])
+
+        if ATTR_VERSION not in data:
+            LOGGER.warning("Could not find version number in page content")
+
+        return data
+
+
+# Heading of a changelog entry: "v1.1.1 - March 23rd, 2025"
+_CHANGELOG_ENTRY_PATTERN = re.compile(
+    r"v?(\d[\d\.a-z]{0,31}+)\s{0,3}-\s{0,3}[A-Za-z]{1,12}+\s{1,3}\d", re.I
+)
+
+
+class _ReleaseNotesReader:
+    """Collect the changelog entry of one version from a streamed page."""
+
+    def __init__(self, charset: str | None, version: str) -> None:
+        """Initialize the reader."""
+        self._decoder = codecs.getincrementaldecoder(charset or "utf-8")(
+            errors="replace"
+        )
+        # One line per changelog item, whatever inline markup it contains
+        self._parser = _TextExtractor(blocks=True)
+        self._version = version.lower()
+        self._heading: str | None = None
+        self._lines: list[str] = []
+        self.complete = False
+
+    def feed(self, chunk: bytes) -> bool:
+        """Feed a chunk and return whether the whole entry has been read."""
+        self._parser.feed(self._decoder.decode(chunk))
+        return self._scan_tokens()
+
+    def close(self) -> str | None:
+        """Return the entry as Markdown, or None if it was not found."""
+        if not self.complete:
+            self._parser.feed(self._decoder.decode(b"", final=True))
+            self._parser.close()
+            self._scan_tokens()
+        if self._heading is None:
+            return None
+        return "\n".join(
+            [f"### {self._heading}", "", *(f"- {line}" for line in self._lines)]
+        )
+
+    def _scan_tokens(self) -> bool:
+        """Consume new text tokens until the next entry starts."""
+        for token in self._parser.tokens:
+            text = " ".join(token.split())
+            if heading := _CHANGELOG_ENTRY_PATTERN.match(text):
+                if self._heading is not None:
+                    self.complete = True
+                    break
+                if heading.group(1).lower() == self._version:
+                    self._heading = text
+            elif self._heading is not None:
+                self._lines.append(text)
+        self._parser.tokens.clear()
+        return self.complete
+
+
+def _add_release_link(links: list[str], href: str) -> None:
+    """Collect a link to the release archive or a mirror as absolute URL.
+
+    These are links to a ZIP file and links to file hosters used as fallback.
+    Other links are left out, so a large page does not fill the list, and
+    each link is only collected once.
+    """
+    url = urljoin(URL, href.strip())
+    if url not in links and (
+        _is_archive(url) or urlsplit(url).hostname in MIRROR_HOSTS
+    ):
+        links.append(url)
+
+
+def _is_archive(url: str) -> bool:
+    """Return whether a link points to a ZIP file."""
+    return urlsplit(url).path.lower().endswith(".zip")
+
+
+def _extract_fields(text: str) -> dict[str, str]:
+    """Extract the release fields from the normalized page text.
+
+    All alternatives of all fields are matched in a single scan of the text.
+    Afterwards each field takes the value of its best tier that matched; the
+    release date of the changelog entry only counts if it belongs to the
+    extracted version.
+    """
+    scanner = _FieldScanner()
+    scanner.feed(text, final=True)
+    return scanner.result()
+
+
+def _is_final(
+    found: dict[str, tuple[int, str]], keyed: dict[str, dict[str, tuple[int, str]]]
+) -> bool:
+    """Return whether every field has its primary alternative matched."""
+    for spec in _PRIMARY_SPECS:
+        if spec.key is None:
+            if found.get(spec.field, (1,))[0]:
+                return False
+        elif (
+            (key := found.get(spec.key)) is None
+            or key[0]
+            or (_clean(spec.key, key[1]).lower() not in keyed.get(spec.field, {}))
+        ):
+            return False
+    return True
+
+
+def _clean(field: str, value: str) -> str:
+    """Normalize an extracted value."""
+    if field == ATTR_VERSION:
+        # Clean up extracted version by removing internal spaces
+        return value.replace(" ", "").strip()
+    return value
+
+
+def process_page(
+    body: bytes,
+    charset: str | None,
+    backend: ParserBackend,
+    previous_fingerprint: dict[str, str] | None = None,
+    phases: dict[str, float] | None = None,
+    buffers: BufferMeter | None = None,
+    links: list[str] | None = None,
+) -> tuple[dict[str, str], dict[str, str] | None]:
+    """Decode, fingerprint, parse and extract a downloaded page.
+
+    This is CPU bound and free of side effects, so it is run in the executor.
+    Returns the fingerprint of the page and the extracted data, which is None
+    if the fingerprint matches ``previous_fingerprint`` and parsing was skipped.
+    The time of each phase is added to ``phases``, the page buffers are
+    counted in ``buffers`` and the links to the release archive and its
+    mirrors of a parsed page are collected in ``links``, if given.
+    """
+    with timed(phases, PHASE_DECODE):
+        html = body.decode(charset or "utf-8", errors="replace")
+        fingerprint = _fingerprint(body, html)
+    with held(buffers, body, html):
+        if _fingerprint_matches(fingerprint, previous_fingerprint):
+            return fingerprint, None
+        return fingerprint, parse_html(html, backend, phases, buffers, links)
+
+
+def parse_html(
+    html: str,
+    backend: ParserBackend,
+    phases: dict[str, float] | None = None,
+    buffers: BufferMeter | None = None,
+    links: list[str] | None = None,
+) -> dict[str, str]:
+    """Extract the release fields, falling back to BeautifulSoup if needed."""
+    try:
+        with timed(phases, PHASE_PARSE):
+            text = backend.get_text(html, links)
+        with timed(phases, PHASE_EXTRACT), held(buffers, text):
+            data = _extract_fields(text)
+    except Exception as err:  # noqa: BLE001
+        LOGGER.debug("Parser backend %s failed: %s", backend.name, err)
+        data = {}
+
+    if not data and backend is not FALLBACK_PARSER_BACKEND:
+        LOGGER.debug(
+            "No data found with parser backend %s, retrying with %s",
+            backend.name,
+            FALLBACK_PARSER_BACKEND.name,
+        )
+        if links is not None:
+            links.clear()
+        with timed(phases, PHASE_PARSE):
+            text = FALLBACK_PARSER_BACKEND.get_text(html, links)
+        with timed(phases, PHASE_EXTRACT), held(buffers, text):
+            data = _extract_fields(text)
+    return data
+
+
+def _finish_stream(
+    page: _PageStream, previous_fingerprint: dict[str, str] | None = None
+) -> tuple[dict[str, str], dict[str, str] | None]:
+    """Flush a streamed page and extract its fields, like process_page()."""
+    data = page.close()
+    fingerprint = page.fingerprint()
+    if _fingerprint_matches(fingerprint, previous_fingerprint):
+        return fingerprint, None
+    return fingerprint, data
+
+
+def _fingerprint(body: bytes, html: str) -> dict[str, str]:
+    """Return hashes of the raw page and of its normalized visible text.
+
+    The text is hashed part by part, so only one part of the page is copied
+    at a time.
+    """
+    text_hash = hashlib.sha256()
+    separator = b""
+    for part in _visible_parts(html):
+        if words := part.split():
+            text_hash.update(separator + " ".join(words).encode())
+            separator = b" "
+    return {
+        "raw": hashlib.sha256(body).hexdigest(),
+        "text": text_hash.hexdigest(),
+    }
+
+
+def _visible_parts(html: str) -> Iterator[str]:
+    """Yield the page without scripts, styles, comments and similar invisible
+    markup, in parts with their tags replaced by spaces.
+
+    Each closing tag is searched for once from its opening tag, and an unclosed
+    element swallows the rest of the page, so this is linear time.
+    """
+    pos = 0
+    while match := _NOISE_START_PATTERN.search(html, pos):
+        yield from _strip_tags(html, pos, match.start())
+        if tag := match.group(1):
+            end_match = _NOISE_END_PATTERNS[tag.lower()].search(html, match.end())
+            end = end_match.start() if end_match else -1
+        else:
+            end = html.find("-->", match.end())
+        if end < 0:
+            return
+        pos = html.find(">", end) + 1 or len(html)
+    yield from _strip_tags(html, pos, len(html))
+
+
+def _strip_tags(html: str, start: int, end: int) -> Iterator[str]:
+    """Yield a slice of the page in windows, with tags replaced by spaces.
+
+    Windows end where a tag starts, so no tag is cut apart.
+    """
+    while start < end:
+        stop = html.find("<", start + _FINGERPRINT_WINDOW, end)
+        if stop < 0:
+            stop = end
+        yield _TAG_PATTERN.sub(" ", html[start:stop])
+        start = stop
+
+
+def _fingerprint_matches(
+    fingerprint: dict[str, str], previous: dict[str, str] | None
+) -> bool:
+    """Return whether either hash equals the one of the previous run."""
+    if not previous:
+        return False
+    return any(fingerprint[key] == previous.get(key) for key in ("raw", "text"))
+
+
+def _charset(headers: Any) -> str | None:
+    """Return the charset announced in the Content-Type header."""
+    content_type = headers.get(hdrs.CONTENT_TYPE) or ""
+    if match := re.search(r"charset=[\"']?([\w.:-]+)", content_type, re.I):
+        return match.group(1)
+    return None
+
+
+_SIZE_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*([KMGT]?)B", re.I)
+# Decimal prefixes, as used by the download page and by Home Assistant
+_SIZE_FACTORS = {"": 1, "K": 10**3, "M": 10**6, "G": 10**9, "T": 10**12}
+_ORDINAL_PATTERN = re.compile(r"(?<=\d)(?:st|nd|rd|th)\b", re.I)
+
+
+def normalize_data(data: dict[str, str]) -> dict[str, Any]:
+    """Convert the extracted strings to their types.
+
+    Sizes become integer bytes and the release date a timezone aware datetime.
+    Values that cannot be converted are left out.
+    """
+    normalized: dict[str, Any] = {}
+    for field, value in data.items():
+        converted: Any = value
+        if field in (ATTR_DOWNLOAD_SIZE, ATTR_UNPACKED_SIZE):
+            converted = _parse_size(value)
+        elif field == ATTR_RELEASE_DATE:
+            converted = _parse_date(value)
+        if converted is None:
+            LOGGER.debug("Could not convert %s value %r", field, value)
+            continue
+        normalized[field] = converted
+    return normalized
+
+
+def _parse_size(value: str) -> int | None:
+    """Return a size like "3.86 GB" in bytes."""
+    if not (match := _SIZE_PATTERN.fullmatch(value.strip())):
+        return None
+    return round(float(match.group(1)) * _SIZE_FACTORS[match.group(2).upper()])
+
+
+def _parse_date(value: str) -> datetime | None:
+    """Return a date like "March 23rd, 2025" as midnight UTC."""
+    month, _, rest = " ".join(_ORDINAL_PATTERN.sub("", value).split()).partition(" ")
+    # Abbreviate the month, so "March", "Mar" and "Sept" are all understood
+    try:
+        date = datetime.strptime(f"{month[:3]} {rest}", "%b %d, %Y")
+    except ValueError:
+        return None
+    return date.replace(tzinfo=timezone.utc)
+
+
+def retry_delay(err: Exception, attempt: int) -> float | None:
+    """Return the seconds to wait before retrying a request, None to give up."""
+    if isinstance(err, ClientResponseError):
+        if err.status not in RETRY_STATUSES:
+            return None
+        if (retry_after := _retry_after(err.headers)) is not None:
+            # Longer waits are left to the scheduler
+            return retry_after if retry_after <= FETCH_MAX_DELAY else None
+    # Full jitter keeps clients from retrying in lockstep
+    return random.uniform(0, min(FETCH_BACKOFF * 2 ** (attempt - 1), FETCH_MAX_DELAY))
+
+
+def _retry_after(headers: Any) -> float | None:
+    """Return the seconds a Retry-After header asks to wait."""
+    if not headers or not (value := headers.get(hdrs.RETRY_AFTER)):
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _fresh_until(cache_control: str | None) -> float | None:
+    """Return the timestamp until which a response may be served from cache."""
+    if not cache_control:
+        return None
+    directives = cache_control.lower()
+    if "no-cache" in directives or "no-store" in directives:
+        return None
+    if not (match := re.search(r"max-age\s*=\s*\"?(\d+)", directives)):
+        return None
+    max_age = int(match.group(1))
+    if max_age <= 0:
+        return None
+    return datetime.now(timezone.utc).timestamp() + max_age
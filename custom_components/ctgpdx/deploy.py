@@ -0,0 +1,266 @@
+"""Incremental deployment of the release archive for the CTGP Deluxe Version integration.
+
+A manifest next to the deployed files records the CRC-32 and size of every
+file from the central directory of the archive it came from. Deploying a new
+archive only extracts the files whose entry differs from the manifest and
+deletes the files that are no longer part of the release.
+
+Everything in this module blocks and runs in the executor.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import zipfile
+from collections.abc import Iterable
+from contextlib import suppress
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, TypeGuard
+
+from .const import DEPLOY_CHUNK_SIZE, DEPLOY_WORKERS, LOGGER
+from .zip_index import ZipEntry
+
+MANIFEST_NAME = ".ctgpdx-manifest.json"
+MANIFEST_VERSION = 1
+
+
+class DeployError(Exception):
+    """The archive cannot be deployed."""
+
+
+@dataclass(slots=True)
+class DeployPlan:
+    """Files to change in the deployed tree."""
+
+    extract: list[ZipEntry] = field(default_factory=list)
+    remove: list[str] = field(default_factory=list)
+    unchanged: int = 0
+
+
+@dataclass(slots=True)
+class DeployResult:
+    """Outcome of a deployment."""
+
+    added: int = 0
+    changed: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    bytes_written: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the result as service response."""
+        return asdict(self)
+
+
+def plan_deployment(
+    entries: Iterable[ZipEntry], manifest: dict[str, list[int]], target: Path
+) -> DeployPlan:
+    """Compare the entries of an archive with the manifest of the target.
+
+    A file is extracted if its CRC or size differs from the manifest, or if
+    it is missing on disk or has a different size there, e.g. because it was
+    modified by hand.
+    """
+    plan = DeployPlan()
+    names: set[str] = set()
+    for entry in entries:
+        if entry.name.endswith("/"):
+            continue
+        names.add(entry.name)
+        if (
+            manifest.get(entry.name) == [entry.crc32, entry.size]
+            and _size_on_disk(target / entry.name) == entry.size
+        ):
+            plan.unchanged += 1
+        else:
+            plan.extract.append(entry)
+    plan.remove = sorted(set(manifest) - names)
+    return plan
+
+
+def deploy_archive(
+    archive_path: str | Path, target: str | Path, workers: int = DEPLOY_WORKERS
+) -> DeployResult:
+    """Bring the target directory up to date with an archive.
+
+    Files are extracted in parallel and streamed to disk. The manifest is
+    written even if the deployment fails halfway, listing the files that
+    were written, so the next attempt continues where this one stopped.
+    """
+    target = Path(target)
+    target.mkdir(parents=True, exist_ok=True)
+    root = target.resolve()
+    manifest = load_manifest(target)
+
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            entries = [
+                ZipEntry(info.filename, info.CRC, info.compress_size, info.file_size)
+                for info in archive.infolist()
+            ]
+    except (OSError, zipfile.BadZipFile) as err:
+        raise DeployError(f"Cannot read {archive_path}: {err}") from err
+    for entry in entries:
+        _destination(root, entry.name)
+
+    plan = plan_deployment(entries, manifest, target)
+    result = DeployResult(unchanged=plan.unchanged)
+    LOGGER.debug(
+        "Deploying %s to %s: %s files to extract, %s to remove, %s unchanged",
+        archive_path,
+        target,
+        len(plan.extract),
+        len(plan.remove),
+        plan.unchanged,
+    )
+
+    try:
+        for name in plan.remove:
+            _destination(root, name).unlink(missing_ok=True)
+            del manifest[name]
+            result.removed += 1
+        _remove_empty_directories(root, plan.remove)
+
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="ctgpdx_deploy"
+        ) as executor:
+            futures = {
+                executor.submit(_extract, archive_path, group, root): group
+                for group in _balance(plan.extract, workers)
+                if group
+            }
+            errors: list[Exception] = []
+            for future in as_completed(futures):
+                written, error = future.result()
+                for entry in written:
+                    if entry.name in manifest:
+                        result.changed += 1
+                    else:
+                        result.added += 1
+                    manifest[entry.name] = [entry.crc32, entry.size]
+                    result.bytes_written += entry.size
+                if error is not None:
+                    errors.append(error)
+        if errors:
+            raise DeployError(f"Could not extract all files: {errors[0]}")
+    finally:
+        save_manifest(target, manifest)
+
+    return result
+
+
+def load_manifest(target: Path) -> dict[str, list[int]]:
+    """Return the CRC and size of the deployed files by name."""
+    try:
+        data = json.loads((target / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as err:
+        # Everything is extracted again, which rebuilds the manifest
+        LOGGER.warning("Ignoring unreadable manifest in %s: %s", target, err)
+        return {}
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return {}
+    files = data.get("files")
+    if not _is_manifest_files(files):
+        LOGGER.warning("Ignoring malformed manifest in %s", target)
+        return {}
+    return files
+
+
+def _is_manifest_files(files: Any) -> TypeGuard[dict[str, list[int]]]:
+    """Return whether the files of a manifest map names to a CRC and a size."""
+    return isinstance(files, dict) and all(
+        isinstance(value, list)
+        and len(value) == 2
+        and all(type(number) is int for number in value)
+        for value in files.values()
+    )
+
+
+def save_manifest(target: Path, manifest: dict[str, list[int]]) -> None:
+    """Write the manifest, replacing the previous one at once."""
+    path = target / MANIFEST_NAME
+    temporary = path.with_name(f"{path.name}.tmp")
+    temporary.write_text(
+        json.dumps({"version": MANIFEST_VERSION, "files": manifest}),
+        encoding="utf-8",
+    )
+    os.replace(temporary, path)
+
+
+def _extract(
+    archive_path: str | Path, entries: list[ZipEntry], root: Path
+) -> tuple[list[ZipEntry], Exception | None]:
+    """Extract a group of entries with a ZIP handle of this thread.
+
+    Returns the entries that were written and the error that stopped the
+    group, if any. Reading an entry to its end verifies its CRC.
+    """
+    written: list[ZipEntry] = []
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            for entry in entries:
+                destination = _destination(root, entry.name)
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                temporary = destination.with_name(f"{destination.name}.ctgpdx-tmp")
+                try:
+                    with (
+                        archive.open(entry.name) as source,
+                        temporary.open("wb") as file,
+                    ):
+                        shutil.copyfileobj(source, file, DEPLOY_CHUNK_SIZE)
+                    os.replace(temporary, destination)
+                finally:
+                    temporary.unlink(missing_ok=True)
+                written.append(entry)
+    except (OSError, zipfile.BadZipFile) as err:
+        return written, err
+    return written, None
+
+
+def _balance(entries: list[ZipEntry], groups: int) -> list[list[ZipEntry]]:
+    """Split the entries into groups of about the same size, largest first."""
+    buckets: list[tuple[int, list[ZipEntry]]] = [(0, []) for _ in range(groups)]
+    for entry in sorted(entries, key=lambda entry: entry.size, reverse=True):
+        index = min(range(groups), key=lambda index: buckets[index][0])
+        size, bucket = buckets[index]
+        bucket.append(entry)
+        buckets[index] = (size + entry.size, bucket)
+    return [bucket for _, bucket in buckets]
+
+
+def _destination(root: Path, name: str) -> Path:
+    """Return where an entry goes, refusing names that leave the target."""
+    destination = (root / name).resolve()
+    if not destination.is_relative_to(root) or destination == root:
+        raise DeployError(f"Archive member {name} lies outside of the target")
+    return destination
+
+
+def _remove_empty_directories(root: Path, names: list[str]) -> None:
+    """Remove directories that only contained removed files."""
+    directories = {
+        parent
+        for name in names
+        for parent in _destination(root, name).parents
+        if parent.is_relative_to(root) and parent != root
+    }
+    # Deepest first, so parents are empty once their children are gone
+    for directory in sorted(
+        directories, key=lambda path: len(path.parts), reverse=True
+    ):
+        with suppress(OSError):
+            directory.rmdir()
+
+
+def _size_on_disk(path: Path) -> int | None:
+    """Return the size of a file, None if it does not exist."""
+    try:
+        return path.stat().st_size
+    except OSError:
+        return None
@@ -0,0 +1,56 @@
+"""Diagnostics support for the CTGP Deluxe Version integration."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import CtgpdxUpdateCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    Besides the extracted data this contains the timings of the last
+    refreshes, summarized as p50 and p95, to tell a slow server from slow
+    parsing, and the page buffers the last refresh held at once.
+    """
+    coordinator: CtgpdxUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    scheduler = coordinator.scheduler
+    breaker = coordinator.breaker
+    last = coordinator.metrics.last
+    diagnostics: dict[str, Any] = {
+        "options": dict(entry.options),
+        "data": asdict(coordinator.data) if coordinator.data else None,
+        "last_update_success": coordinator.last_update_success,
+        "scheduler": {
+            "next_poll": _isoformat(scheduler.next_poll),
+            "expected_release": _isoformat(scheduler.expected_release),
+            "failures": scheduler.failures,
+        },
+        "breaker": {
+            "state": breaker.state,
+            "failures": breaker.failures,
+            "open_until": _isoformat(breaker.open_until),
+        },
+        "fingerprint_hit_ratio": coordinator.fingerprint_hit_ratio,
+        "metrics": {
+            "summary": coordinator.metrics.summary(),
+            "peak_buffer_bytes": last.peak_buffer_bytes if last else None,
+            "samples": [sample.as_dict() for sample in coordinator.metrics.samples],
+        },
+    }
+    if coordinator.downloader is not None:
+        diagnostics["download"] = asdict(coordinator.downloader.progress)
+    return diagnostics
+
+
+def _isoformat(value: Any) -> str | None:
+    """Return a datetime as ISO 8601 string."""
+    return value.isoformat() if value is not None else None
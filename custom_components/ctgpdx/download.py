@@ -0,0 +1,332 @@
+"""Download of the CTGP-DX release archive for the CTGP Deluxe Version integration.
+
+The archive is several gigabytes, so it is streamed to disk in bounded chunks
+and never held in memory. An interrupted transfer leaves a ``.part`` file
+behind, which the next attempt continues with an HTTP Range request. The
+ETag or Last-Modified of the archive is kept next to it and sent as If-Range,
+so a replaced archive starts over instead of being appended to the old one.
+Writing and hashing happen in the executor.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import StrEnum
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any
+from urllib.parse import unquote, urlsplit
+
+from aiohttp import ClientError, ClientPayloadError, ClientTimeout, hdrs
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    DOWNLOAD_ATTEMPTS,
+    DOWNLOAD_CHUNK_SIZE,
+    DOWNLOAD_PROGRESS_INTERVAL,
+    LOGGER,
+)
+from .coordinator import retry_delay
+from .zip_index import content_range
+
+
+class DownloadState(StrEnum):
+    """State of the release download."""
+
+    IDLE = "idle"
+    DOWNLOADING = "downloading"
+    COMPLETE = "complete"
+    FAILED = "failed"
+
+
+@dataclass(slots=True)
+class DownloadProgress:
+    """Progress of the release download."""
+
+    state: DownloadState = DownloadState.IDLE
+    path: str | None = None
+    downloaded: int = 0
+    total: int | None = None
+    sha256: str | None = None
+    error: str | None = None
+
+    @property
+    def percentage(self) -> float | None:
+        """Return how much of the archive has been downloaded."""
+        if not self.total:
+            return None
+        return round(100 * self.downloaded / self.total, 1)
+
+
+class ReleaseDownloader:
+    """Stream the release archive into a directory."""
+
+    def __init__(
+        self, hass: HomeAssistant, directory: str, rate_limit: int | None = None
+    ) -> None:
+        """Initialize the downloader.
+
+        The rate limit is in bytes per second, None downloads at full speed.
+        """
+        self.hass = hass
+        self.directory = Path(directory)
+        self.rate_limit = rate_limit or None
+        self.progress = DownloadProgress()
+        self._listeners: list[Callable[[], None]] = []
+        self._last_notified = 0.0
+
+    @property
+    def running(self) -> bool:
+        """Return whether a download is in progress."""
+        return self.progress.state is DownloadState.DOWNLOADING
+
+    @callback
+    def async_add_listener(
+        self, update_callback: Callable[[], None]
+    ) -> Callable[[], None]:
+        """Listen for progress updates, returns a function removing the listener."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    async def async_download(self, url: str) -> Path | None:
+        """Download the archive, continuing a previous partial download.
+
+        Returns the path of the complete archive, or None if it failed.
+        """
+        path = self.directory / _filename(url)
+        part = _PartFile(path.with_name(f"{path.name}.part"))
+        self.progress = DownloadProgress(DownloadState.DOWNLOADING, path=str(path))
+        self._notify(force=True)
+
+        try:
+            for attempt in range(1, DOWNLOAD_ATTEMPTS + 1):
+                try:
+                    await self._async_transfer(url, part)
+                    break
+                except (ClientError, TimeoutError) as err:
+                    delay = retry_delay(err, attempt)
+                    if attempt == DOWNLOAD_ATTEMPTS or delay is None:
+                        raise
+                    LOGGER.debug(
+                        "Download of %s interrupted at %s bytes, resuming in %.1fs: %s",
+                        url,
+                        self.progress.downloaded,
+                        delay,
+                        err,
+                    )
+                    await asyncio.sleep(delay)
+            await self.hass.async_add_executor_job(part.complete, path)
+        except asyncio.CancelledError:
+            self.progress.state = DownloadState.IDLE
+            self._notify(force=True)
+            raise
+        except (ClientError, TimeoutError, OSError) as err:
+            LOGGER.error("Could not download the CTGP-DX release: %s", err)
+            self.progress.state = DownloadState.FAILED
+            self.progress.error = str(err) or type(err).__name__
+            self._notify(force=True)
+            return None
+
+        LOGGER.info("Downloaded the CTGP-DX release to %s", path)
+        self.progress.state = DownloadState.COMPLETE
+        self.progress.sha256 = part.hexdigest()
+        self._notify(force=True)
+        return path
+
+    async def _async_transfer(self, url: str, part: _PartFile) -> None:
+        """Request the missing part of the archive and append it to the file."""
+        offset = await self.hass.async_add_executor_job(part.disk_size)
+        headers: dict[str, str] = {}
+        if offset:
+            headers[hdrs.RANGE] = f"bytes={offset}-"
+            # The server sends the whole archive if it changed in the meantime
+            if validator := await self.hass.async_add_executor_job(part.validator):
+                headers[hdrs.IF_RANGE] = validator
+        session = async_get_clientsession(self.hass)
+        async with session.get(
+            url,
+            headers=headers,
+            # Only stalls time out, the whole transfer may take hours
+            timeout=ClientTimeout(total=None, sock_connect=10, sock_read=60),
+        ) as response:
+            if response.status == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE:
+                # Nothing left to request if the file is already complete
+                if offset and content_range(response.headers) == (None, offset):
+                    await self.hass.async_add_executor_job(part.open, True)
+                    await self.hass.async_add_executor_job(part.close)
+                    self.progress.downloaded = self.progress.total = offset
+                    return
+            response.raise_for_status()
+
+            start, total = 0, response.content_length
+            if response.status == HTTPStatus.PARTIAL_CONTENT:
+                content_start, total = content_range(response.headers)
+                if content_start is None:
+                    raise ClientPayloadError(
+                        "Partial response without a valid Content-Range: "
+                        f"{response.headers.get(hdrs.CONTENT_RANGE)}"
+                    )
+                start = content_start
+                if start != offset:
+                    raise ClientPayloadError(
+                        f"Requested bytes from {offset}, got bytes from {start}"
+                    )
+            elif offset:
+                LOGGER.debug(
+                    "Server ignored the range request or the archive changed, "
+                    "starting over"
+                )
+
+            # The server either continues at the offset or starts over
+            await self.hass.async_add_executor_job(
+                part.open, bool(start), _validator(response.headers)
+            )
+            self.progress.downloaded = start
+            self.progress.total = total
+            try:
+                await self._async_receive(response, part)
+            finally:
+                await self.hass.async_add_executor_job(part.close)
+
+        if total is not None and self.progress.downloaded != total:
+            raise ClientPayloadError(
+                f"Transfer ended after {self.progress.downloaded} of {total} bytes"
+            )
+
+    async def _async_receive(self, response: Any, part: _PartFile) -> None:
+        """Write the body to the file, keeping below the rate limit."""
+        chunk_size = DOWNLOAD_CHUNK_SIZE
+        if self.rate_limit:
+            # Limits the burst before the first pause
+            chunk_size = min(chunk_size, self.rate_limit)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        received = 0
+        async for chunk in response.content.iter_chunked(chunk_size):
+            await self.hass.async_add_executor_job(part.write, chunk)
+            received += len(chunk)
+            self.progress.downloaded += len(chunk)
+            self._notify()
+            if (
+                self.rate_limit
+                and (ahead := received / self.rate_limit - (loop.time() - started)) > 0
+            ):
+                await asyncio.sleep(ahead)
+
+    @callback
+    def _notify(self, force: bool = False) -> None:
+        """Inform the listeners, at most once per progress interval."""
+        now = time.monotonic()
+        if not force and now - self._last_notified < DOWNLOAD_PROGRESS_INTERVAL:
+            return
+        self._last_notified = now
+        for update_callback in list(self._listeners):
+            update_callback()
+
+
+class _PartFile:
+    """Partially downloaded archive with a running SHA-256 of its content.
+
+    All methods except hexdigest do blocking I/O and run in the executor.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the file."""
+        self.path = path
+        self._validator_path = path.with_name(f"{path.name}.validator")
+        self._file: Any = None
+        self._hash = hashlib.sha256()
+        self._hashed = 0
+        # A cancelled write may still be running when the file is closed
+        self._lock = threading.Lock()
+
+    def disk_size(self) -> int:
+        """Return the number of bytes already downloaded."""
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def validator(self) -> str | None:
+        """Return the ETag or Last-Modified of the archive in the file."""
+        try:
+            return self._validator_path.read_text(encoding="utf-8") or None
+        except FileNotFoundError:
+            return None
+
+    def open(self, resume: bool, validator: str | None = None) -> None:
+        """Open the file for appending, or truncate it to start over.
+
+        Starting over stores the validator of the archive that is received.
+        """
+        with self._lock:
+            if not resume:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                if validator:
+                    self._validator_path.write_text(validator, encoding="utf-8")
+                else:
+                    self._validator_path.unlink(missing_ok=True)
+                self._file = self.path.open("wb")
+                self._hash = hashlib.sha256()
+                self._hashed = 0
+                return
+            if self._hashed != self.disk_size():
+                # Left behind by an earlier download, hash what is there
+                self._hash = hashlib.sha256()
+                self._hashed = 0
+                with self.path.open("rb") as file:
+                    while chunk := file.read(DOWNLOAD_CHUNK_SIZE):
+                        self._hash.update(chunk)
+                        self._hashed += len(chunk)
+            self._file = self.path.open("ab")
+
+    def write(self, chunk: bytes) -> None:
+        """Append a chunk."""
+        with self._lock:
+            self._file.write(chunk)
+            self._hash.update(chunk)
+            self._hashed += len(chunk)
+
+    def close(self) -> None:
+        """Close the file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def complete(self, path: Path) -> None:
+        """Move the complete archive to its final path."""
+        self.path.replace(path)
+        self._validator_path.unlink(missing_ok=True)
+
+    def hexdigest(self) -> str:
+        """Return the SHA-256 of the file."""
+        return self._hash.hexdigest()
+
+
+def _validator(headers: Any) -> str | None:
+    """Return the validator of a response to send as If-Range.
+
+    If-Range only accepts a strong ETag, weak ones fall back to Last-Modified.
+    """
+    etag = headers.get(hdrs.ETAG)
+    if etag and not etag.startswith("W/"):
+        return etag
+    return headers.get(hdrs.LAST_MODIFIED)
+
+
+def _filename(url: str) -> str:
+    """Return the name of the archive, without any directory of the link."""
+    return Path(unquote(urlsplit(url).path)).name or "ctgpdx.zip"
@@ -0,0 +1,24 @@
+"""Base entity for the CTGP Deluxe Version integration."""
+
+from __future__ import annotations
+
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN, URL
+from .coordinator import CtgpdxUpdateCoordinator
+
+
+class CtgpdxEntity(CoordinatorEntity[CtgpdxUpdateCoordinator]):
+    """Entity belonging to the CTGP Deluxe device."""
+
+    def __init__(self, coordinator: CtgpdxUpdateCoordinator) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        # Built once, as it never changes
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, "ctgpdx_version_sensor")},
+            "name": "CTGP Deluxe",
+            "manufacturer": "CTGP Deluxe Team",
+            "model": "Version Tracker",
+            "configuration_url": URL,
+        }
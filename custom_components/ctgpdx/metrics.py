@@ -0,0 +1,299 @@
+"""Refresh performance metrics for the CTGP Deluxe Version integration."""
+
+from __future__ import annotations
+
+import math
+import sys
+import time
+from bisect import bisect_left
+from collections import Counter, deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any
+
+from aiohttp import ClientSession, TraceConfig
+
+from .const import METRICS_LATENCY_BUCKETS, METRICS_SAMPLES, METRICS_SIZE_BUCKETS
+
+# Phases of a refresh. Resolving the host and connecting, including TLS, are
+# only recorded if the request opened a new connection. The time to first
+# byte is the wait for the response headers after that.
+PHASE_DNS = "dns"
+PHASE_CONNECT = "connect"
+PHASE_TTFB = "ttfb"
+PHASE_TRANSFER = "transfer"
+PHASE_DECODE = "decode"
+PHASE_PARSE = "parse"
+PHASE_EXTRACT = "extract"
+PHASES = (
+    PHASE_DNS,
+    PHASE_CONNECT,
+    PHASE_TTFB,
+    PHASE_TRANSFER,
+    PHASE_DECODE,
+    PHASE_PARSE,
+    PHASE_EXTRACT,
+)
+_CONNECTION_PHASES = (PHASE_DNS, PHASE_CONNECT)
+_FETCH_PHASES = (PHASE_DNS, PHASE_CONNECT, PHASE_TTFB, PHASE_TRANSFER)
+_PROCESSING_PHASES = (PHASE_DECODE, PHASE_PARSE, PHASE_EXTRACT)
+
+# How a refresh ended
+OUTCOME_UPDATED = "updated"
+OUTCOME_UNCHANGED = "unchanged"
+OUTCOME_NOT_MODIFIED = "not_modified"
+OUTCOME_CACHED = "cached"
+OUTCOME_ERROR = "error"
+
+
+@dataclass(slots=True)
+class RefreshSample:
+    """Timings of one refresh, in seconds."""
+
+    started: datetime
+    outcome: str = OUTCOME_ERROR
+    duration: float = 0.0
+    bytes_received: int = 0
+    attempts: int = 0
+    # Whether the request carried ETag or Last-Modified validators
+    conditional: bool = False
+    phases: dict[str, float] = field(default_factory=dict)
+    error: str | None = None
+    error_type: str | None = None
+    # Size of the page buffers held at once while processing, see BufferMeter
+    peak_buffer_bytes: int | None = None
+
+    @property
+    def fetch_time(self) -> float | None:
+        """Return the time until the page was received, None if not fetched."""
+        if PHASE_TTFB not in self.phases:
+            return None
+        return sum(self.phases.get(phase, 0.0) for phase in _FETCH_PHASES)
+
+    @property
+    def processing_time(self) -> float | None:
+        """Return the time spent decoding, parsing and extracting."""
+        if PHASE_DECODE not in self.phases:
+            return None
+        return sum(self.phases.get(phase, 0.0) for phase in _PROCESSING_PHASES)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the sample for diagnostics."""
+        return asdict(self) | {"started": self.started.isoformat()}
+
+
+class Histogram:
+    """Cumulative histogram with fixed bucket bounds."""
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        """Initialize the histogram."""
+        self.bounds = bounds
+        # The last bucket counts the values above every bound
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Count a value."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+class RefreshMetrics:
+    """Ring buffer of the samples of the last refreshes.
+
+    Besides the samples, counters and histograms of all refreshes since the
+    integration was set up are updated as samples are recorded, so serving
+    them does not need to look at the samples. ``revision`` changes with
+    every sample.
+    """
+
+    def __init__(self, size: int = METRICS_SAMPLES) -> None:
+        """Initialize the buffer."""
+        self._samples: deque[RefreshSample] = deque(maxlen=size)
+        self.revision = 0
+        self.outcomes: Counter[str] = Counter()
+        self.failures: Counter[str] = Counter()
+        self.conditional_hits = 0
+        self.conditional_misses = 0
+        self.fetch_time = Histogram(METRICS_LATENCY_BUCKETS)
+        self.processing_time = Histogram(METRICS_LATENCY_BUCKETS)
+        self.bytes_received = Histogram(METRICS_SIZE_BUCKETS)
+        # Unix time at which the last refresh succeeded
+        self.last_success: float | None = None
+
+    @property
+    def samples(self) -> list[RefreshSample]:
+        """Return the samples, oldest first."""
+        return list(self._samples)
+
+    @property
+    def last(self) -> RefreshSample | None:
+        """Return the sample of the last refresh."""
+        return self._samples[-1] if self._samples else None
+
+    def record(self, sample: RefreshSample) -> None:
+        """Add a sample, dropping the oldest one if the buffer is full."""
+        self._samples.append(sample)
+        self.revision += 1
+        self.outcomes[sample.outcome] += 1
+        if sample.outcome == OUTCOME_ERROR:
+            # Only a cancelled poll ends without an exception being recorded
+            self.failures[sample.error_type or "CancelledError"] += 1
+        else:
+            self.last_success = sample.started.timestamp() + sample.duration
+            if sample.conditional and sample.outcome == OUTCOME_NOT_MODIFIED:
+                self.conditional_hits += 1
+            elif sample.conditional:
+                self.conditional_misses += 1
+        if (fetch_time := sample.fetch_time) is not None:
+            self.fetch_time.observe(fetch_time)
+            if sample.outcome != OUTCOME_ERROR:
+                self.bytes_received.observe(sample.bytes_received)
+        if (processing_time := sample.processing_time) is not None:
+            self.processing_time.observe(processing_time)
+
+    def summary(self) -> dict[str, Any]:
+        """Return p50 and p95 of the duration, each phase and the bytes."""
+        samples = self._samples
+        outcomes: dict[str, int] = {}
+        for sample in samples:
+            outcomes[sample.outcome] = outcomes.get(sample.outcome, 0) + 1
+        return {
+            "samples": len(samples),
+            "outcomes": outcomes,
+            "duration": _percentiles([sample.duration for sample in samples]),
+            "phases": {
+                phase: _percentiles(
+                    [
+                        sample.phases[phase]
+                        for sample in samples
+                        if phase in sample.phases
+                    ]
+                )
+                for phase in PHASES
+            },
+            "bytes_received": _percentiles(
+                [sample.bytes_received for sample in samples if sample.bytes_received]
+            ),
+            "peak_buffer_bytes": _percentiles(
+                [
+                    sample.peak_buffer_bytes
+                    for sample in samples
+                    if sample.peak_buffer_bytes is not None
+                ]
+            ),
+        }
+
+
+class BufferMeter:
+    """Size of the page buffers held at once while processing a page.
+
+    Tracing every allocation would slow down all of Home Assistant, so only
+    the page and the strings made from it are counted, by their size as
+    Python objects, while held() wraps them. This is not a measured peak:
+    parser internals, like a BeautifulSoup tree, and copies made outside of
+    held() are not counted.
+    """
+
+    __slots__ = ("held", "peak")
+
+    def __init__(self) -> None:
+        """Initialize the meter."""
+        self.held = 0
+        self.peak = 0
+
+
+@contextmanager
+def held(buffers: BufferMeter | None, *objects: object) -> Iterator[None]:
+    """Count objects as held during the block, if buffers are measured."""
+    if buffers is None:
+        yield
+        return
+    size = sum(sys.getsizeof(obj) for obj in objects)
+    buffers.held += size
+    buffers.peak = max(buffers.peak, buffers.held)
+    try:
+        yield
+    finally:
+        buffers.held -= size
+
+
+@contextmanager
+def timed(phases: dict[str, float] | None, phase: str) -> Iterator[None]:
+    """Add the time spent in the block to a phase, if phases are recorded."""
+    if phases is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases[phase] = phases.get(phase, 0.0) + time.perf_counter() - started
+
+
+def trace_config() -> TraceConfig:
+    """Return a trace config recording the connection phases of requests.
+
+    A request passes its phases as trace_request_ctx. Connecting includes
+    resolving the host, which is subtracted so the phases do not overlap.
+    """
+    config = TraceConfig()
+    config.on_dns_resolvehost_start.append(_on_dns_start)
+    config.on_dns_resolvehost_end.append(_on_dns_end)
+    config.on_connection_create_start.append(_on_connect_start)
+    config.on_connection_create_end.append(_on_connect_end)
+    return config
+
+
+def connection_time(phases: dict[str, float]) -> float:
+    """Return the time spent resolving the host and connecting."""
+    return sum(phases.get(phase, 0.0) for phase in _CONNECTION_PHASES)
+
+
+async def _on_dns_start(
+    session: ClientSession, context: SimpleNamespace, params: Any
+) -> None:
+    context.dns_started = time.perf_counter()
+
+
+async def _on_dns_end(
+    session: ClientSession, context: SimpleNamespace, params: Any
+) -> None:
+    if (phases := context.trace_request_ctx) is not None:
+        phases[PHASE_DNS] = time.perf_counter() - context.dns_started
+
+
+async def _on_connect_start(
+    session: ClientSession, context: SimpleNamespace, params: Any
+) -> None:
+    context.connect_started = time.perf_counter()
+
+
+async def _on_connect_end(
+    session: ClientSession, context: SimpleNamespace, params: Any
+) -> None:
+    if (phases := context.trace_request_ctx) is not None:
+        phases[PHASE_CONNECT] = (
+            time.perf_counter() - context.connect_started - phases.get(PHASE_DNS, 0.0)
+        )
+
+
+def _percentiles(values: list[float]) -> dict[str, float] | None:
+    """Return the nearest-rank p50 and p95 of some values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return {
+        "p50": ordered[_rank(len(ordered), 0.50)],
+        "p95": ordered[_rank(len(ordered), 0.95)],
+    }
+
+
+def _rank(count: int, quantile: float) -> int:
+    """Return the index of the nearest-rank quantile."""
+    return max(0, math.ceil(quantile * count) - 1)
@@ -0,0 +1,126 @@
+"""Probing of the download mirrors for the CTGP Deluxe Version integration.
+
+Each mirror is asked for the first bytes of the archive. The time until the
+response headers arrive is its latency, the rate at which the body arrives
+its throughput. Probes run concurrently, but only a few at a time, and all of
+them together get a fixed time budget.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlsplit
+
+from aiohttp import ClientError, ClientTimeout, hdrs
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    LOGGER,
+    MIRROR_PROBE_BUDGET,
+    MIRROR_PROBE_BYTES,
+    MIRROR_PROBE_CONCURRENCY,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class MirrorProbe:
+    """Result of probing one mirror."""
+
+    url: str
+    latency: float | None = None
+    throughput: float | None = None
+    error: str | None = None
+
+    @property
+    def host(self) -> str:
+        """Return the host name of the mirror."""
+        return urlsplit(self.url).hostname or self.url
+
+    @property
+    def reachable(self) -> bool:
+        """Return whether the mirror answered."""
+        return self.error is None
+
+
+def fastest_mirror(probes: list[MirrorProbe]) -> MirrorProbe | None:
+    """Return the reachable mirror with the highest throughput.
+
+    Mirrors without a measured throughput, e.g. because they answered with a
+    small page instead of the archive, only win on latency if no mirror
+    delivered any data.
+    """
+    reachable = [probe for probe in probes if probe.reachable]
+    if measured := [probe for probe in reachable if probe.throughput]:
+        return max(measured, key=lambda probe: probe.throughput or 0)
+    if reachable:
+        return min(reachable, key=lambda probe: probe.latency or 0)
+    return None
+
+
+async def async_probe_mirrors(
+    hass: HomeAssistant,
+    urls: list[str],
+    budget: float = MIRROR_PROBE_BUDGET,
+) -> list[MirrorProbe]:
+    """Probe the mirrors concurrently within the time budget.
+
+    Mirrors that did not finish within the budget are reported as timed out.
+    """
+    session = async_get_clientsession(hass)
+    semaphore = asyncio.Semaphore(MIRROR_PROBE_CONCURRENCY)
+
+    async def _async_probe(url: str) -> MirrorProbe:
+        async with semaphore:
+            return await _async_probe_mirror(session, url)
+
+    tasks = [asyncio.create_task(_async_probe(url)) for url in urls]
+    if not tasks:
+        return []
+    _, pending = await asyncio.wait(tasks, timeout=budget)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.wait(pending)
+
+    probes = [
+        task.result()
+        if not task.cancelled()
+        else MirrorProbe(url, error="Probe exceeded the time budget")
+        for url, task in zip(urls, tasks, strict=True)
+    ]
+    LOGGER.debug("Probed CTGP-DX mirrors: %s", probes)
+    return probes
+
+
+async def _async_probe_mirror(session: Any, url: str) -> MirrorProbe:
+    """Request the first bytes of the archive from a mirror."""
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    try:
+        async with session.get(
+            url,
+            headers={hdrs.RANGE: f"bytes=0-{MIRROR_PROBE_BYTES - 1}"},
+            timeout=ClientTimeout(total=MIRROR_PROBE_BUDGET),
+        ) as response:
+            response.raise_for_status()
+            headers_received = loop.time()
+            received = 0
+            async for chunk in response.content.iter_chunked(16 * 1024):
+                received += len(chunk)
+                if received >= MIRROR_PROBE_BYTES:
+                    # Servers ignoring the range would send the whole archive
+                    response.close()
+                    break
+            finished = loop.time()
+    except (ClientError, TimeoutError) as err:
+        return MirrorProbe(url, error=str(err) or type(err).__name__)
+
+    throughput = None
+    # A short page, e.g. a download confirmation, says nothing about speed
+    if received >= MIRROR_PROBE_BYTES:
+        throughput = received / max(finished - started, 1e-3)
+    return MirrorProbe(url, latency=headers_received - started, throughput=throughput)
@@ -0,0 +1,36 @@
+"""Data model for the CTGP Deluxe Version integration."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class CtgpdxData:
+    """Release information published by the coordinator.
+
+    ``generation`` increases whenever the published values change. It is not
+    part of equality, so the coordinator can tell unchanged results apart and
+    entities can cache everything they derive from one generation.
+    """
+
+    generation: int = field(compare=False)
+    version: str | None = None
+    download_size: int | None = None
+    unpacked_size: int | None = None
+    release_date: datetime | None = None
+    # Only known once the central directory of the archive has been read
+    file_count: int | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], generation: int) -> CtgpdxData:
+        """Create the model from normalized data."""
+        return cls(
+            generation,
+            **{item.name: data[item.name] for item in _FIELDS if item.name in data},
+        )
+
+
+_FIELDS = tuple(item for item in fields(CtgpdxData) if item.compare)
@@ -0,0 +1,164 @@
+"""OpenMetrics endpoint for the CTGP Deluxe Version integration.
+
+Serves the refresh counters and histograms of the coordinator to Prometheus
+at /api/ctgpdx/metrics, which needs a long-lived access token like any other
+API of Home Assistant. The counters are aggregated as refreshes are recorded
+and the text is only rendered again after a new refresh, so frequent scrapes
+cost next to nothing.
+"""
+
+from __future__ import annotations
+
+import time
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .metrics import Histogram, RefreshMetrics
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+class CtgpdxMetricsView(HomeAssistantView):
+    """Serve the refresh metrics as OpenMetrics text."""
+
+    url = "/api/ctgpdx/metrics"
+    name = "api:ctgpdx:metrics"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the view."""
+        self.hass = hass
+        self._rendered: tuple[int, int, str] | None = None
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the metrics of the coordinator of the loaded entry."""
+        coordinators = list(self.hass.data.get(DOMAIN, {}).values())
+        if not coordinators:
+            return web.Response(status=404, text="CTGP-DX is not set up")
+        metrics: RefreshMetrics = coordinators[0].metrics
+
+        # The coordinator is replaced when the entry is reloaded
+        key = (id(metrics), metrics.revision)
+        if self._rendered is None or self._rendered[:2] != key:
+            self._rendered = (*key, render_metrics(metrics))
+        body = self._rendered[2]
+
+        if metrics.last_success is not None:
+            body += _family(
+                "ctgpdx_time_since_last_success_seconds",
+                "gauge",
+                "Time since the last successful refresh.",
+                [("", {}, max(0.0, time.time() - metrics.last_success))],
+                unit="seconds",
+            )
+        return web.Response(
+            body=f"{body}# EOF\n".encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+
+def render_metrics(metrics: RefreshMetrics) -> str:
+    """Render the counters and histograms, without the final EOF marker."""
+    return "".join(
+        (
+            _family(
+                "ctgpdx_refreshes",
+                "counter",
+                "Refreshes of the CTGP-DX data by outcome.",
+                [
+                    ("_total", {"outcome": outcome}, count)
+                    for outcome, count in sorted(metrics.outcomes.items())
+                ],
+            ),
+            _family(
+                "ctgpdx_refresh_failures",
+                "counter",
+                "Failed refreshes by the exception that caused them.",
+                [
+                    ("_total", {"exception": exception}, count)
+                    for exception, count in sorted(metrics.failures.items())
+                ],
+            ),
+            _family(
+                "ctgpdx_conditional_requests",
+                "counter",
+                "Requests sent with validators, by whether the page was unmodified.",
+                [
+                    ("_total", {"result": "hit"}, metrics.conditional_hits),
+                    ("_total", {"result": "miss"}, metrics.conditional_misses),
+                ],
+            ),
+            _histogram(
+                "ctgpdx_fetch_duration_seconds",
+                "Time until the page was received, from sending the request.",
+                metrics.fetch_time,
+                unit="seconds",
+            ),
+            _histogram(
+                "ctgpdx_parse_duration_seconds",
+                "Time spent decoding, parsing and extracting the page.",
+                metrics.processing_time,
+                unit="seconds",
+            ),
+            _histogram(
+                "ctgpdx_received_bytes",
+                "Bytes of the page received per request.",
+                metrics.bytes_received,
+                unit="bytes",
+            ),
+        )
+    )
+
+
+def _histogram(name: str, help_text: str, histogram: Histogram, unit: str) -> str:
+    """Render a histogram with cumulative buckets."""
+    samples: list[tuple[str, dict[str, str], float]] = []
+    cumulative = 0
+    for bound, count in zip(
+        (*histogram.bounds, float("inf")), histogram.counts, strict=True
+    ):
+        cumulative += count
+        samples.append(("_bucket", {"le": _number(float(bound))}, cumulative))
+    samples.append(("_count", {}, histogram.count))
+    samples.append(("_sum", {}, histogram.sum))
+    return _family(name, "histogram", help_text, samples, unit=unit)
+
+
+def _family(
+    name: str,
+    kind: str,
+    help_text: str,
+    samples: list[tuple[str, dict[str, str], float]],
+    unit: str | None = None,
+) -> str:
+    """Render the metadata and samples of a metric family."""
+    lines = [f"# TYPE {name} {kind}"]
+    if unit:
+        lines.append(f"# UNIT {name} {unit}")
+    lines.append(f"# HELP {name} {help_text}")
+    for suffix, labels, value in samples:
+        label_text = ",".join(
+            f'{key}="{_escape(label)}"' for key, label in labels.items()
+        )
+        if label_text:
+            label_text = f"{{{label_text}}}"
+        lines.append(f"{name}{suffix}{label_text} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def _number(value: float) -> str:
+    """Format a number as OpenMetrics expects it."""
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
@@ -0,0 +1,201 @@
+"""On-demand profiling of a refresh for the CTGP Deluxe Version integration.
+
+The profile_refresh service fetches the page once and processes it under
+cProfile and tracemalloc. Both are only enabled for that call. cProfile only
+sees the executor thread that processes the page, while tracemalloc traces
+every thread of the process, so the allocations and the peak include
+whatever else Home Assistant did meanwhile.
+
+The field patterns are matched in a single combined scan, which cProfile
+cannot tell apart. Their share is measured by timing each pattern on its
+own over the text of the page after the profile was taken.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import os
+import pstats
+import re
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, PROFILE_TOP_ALLOCATIONS, PROFILE_TOP_FUNCTIONS
+from .coordinator import (
+    FIELD_SPECS,
+    REGION_SPECS,
+    CtgpdxUpdateCoordinator,
+    ParserBackend,
+    process_page,
+)
+from .metrics import PHASE_CONNECT, PHASE_DNS, PHASE_TRANSFER, PHASE_TTFB
+
+_FunctionKey = tuple[str, int, str]
+
+
+async def async_profile_refresh(
+    hass: HomeAssistant, coordinator: CtgpdxUpdateCoordinator
+) -> dict[str, Any]:
+    """Fetch the page and profile processing it.
+
+    Returns a summary for the service response. The full profile and the
+    allocation report are written to the configuration directory.
+    """
+    phases: dict[str, float] = {}
+    body, charset = await coordinator.async_fetch_page(phases)
+    prefix = Path(hass.config.path(f"{DOMAIN}_profile_{datetime.now():%Y%m%d_%H%M%S}"))
+    summary = await hass.async_add_executor_job(
+        profile_page, body, charset, coordinator.parser_backend, prefix
+    )
+    summary["fetch"] = {
+        "dns": phases.get(PHASE_DNS),
+        "connect": phases.get(PHASE_CONNECT),
+        "ttfb": phases.get(PHASE_TTFB),
+        "transfer": phases.get(PHASE_TRANSFER),
+        "bytes_received": len(body),
+    }
+    return summary
+
+
+def profile_page(
+    body: bytes, charset: str | None, backend: ParserBackend, prefix: Path
+) -> dict[str, Any]:
+    """Process a page under cProfile and tracemalloc.
+
+    Writes ``<prefix>.prof``, which can be opened with pstats or snakeviz, and
+    ``<prefix>_allocations.txt``. This blocks and runs in the executor. If
+    something else is already tracing, its peak is left alone and no peak
+    is reported.
+    """
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    phases: dict[str, float] = {}
+    profiler = cProfile.Profile()
+    try:
+        before = tracemalloc.take_snapshot()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            _, data = process_page(body, charset, backend, None, phases)
+        finally:
+            profiler.disable()
+        duration = time.perf_counter() - started
+        peak: int | None = None
+        if started_tracing:
+            _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+    allocations = after.compare_to(before, "lineno")
+    profile_path = prefix.with_name(f"{prefix.name}.prof")
+    allocations_path = prefix.with_name(f"{prefix.name}_allocations.txt")
+    profiler.dump_stats(profile_path)
+    allocations_path.write_text(
+        "\n".join(str(stat) for stat in allocations) + "\n", encoding="utf-8"
+    )
+
+    stats = pstats.Stats(profiler).stats  # type: ignore[attr-defined]
+    html = body.decode(charset or "utf-8", errors="replace")
+    return {
+        "profile": str(profile_path),
+        "allocations": str(allocations_path),
+        "data": data,
+        "duration": duration,
+        "phases": phases,
+        "beautifulsoup": _entry_time(stats, _in_beautifulsoup, _in_html_parsing),
+        "get_text": _entry_time(stats, lambda key: key[2] == "get_text"),
+        "extraction": _entry_time(stats, lambda key: key[2] == "_extract_fields"),
+        "patterns": pattern_times(backend.get_text(html)),
+        "hot_functions": [
+            {
+                "function": _function_name(key),
+                "calls": calls,
+                "own_time": own_time,
+                "cumulative_time": cumulative_time,
+            }
+            for key, (_, calls, own_time, cumulative_time, _) in sorted(
+                stats.items(), key=lambda item: item[1][2], reverse=True
+            )[:PROFILE_TOP_FUNCTIONS]
+        ],
+        "peak_memory": peak,
+        "top_allocations": [
+            {
+                "location": str(stat.traceback),
+                "size": stat.size_diff,
+                "count": stat.count_diff,
+            }
+            for stat in allocations[:PROFILE_TOP_ALLOCATIONS]
+        ],
+    }
+
+
+def pattern_times(text: str) -> dict[str, float]:
+    """Return how long each anchor and field pattern takes over a text."""
+    patterns = {
+        **{f"region_{spec.name}": spec.anchor for spec in REGION_SPECS},
+        **{f"{spec.field}_{spec.tier}": spec.pattern for spec in FIELD_SPECS},
+    }
+    times: dict[str, float] = {}
+    for name, pattern in patterns.items():
+        compiled = re.compile(pattern)
+        started = time.perf_counter()
+        for _ in compiled.finditer(text):
+            pass
+        times[name] = time.perf_counter() - started
+    return times
+
+
+def _function_name(key: _FunctionKey) -> str:
+    """Return a function as file:line(name), like pstats prints it."""
+    filename, line, name = key
+    # Built-in functions have no file
+    if filename == "~" and line == 0:
+        if name.startswith("<") and name.endswith(">"):
+            return f"{{{name[1:-1]}}}"
+        return name
+    return f"{filename}:{line}({name})"
+
+
+def _entry_time(
+    stats: dict[_FunctionKey, Any],
+    matches: Callable[[_FunctionKey], bool],
+    inside: Callable[[_FunctionKey], bool] | None = None,
+) -> float:
+    """Return the time spent in matching functions.
+
+    Only calls from functions that are not ``inside``, which defaults to the
+    matching ones, count, so nested and recursive calls are not counted twice.
+    """
+    inside = inside or matches
+    total = 0.0
+    for key, (*_, callers) in stats.items():
+        if matches(key):
+            total += sum(
+                edge[3] for caller, edge in callers.items() if not inside(caller)
+            )
+    return total
+
+
+def _in_beautifulsoup(key: _FunctionKey) -> bool:
+    """Return whether a function belongs to BeautifulSoup."""
+    return f"{os.sep}bs4{os.sep}" in key[0]
+
+
+def _in_html_parsing(key: _FunctionKey) -> bool:
+    """Return whether a function belongs to BeautifulSoup or the parser it drives.
+
+    The standard library parser calls back into the tree builder of
+    BeautifulSoup, which must not count as another entry.
+    """
+    return _in_beautifulsoup(key) or key[0].endswith(
+        (f"{os.sep}html{os.sep}parser.py", f"{os.sep}_markupbase.py")
+    )
@@ -0,0 +1,192 @@
+"""Polling schedule and circuit breaker for the CTGP Deluxe Version integration."""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from statistics import median
+
+from .const import (
+    BREAKER_COOLDOWN,
+    BREAKER_THRESHOLD,
+    HOT_UPDATE_INTERVAL,
+    MAX_RELEASE_HISTORY,
+    MAX_UPDATE_INTERVAL,
+    POLL_JITTER,
+    RELEASE_WINDOW,
+    RETRY_INTERVAL,
+    UPDATE_INTERVAL,
+)
+
+
+def _utcnow() -> datetime:
+    """Return the current time."""
+    return datetime.now(timezone.utc)
+
+
+class PollScheduler:
+    """Plan the next poll from the observed release history.
+
+    - Within RELEASE_WINDOW after the content changed, hotfixes are likely and
+      the page is polled every HOT_UPDATE_INTERVAL.
+    - The same applies within RELEASE_WINDOW around the expected next release,
+      which is the last change plus the median gap between changes.
+    - Otherwise the interval grows with the time since the last change, from
+      UPDATE_INTERVAL to MAX_UPDATE_INTERVAL, but never past the start of the
+      expected release window.
+    - After failures the interval backs off exponentially from RETRY_INTERVAL.
+
+    Every interval is jittered by POLL_JITTER so installations do not poll in
+    lockstep. The clock and random source can be replaced for simulations.
+    """
+
+    def __init__(
+        self,
+        clock: Callable[[], datetime] = _utcnow,
+        rng: random.Random | None = None,
+    ) -> None:
+        """Initialize the scheduler."""
+        self._clock = clock
+        self._random = rng or random.Random()
+        self.changes: list[datetime] = []
+        self.failures = 0
+        self.next_poll: datetime | None = None
+
+    @property
+    def expected_release(self) -> datetime | None:
+        """Return when the next release is expected, if known."""
+        if len(self.changes) < 2:
+            return None
+        gaps = [
+            (new - old).total_seconds()
+            for old, new in zip(self.changes, self.changes[1:])
+        ]
+        return self.changes[-1] + timedelta(seconds=median(gaps))
+
+    def restore(self, changes: list[float]) -> None:
+        """Restore the release history from persisted timestamps."""
+        self.changes = [
+            datetime.fromtimestamp(change, timezone.utc)
+            for change in changes[-MAX_RELEASE_HISTORY:]
+        ]
+
+    def as_timestamps(self) -> list[float]:
+        """Return the release history for persisting."""
+        return [change.timestamp() for change in self.changes]
+
+    def record_success(self, changed: bool) -> timedelta:
+        """Record a successful poll and return the interval until the next."""
+        now = self._clock()
+        self.failures = 0
+        if changed:
+            self.changes.append(now)
+            del self.changes[:-MAX_RELEASE_HISTORY]
+        return self._plan(now, self._interval(now))
+
+    def record_failure(self, not_before: timedelta | None = None) -> timedelta:
+        """Record a failed poll and return the backed off interval.
+
+        The interval is at least ``not_before``, e.g. from a Retry-After header.
+        """
+        self.failures += 1
+        backoff = RETRY_INTERVAL * 2 ** min(self.failures - 1, 16)
+        return self._plan(self._clock(), min(backoff, MAX_UPDATE_INTERVAL), not_before)
+
+    def _interval(self, now: datetime) -> timedelta:
+        """Return the interval before jitter after a successful poll."""
+        if not self.changes:
+            return UPDATE_INTERVAL
+
+        since_change = now - self.changes[-1]
+        if since_change < RELEASE_WINDOW:
+            return HOT_UPDATE_INTERVAL
+
+        interval = min(max(UPDATE_INTERVAL, since_change / 30), MAX_UPDATE_INTERVAL)
+        if (expected := self.expected_release) is None:
+            return interval
+        if abs(now - expected) < RELEASE_WINDOW:
+            return HOT_UPDATE_INTERVAL
+        if now < expected:
+            # Never sleep through the start of the release window
+            interval = min(interval, expected - RELEASE_WINDOW - now)
+        return max(interval, HOT_UPDATE_INTERVAL)
+
+    def _plan(
+        self, now: datetime, interval: timedelta, not_before: timedelta | None = None
+    ) -> timedelta:
+        """Jitter an interval and remember the resulting poll time."""
+        interval *= self._random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+        if not_before:
+            interval = max(interval, not_before)
+        self.next_poll = now + interval
+        return interval
+
+
+class CircuitBreaker:
+    """Stop polling a server that keeps failing until a cool-down has passed.
+
+    After BREAKER_THRESHOLD failed polls in a row the breaker opens and rejects
+    polls for BREAKER_COOLDOWN. The first poll after that is a trial: success
+    closes the breaker, failure opens it again for twice as long, up to
+    MAX_UPDATE_INTERVAL.
+    """
+
+    def __init__(self, clock: Callable[[], datetime] = _utcnow) -> None:
+        """Initialize the breaker."""
+        self._clock = clock
+        self._cooldown = BREAKER_COOLDOWN
+        self.failures = 0
+        self.failing_since: datetime | None = None
+        self.open_until: datetime | None = None
+
+    @property
+    def state(self) -> str:
+        """Return closed, open or half_open."""
+        if self.open_until is None:
+            return "closed"
+        if self._clock() < self.open_until:
+            return "open"
+        return "half_open"
+
+    @property
+    def cooldown_remaining(self) -> timedelta:
+        """Return how long polls are still rejected."""
+        if self.open_until is None:
+            return timedelta(0)
+        return max(self.open_until - self._clock(), timedelta(0))
+
+    @property
+    def outage(self) -> timedelta:
+        """Return for how long polls have been failing."""
+        if self.failing_since is None:
+            return timedelta(0)
+        return self._clock() - self.failing_since
+
+    def allow_request(self) -> bool:
+        """Return whether a poll may be sent."""
+        return self.state != "open"
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful poll."""
+        self._cooldown = BREAKER_COOLDOWN
+        self.failures = 0
+        self.failing_since = None
+        self.open_until = None
+
+    def record_failure(self) -> None:
+        """Count a failed poll and open the breaker if needed."""
+        state = self.state
+        if state == "open":
+            # Rejected polls are not failures of the server
+            return
+
+        now = self._clock()
+        if self.failing_since is None:
+            self.failing_since = now
+        self.failures += 1
+        if state == "half_open":
+            self._cooldown = min(self._cooldown * 2, MAX_UPDATE_INTERVAL)
+            self.open_until = now + self._cooldown
+        elif self.failures >= BREAKER_THRESHOLD:
+            self.open_until = now + self._cooldown
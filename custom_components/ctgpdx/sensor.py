@@ -2,11 +2,18 @@
 
 from __future__ import annotations
 
-from homeassistant.components.sensor import SensorEntity
+from datetime import datetime
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import PERCENTAGE, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     DOMAIN,
@@ -15,9 +22,12 @@ from .const import (
     ATTR_UNPACKED_SIZE,
     ATTR_RELEASE_DATE,
     ATTR_DATA_PROVIDED_BY,
+    ATTR_FILE_COUNT,
     URL,
 )
 from .coordinator import CtgpdxUpdateCoordinator
+from .download import ReleaseDownloader
+from .entity import CtgpdxEntity
 
 
 async def async_setup_entry(
@@ -43,6 +53,10 @@ async def async_setup_entry(
             "Download Size",
             "mdi:download-network",
             enabled_default=False,
+            device_class=SensorDeviceClass.DATA_SIZE,
+            state_class=SensorStateClass.MEASUREMENT,
+            unit=UnitOfInformation.BYTES,
+            suggested_unit=UnitOfInformation.GIGABYTES,
         ),
         CtgpdxSensor(
             coordinator,
@@ -51,13 +65,47 @@ async def async_setup_entry(
             "Unpacked Size",
             "mdi:folder-zip",
             enabled_default=False,
+            device_class=SensorDeviceClass.DATA_SIZE,
+            state_class=SensorStateClass.MEASUREMENT,
+            unit=UnitOfInformation.BYTES,
+            suggested_unit=UnitOfInformation.GIGABYTES,
+        ),
+        CtgpdxSensor(
+            coordinator,
+            entry,
+            ATTR_RELEASE_DATE,
+            "Release Date",
+            "mdi:calendar",
+            device_class=SensorDeviceClass.TIMESTAMP,
+        ),
+        CtgpdxMirrorSensor(
+            coordinator,
+            entry,
+            "fastest_mirror",
+            "Fastest Mirror",
+            "mdi:server-network",
+        ),
+        CtgpdxDownloadTimeSensor(
+            coordinator,
+            entry,
+            "download_time",
+            "Estimated Download Time",
+            "mdi:timer-sand",
+            device_class=SensorDeviceClass.DURATION,
+            unit=UnitOfTime.SECONDS,
+            suggested_unit=UnitOfTime.MINUTES,
         ),
     ]
 
+    if coordinator.downloader is not None:
+        entities.append(
+            CtgpdxDownloadSensor(coordinator, entry, coordinator.downloader)
+        )
+
     async_add_entities(entities)
 
 
-class CtgpdxSensor(CoordinatorEntity[CtgpdxUpdateCoordinator], SensorEntity):
+class CtgpdxSensor(CtgpdxEntity, SensorEntity):
     """Representation of a CTGP-DX sensor."""
 
     def __init__(
@@ -68,6 +116,10 @@ class CtgpdxSensor(CoordinatorEntity[CtgpdxUpdateCoordinator], SensorEntity):
         name_suffix: str,
         icon: str,
         enabled_default: bool = True,
+        device_class: SensorDeviceClass | None = None,
+        state_class: SensorStateClass | None = None,
+        unit: str | None = None,
+        suggested_unit: str | None = None,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
@@ -77,32 +129,149 @@ class CtgpdxSensor(CoordinatorEntity[CtgpdxUpdateCoordinator], SensorEntity):
         self._attr_icon = icon
         self._attr_unique_id = f"{entry.entry_id}_ctgpdx_{sensor_type}"
         self._attr_entity_registry_enabled_default = enabled_default
+        self._attr_device_class = device_class
+        self._attr_state_class = state_class
+        self._attr_native_unit_of_measurement = unit
+        self._attr_suggested_unit_of_measurement = suggested_unit
+        self._written_state: tuple[Any, ...] | None = None
+        self._attributes: dict[str, str | int | datetime] | None = None
+        self._attributes_generation: int | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if this sensor's state or attributes changed."""
+        state = (self.available, self.native_value, self.extra_state_attributes)
+        if state == self._written_state:
+            return
+        self._written_state = state
+        self.async_write_ha_state()
 
     @property
-    def native_value(self) -> str | None:
+    def native_value(self) -> str | int | datetime | None:
         """Return the state of the sensor."""
         if self.coordinator.data:
-            return self.coordinator.data.get(self._sensor_type)
+            return getattr(self.coordinator.data, self._sensor_type)
         return None
 
     @property
-    def extra_state_attributes(self) -> dict[str, str] | None:
-        """Return the extra state attributes."""
-        if self._sensor_type == ATTR_VERSION and self.coordinator.data:
-            attributes = {}
-            if release_date := self.coordinator.data.get(ATTR_RELEASE_DATE):
-                attributes[ATTR_RELEASE_DATE] = release_date
-            attributes[ATTR_DATA_PROVIDED_BY] = URL
-            return attributes
+    def extra_state_attributes(self) -> dict[str, str | int | datetime] | None:
+        """Return the extra state attributes, built once per data generation."""
+        data = self.coordinator.data
+        if self._sensor_type not in (ATTR_VERSION, ATTR_UNPACKED_SIZE) or not data:
+            return None
+        if self._attributes_generation != data.generation:
+            attributes: dict[str, str | int | datetime] = {}
+            if self._sensor_type == ATTR_VERSION:
+                if data.release_date:
+                    attributes[ATTR_RELEASE_DATE] = data.release_date
+                attributes[ATTR_DATA_PROVIDED_BY] = URL
+                self._attributes = attributes
+            elif data.file_count is not None:
+                # Counted from the archive, which also gave the exact size
+                attributes[ATTR_FILE_COUNT] = data.file_count
+                self._attributes = attributes
+            else:
+                self._attributes = None
+            self._attributes_generation = data.generation
+        return self._attributes
+
+
+class CtgpdxMirrorSensor(CtgpdxSensor):
+    """The mirror the release archive downloads fastest from."""
+
+    @property
+    def native_value(self) -> str | None:
+        """Return the host of the fastest mirror."""
+        if mirror := self.coordinator.fastest_mirror:
+            return mirror.host
         return None
 
     @property
-    def device_info(self):
-        """Return device information for this sensor."""
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the measurements of all mirrors."""
+        if not self.coordinator.mirrors:
+            return None
+        mirror = self.coordinator.fastest_mirror
+        return {
+            "url": mirror.url if mirror else None,
+            "mirrors": [
+                {
+                    "url": probe.url,
+                    "latency_ms": (
+                        round(probe.latency * 1000)
+                        if probe.latency is not None
+                        else None
+                    ),
+                    "throughput": (
+                        round(probe.throughput) if probe.throughput else None
+                    ),
+                    "error": probe.error,
+                }
+                for probe in self.coordinator.mirrors
+            ],
+        }
+
+
+class CtgpdxDownloadTimeSensor(CtgpdxSensor):
+    """Time downloading the release archive from the fastest mirror takes."""
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the estimated seconds."""
+        if (seconds := self.coordinator.estimated_download_time) is None:
+            return None
+        return round(seconds)
+
+    @property
+    def extra_state_attributes(self) -> None:
+        """Return no attributes."""
+        return None
+
+
+class CtgpdxDownloadSensor(CtgpdxEntity, SensorEntity):
+    """Progress of downloading the release archive."""
+
+    _attr_native_unit_of_measurement = PERCENTAGE
+
+    def __init__(
+        self,
+        coordinator: CtgpdxUpdateCoordinator,
+        entry: ConfigEntry,
+        downloader: ReleaseDownloader,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._downloader = downloader
+        self._attr_name = "CTGP-DX Download Progress"
+        self._attr_icon = "mdi:progress-download"
+        self._attr_unique_id = f"{entry.entry_id}_ctgpdx_download_progress"
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the progress of the downloader."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._downloader.async_add_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return True, the download does not depend on the website being polled."""
+        return True
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the downloaded percentage."""
+        return self._downloader.progress.percentage
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state and the details of the download."""
+        progress = self._downloader.progress
         return {
-            "identifiers": {(DOMAIN, "ctgpdx_version_sensor")},
-            "name": "CTGP Deluxe",
-            "manufacturer": "CTGP Deluxe Team",
-            "model": "Version Tracker",
-            "configuration_url": "https://www.ctgpdx.com/download",
+            "state": progress.state,
+            "path": progress.path,
+            "downloaded": progress.downloaded,
+            "total": progress.total,
+            "sha256": progress.sha256,
+            "error": progress.error,
         }
@@ -0,0 +1,45 @@
+"""System health support for the CTGP Deluxe Version integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components import system_health
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, URL
+from .coordinator import CtgpdxUpdateCoordinator
+from .metrics import OUTCOME_ERROR
+
+
+@callback
+def async_register(
+    hass: HomeAssistant, register: system_health.SystemHealthRegistration
+) -> None:
+    """Register the system health info callback."""
+    register.async_register_info(system_health_info)
+
+
+async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
+    """Return whether the website is reachable and how fast it was refreshed."""
+    info: dict[str, Any] = {
+        "can_reach_server": system_health.async_check_can_reach_url(hass, URL)
+    }
+    coordinators: list[CtgpdxUpdateCoordinator] = list(
+        hass.data.get(DOMAIN, {}).values()
+    )
+    if not coordinators:
+        return info
+
+    metrics = coordinators[0].metrics
+    if (last := metrics.last) is not None:
+        info["last_refresh"] = last.outcome
+    summary = metrics.summary()
+    if summary["samples"]:
+        errors = summary["outcomes"].get(OUTCOME_ERROR, 0)
+        info["refresh_success_rate"] = (
+            f"{100 * (1 - errors / summary['samples']):.0f} %"
+        )
+        info["refresh_duration_p50"] = f"{summary['duration']['p50'] * 1000:.0f} ms"
+        info["refresh_duration_p95"] = f"{summary['duration']['p95'] * 1000:.0f} ms"
+    return info
@@ -0,0 +1,94 @@
+"""Update platform for the CTGP Deluxe Version integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.update import (
+    ATTR_INSTALLED_VERSION,
+    UpdateEntity,
+    UpdateEntityFeature,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.restore_state import RestoreEntity
+
+from .const import DOMAIN, URL
+from .coordinator import CtgpdxUpdateCoordinator
+from .entity import CtgpdxEntity
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the update platform."""
+    coordinator: CtgpdxUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities([CtgpdxUpdateEntity(coordinator, entry)])
+
+
+class CtgpdxUpdateEntity(CtgpdxEntity, RestoreEntity, UpdateEntity):
+    """Installed versus latest CTGP-DX version.
+
+    Home Assistant cannot see what is on the Switch, so the installed version
+    is the latest one when the entity was first set up, and installing marks
+    the latest version as installed once the SD card has been updated.
+    """
+
+    _attr_supported_features = (
+        UpdateEntityFeature.INSTALL | UpdateEntityFeature.RELEASE_NOTES
+    )
+    _attr_title = "CTGP Deluxe"
+    _attr_release_url = URL
+
+    def __init__(
+        self, coordinator: CtgpdxUpdateCoordinator, entry: ConfigEntry
+    ) -> None:
+        """Initialize the update entity."""
+        super().__init__(coordinator)
+        self._attr_name = "CTGP-DX Update"
+        self._attr_icon = "mdi:nintendo-switch"
+        self._attr_unique_id = f"{entry.entry_id}_ctgpdx_update"
+        self._installed_version: str | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the installed version."""
+        await super().async_added_to_hass()
+        if last_state := await self.async_get_last_state():
+            self._installed_version = last_state.attributes.get(ATTR_INSTALLED_VERSION)
+        if self._installed_version is None:
+            self._installed_version = self.latest_version
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Take the first known version as the installed one."""
+        if self._installed_version is None:
+            self._installed_version = self.latest_version
+        super()._handle_coordinator_update()
+
+    @property
+    def installed_version(self) -> str | None:
+        """Return the version on the SD card."""
+        return self._installed_version
+
+    @property
+    def latest_version(self) -> str | None:
+        """Return the latest released version."""
+        if self.coordinator.data:
+            return self.coordinator.data.version
+        return None
+
+    async def async_install(
+        self, version: str | None, backup: bool, **kwargs: Any
+    ) -> None:
+        """Mark a version as installed."""
+        self._installed_version = version or self.latest_version
+        self.async_write_ha_state()
+
+    async def async_release_notes(self) -> str | None:
+        """Return the changelog entry of the latest version."""
+        if (version := self.latest_version) is None:
+            return None
+        return await self.coordinator.async_get_release_notes(version)
@@ -0,0 +1,258 @@
+"""Index of the CTGP-DX release archive for the CTGP Deluxe Version integration.
+
+The central directory at the end of a ZIP file lists every member with its
+sizes and CRC-32. Reading just that part with HTTP Range requests gives the
+exact unpacked size of a release for a few kilobytes instead of gigabytes.
+"""
+
+from __future__ import annotations
+
+import re
+import struct
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import Any, NamedTuple
+
+from aiohttp import ClientTimeout, hdrs
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import MAX_CENTRAL_DIRECTORY_SIZE
+
+# End of central directory record, optionally followed by a comment
+_EOCD = struct.Struct("<4s4H2LH")
+_EOCD_SIGNATURE = b"PK\x05\x06"
+# Locates the ZIP64 end of central directory record, right before the record
+_ZIP64_LOCATOR = struct.Struct("<4sLQL")
+_ZIP64_LOCATOR_SIGNATURE = b"PK\x06\x07"
+_ZIP64_EOCD = struct.Struct("<4sQ2H2L4Q")
+_ZIP64_EOCD_SIGNATURE = b"PK\x06\x06"
+_CENTRAL_HEADER = struct.Struct("<4s6H3L5H2L")
+_CENTRAL_HEADER_SIGNATURE = b"PK\x01\x02"
+_ZIP64_EXTRA_ID = 0x0001
+_UTF8_FLAG = 0x800
+
+_CONTENT_RANGE_PATTERN = re.compile(r"bytes\s+(?:(\d+)-\d+|\*)/(\d+|\*)", re.I)
+
+# The record, the longest possible comment and the ZIP64 locator
+_TAIL_SIZE = _EOCD.size + 0xFFFF + _ZIP64_LOCATOR.size
+
+
+class ZipIndexError(Exception):
+    """The archive cannot be indexed."""
+
+
+class ZipEntry(NamedTuple):
+    """A member of the archive."""
+
+    name: str
+    crc32: int
+    compressed_size: int
+    size: int
+
+
+@dataclass(frozen=True, slots=True)
+class ZipIndex:
+    """Central directory of the release archive of one version."""
+
+    version: str
+    url: str
+    archive_size: int
+    entries: tuple[ZipEntry, ...]
+
+    @property
+    def unpacked_size(self) -> int:
+        """Return the size of all members once extracted."""
+        return sum(entry.size for entry in self.entries)
+
+    @property
+    def file_count(self) -> int:
+        """Return the number of files, directories are not counted."""
+        return sum(1 for entry in self.entries if not entry.name.endswith("/"))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the index in a form that can be stored."""
+        return {
+            "version": self.version,
+            "url": self.url,
+            "archive_size": self.archive_size,
+            "entries": [list(entry) for entry in self.entries],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ZipIndex:
+        """Create the index from its stored form."""
+        return cls(
+            data["version"],
+            data["url"],
+            data["archive_size"],
+            tuple(ZipEntry(*entry) for entry in data["entries"]),
+        )
+
+
+async def async_read_zip_index(hass: HomeAssistant, url: str, version: str) -> ZipIndex:
+    """Read the central directory of a remote archive.
+
+    The tail of the file is requested first. It holds the end of central
+    directory record and, for most archives, the whole central directory.
+    Otherwise the central directory is requested on its own.
+    """
+    session = async_get_clientsession(hass)
+    tail, archive_size = await _async_get_range(session, url, f"-{_TAIL_SIZE}")
+    tail_start = archive_size - len(tail)
+
+    count, size, offset, zip64_offset = _parse_end_record(tail)
+    if zip64_offset is not None:
+        if zip64_offset >= tail_start:
+            record = tail[zip64_offset - tail_start :]
+        else:
+            record, _ = await _async_get_range(
+                session,
+                url,
+                f"{zip64_offset}-{zip64_offset + _ZIP64_EOCD.size - 1}",
+            )
+        count, size, offset = _parse_zip64_end_record(record)
+
+    if size > MAX_CENTRAL_DIRECTORY_SIZE:
+        raise ZipIndexError(f"Central directory of {size} bytes is too large")
+    if offset + size > archive_size:
+        raise ZipIndexError("Central directory lies outside of the archive")
+    if offset >= tail_start:
+        directory = tail[offset - tail_start : offset - tail_start + size]
+    else:
+        directory, _ = await _async_get_range(
+            session, url, f"{offset}-{offset + size - 1}"
+        )
+
+    entries = await hass.async_add_executor_job(
+        parse_central_directory, directory, count
+    )
+    return ZipIndex(version, url, archive_size, entries)
+
+
+async def _async_get_range(
+    session: Any, url: str, byte_range: str
+) -> tuple[bytes, int]:
+    """Request a range of the archive, returns the bytes and the archive size."""
+    async with session.get(
+        url,
+        headers={hdrs.RANGE: f"bytes={byte_range}"},
+        timeout=ClientTimeout(total=30),
+    ) as response:
+        response.raise_for_status()
+        _, archive_size = content_range(response.headers)
+        if response.status != HTTPStatus.PARTIAL_CONTENT or archive_size is None:
+            # Reading on would download the whole archive
+            raise ZipIndexError("Server does not support range requests")
+        if (response.content_length or 0) > MAX_CENTRAL_DIRECTORY_SIZE:
+            raise ZipIndexError("Server sent more than the requested range")
+        return await response.read(), archive_size
+
+
+def _parse_end_record(tail: bytes) -> tuple[int, int, int, int | None]:
+    """Parse the end of central directory record at the end of the tail.
+
+    Returns the number of entries, the size and the offset of the central
+    directory and, for ZIP64 archives, the offset of the ZIP64 record that
+    holds the actual values.
+    """
+    position = len(tail)
+    while (position := tail.rfind(_EOCD_SIGNATURE, 0, position)) >= 0:
+        if position + _EOCD.size > len(tail):
+            continue
+        *_, count, size, offset, comment_length = _EOCD.unpack_from(tail, position)
+        # The signature may also appear inside the comment
+        if position + _EOCD.size + comment_length == len(tail):
+            break
+    else:
+        raise ZipIndexError("No end of central directory record found")
+
+    locator = position - _ZIP64_LOCATOR.size
+    if locator >= 0 and tail.startswith(_ZIP64_LOCATOR_SIGNATURE, locator):
+        _, _, zip64_offset, _ = _ZIP64_LOCATOR.unpack_from(tail, locator)
+        return count, size, offset, zip64_offset
+    return count, size, offset, None
+
+
+def _parse_zip64_end_record(record: bytes) -> tuple[int, int, int]:
+    """Return the number of entries, size and offset from a ZIP64 record."""
+    if len(record) < _ZIP64_EOCD.size or not record.startswith(_ZIP64_EOCD_SIGNATURE):
+        raise ZipIndexError("No ZIP64 end of central directory record found")
+    *_, count, size, offset = _ZIP64_EOCD.unpack_from(record)
+    return count, size, offset
+
+
+def parse_central_directory(data: bytes, count: int) -> tuple[ZipEntry, ...]:
+    """Parse the entries of a central directory."""
+    entries: list[ZipEntry] = []
+    position = 0
+    try:
+        for _ in range(count):
+            (
+                signature,
+                _,
+                _,
+                flags,
+                _,
+                _,
+                _,
+                crc32,
+                compressed_size,
+                size,
+                name_length,
+                extra_length,
+                comment_length,
+                *_,
+            ) = _CENTRAL_HEADER.unpack_from(data, position)
+            if signature != _CENTRAL_HEADER_SIGNATURE:
+                raise ZipIndexError(f"Corrupt central directory at byte {position}")
+            position += _CENTRAL_HEADER.size
+            name = data[position : position + name_length].decode(
+                "utf-8" if flags & _UTF8_FLAG else "cp437"
+            )
+            position += name_length
+            if 0xFFFFFFFF in (size, compressed_size):
+                size, compressed_size = _zip64_sizes(
+                    data[position : position + extra_length], size, compressed_size
+                )
+            position += extra_length + comment_length
+            entries.append(ZipEntry(name, crc32, compressed_size, size))
+    except struct.error as err:
+        raise ZipIndexError("Truncated central directory") from err
+    return tuple(entries)
+
+
+def _zip64_sizes(extra: bytes, size: int, compressed_size: int) -> tuple[int, int]:
+    """Read the sizes that did not fit into the header from the ZIP64 field.
+
+    The field only holds the values whose header field is 0xFFFFFFFF, in the
+    order size, compressed size.
+    """
+    position = 0
+    while position + 4 <= len(extra):
+        field_id, length = struct.unpack_from("<2H", extra, position)
+        position += 4
+        if field_id == _ZIP64_EXTRA_ID:
+            if size == 0xFFFFFFFF:
+                (size,) = struct.unpack_from("<Q", extra, position)
+                position += 8
+            if compressed_size == 0xFFFFFFFF:
+                (compressed_size,) = struct.unpack_from("<Q", extra, position)
+            return size, compressed_size
+        position += length
+    raise ZipIndexError("ZIP64 sizes are missing")
+
+
+def content_range(headers: Any) -> tuple[int | None, int | None]:
+    """Return the first byte and the complete length from a Content-Range."""
+    match = _CONTENT_RANGE_PATTERN.fullmatch(
+        (headers.get(hdrs.CONTENT_RANGE) or "").strip()
+    )
+    if not match:
+        return None, None
+    start, total = match.groups()
+    return (
+        int(start) if start is not None else None,
+        int(total) if total != "*" else None,
+    )
@@ -0,0 +1,172 @@
+"""Benchmark of the extraction pipeline over the page corpus.
+
+Reports the time per page, the throughput and the peak memory of processing
+every page of tests/fixtures/corpus, and fails if a page got slower than
+recorded in baseline.json by more than CTGPDX_BENCHMARK_THRESHOLD (0.25 by
+default, i.e. 25 %).
+
+Times are compared relative to a fixed pure Python workload that runs
+interleaved with the page, so a baseline recorded on one machine holds on
+another and changes of the clock speed during a run cancel out. Record a new
+baseline after an intended change with CTGPDX_BENCHMARK_UPDATE=1.
+"""
+
+import sys
+import os
+import json
+import math
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+# Fail-safe path injection
+tests_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if tests_dir not in sys.path:
+    sys.path.insert(0, tests_dir)
+
+import pytest  # noqa: E402
+from custom_components.ctgpdx.const import (  # noqa: E402
+    DEFAULT_PARSER_BACKEND,
+    STREAM_CHUNK_SIZE,
+)
+from custom_components.ctgpdx.coordinator import (  # noqa: E402
+    PARSER_BACKENDS,
+    _finish_stream,
+    _PageStream,
+    process_page,
+)
+
+BASELINE = Path(__file__).with_name("baseline.json")
+THRESHOLD = float(os.environ.get("CTGPDX_BENCHMARK_THRESHOLD", "0.25"))
+UPDATE_BASELINE = os.environ.get("CTGPDX_BENCHMARK_UPDATE") == "1"
+# Each page is processed for at least this long and in at least this many rounds
+MIN_TIME = 1.0
+MIN_ROUNDS = 5
+# Shorter measurements are dominated by noise, so small pages run repeatedly
+MIN_MEASUREMENT = 0.01
+MB = 1024 * 1024
+PAGES = [
+    "download_page",
+    "minimal_page",
+    "varied_structure",
+    "long_changelog",
+    "dom_10x",
+    "dom_100x",
+    "messy_whitespace",
+]
+
+
+def _process(body):
+    """Run the pipeline of a regular refresh."""
+    return process_page(body, None, PARSER_BACKENDS[DEFAULT_PARSER_BACKEND])
+
+
+def _stream(body):
+    """Run the pipeline of a refresh with streaming enabled."""
+    page = _PageStream(None)
+    for start in range(0, len(body), STREAM_CHUNK_SIZE):
+        if page.feed(body[start : start + STREAM_CHUNK_SIZE]):
+            break
+    return _finish_stream(page)
+
+
+PIPELINES = {"process_page": _process, "streaming": _stream}
+
+
+def _measure(func, body):
+    """Return the time per run of a pipeline and its time relative to the reference.
+
+    Small pages are processed several times per measurement. Each round runs
+    the reference workload for about as long as the pipeline right before it,
+    and the median of the ratios counts, so both see the same conditions of
+    the machine.
+    """
+    number = max(1, math.ceil(MIN_MEASUREMENT / _time(func, body)))
+    repeat = max(1, round(_time(func, body, number) / _time(_reference_workload, None)))
+    best = float("inf")
+    ratios = []
+    started = time.perf_counter()
+    while len(ratios) < MIN_ROUNDS or time.perf_counter() - started < MIN_TIME:
+        reference = _time(_reference_workload, None, repeat)
+        seconds = _time(func, body, number)
+        best = min(best, seconds / number)
+        ratios.append(seconds / reference * repeat / number)
+    return best, statistics.median(ratios)
+
+
+def _time(func, body, number=1):
+    """Return the time of running a function a number of times."""
+    start = time.perf_counter()
+    for _ in range(number):
+        func(body)
+    return time.perf_counter() - start
+
+
+def _reference_workload(_body):
+    """Do a fixed amount of interpreter work, independent of the integration."""
+    words = {}
+    for number in range(10_000):
+        word = str(number * 7919 % 10_007)
+        words[word] = words.get(word, 0) + len(word)
+    return words
+
+
+def _peak_memory(func, body):
+    """Return the peak of memory allocated while processing a page."""
+    tracemalloc.start()
+    try:
+        func(body)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("pipeline", list(PIPELINES))
+@pytest.mark.parametrize("name", PAGES)
+def test_corpus_benchmark(corpus, pipeline, name):
+    """Measure one pipeline on one page and compare it with the baseline."""
+    corpus_version, pages = corpus
+    body, expected = pages[name]
+    func = PIPELINES[pipeline]
+    assert func(body)[1] == expected
+
+    seconds, relative = _measure(func, body)
+    result = {
+        "seconds": seconds,
+        "relative": relative,
+        "mb_per_s": len(body) / MB / seconds,
+        "peak_bytes": _peak_memory(func, body),
+    }
+    print(
+        f"\n{pipeline:12} {name:18} {len(body) / 1024:8.1f} KiB "
+        f"{seconds * 1000:9.3f} ms {result['mb_per_s']:7.2f} MB/s "
+        f"{result['peak_bytes'] / 1024:9.1f} KiB peak"
+    )
+
+    baseline = json.loads(BASELINE.read_text(encoding="utf-8"))
+    key = f"{pipeline}/{name}"
+    if UPDATE_BASELINE:
+        if baseline.get("corpus_version") != corpus_version:
+            baseline = {"corpus_version": corpus_version, "results": {}}
+        baseline["results"][key] = result
+        BASELINE.write_text(
+            json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+        return
+
+    if baseline.get("corpus_version") != corpus_version:
+        pytest.fail(
+            f"baseline.json was recorded for corpus version "
+            f"{baseline.get('corpus_version')}, not {corpus_version}. "
+            "Record it again with CTGPDX_BENCHMARK_UPDATE=1"
+        )
+    if (recorded := baseline["results"].get(key)) is None:
+        pytest.fail(f"No baseline for {key}, record it with CTGPDX_BENCHMARK_UPDATE=1")
+    slowdown = result["relative"] / recorded["relative"] - 1
+    assert slowdown <= THRESHOLD, (
+        f"{key} is {slowdown:.0%} slower than the baseline, "
+        f"more than the threshold of {THRESHOLD:.0%}"
+    )
@@ -0,0 +1,97 @@
+"""Benchmark showing that extraction stays linear on adversarial pages."""
+
+import sys
+import os
+import time
+
+# Fail-safe path injection
+tests_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if tests_dir not in sys.path:
+    sys.path.insert(0, tests_dir)
+
+import pytest  # noqa: E402
+from custom_components.ctgpdx.coordinator import (  # noqa: E402
+    _FieldScanner,
+    _extract_fields,
+    _fingerprint,
+)
+
+MB = 1024 * 1024
+SIZES_MB = [1, 10, 50]
+# Allowed growth of the time per MB between the smallest and largest page
+MAX_SLOWDOWN = 3.0
+
+# Text that used to make the lazy patterns backtrack over the rest of the page
+WORST_CASE_TEXT = {
+    "download_without_size": "Download ",
+    "unpacked_without_size": "Unpacked s ",
+    "version_without_end": "Version: 1 a ",
+    "changelog_without_date": "v1.1.1 - ",
+    "digits": "1234567890.",
+    "dates_without_year": "March 23rd, ",
+}
+
+# Markup that used to make the fingerprint patterns backtrack
+WORST_CASE_HTML = {
+    "unclosed_tags": "<a ",
+    "unclosed_scripts": "<script>x",
+    "unclosed_comments": "<!-- x",
+}
+
+
+def _page(unit, size_mb):
+    """Repeat a unit to the given size."""
+    return unit * (size_mb * MB // len(unit))
+
+
+def _seconds_per_mb(func, unit):
+    """Return the time per MB for every page size."""
+    results = {}
+    for size_mb in SIZES_MB:
+        page = _page(unit, size_mb)
+        start = time.perf_counter()
+        func(page)
+        results[size_mb] = (time.perf_counter() - start) / size_mb
+    return results
+
+
+def _stream(text):
+    """Feed text to the scanner in streaming sized pieces."""
+    scanner = _FieldScanner()
+    for start in range(0, len(text), 16 * 1024):
+        scanner.feed(text[start : start + 16 * 1024])
+    scanner.feed("", final=True)
+
+
+def _assert_linear(name, results):
+    """Print the results and check the time per MB did not grow."""
+    print(f"\n{name}:")
+    for size_mb, seconds in results.items():
+        print(f"  {size_mb:3d} MB {seconds * 1000:8.2f} ms/MB")
+    assert results[SIZES_MB[-1]] <= results[SIZES_MB[0]] * MAX_SLOWDOWN + 0.005
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("name", list(WORST_CASE_TEXT))
+def test_extraction_is_linear(name):
+    """Test that one scan over worst case text grows linearly."""
+    _assert_linear(name, _seconds_per_mb(_extract_fields, WORST_CASE_TEXT[name]))
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("name", list(WORST_CASE_TEXT))
+def test_streaming_extraction_is_linear(name):
+    """Test that scanning the text in pieces grows linearly."""
+    _assert_linear(name, _seconds_per_mb(_stream, WORST_CASE_TEXT[name]))
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("name", list(WORST_CASE_HTML))
+def test_fingerprint_is_linear(name):
+    """Test that fingerprinting worst case markup grows linearly."""
+    _assert_linear(
+        name,
+        _seconds_per_mb(
+            lambda html: _fingerprint(html.encode(), html), WORST_CASE_HTML[name]
+        ),
+    )
@@ -0,0 +1,60 @@
+"""Benchmark comparing the parser backends of the CTGP-DX coordinator."""
+
+import sys
+import os
+import time
+import tracemalloc
+
+# Fail-safe path injection
+tests_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if tests_dir not in sys.path:
+    sys.path.insert(0, tests_dir)
+
+import pytest  # noqa: E402
+from custom_components.ctgpdx.coordinator import PARSER_BACKENDS  # noqa: E402
+
+ROUNDS = 5
+
+
+def _build_page(sample_html, entries):
+    """Return the sample page with a changelog of the given length."""
+    changelog = "".join(
+        f"<h3>v1.0.{i} - January 1st, 2024</h3>"
+        f"<ul>{'<li>Fixed a <b>crash</b> on <i>some</i> track.</li>' * 10}</ul>"
+        for i in range(entries)
+    )
+    return sample_html.replace("</body>", f"{changelog}</body>")
+
+
+def _measure(backend, html):
+    """Return the best time and the peak allocation of one backend run."""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        backend.get_text(html)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        backend.get_text(html)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("entries", [0, 50, 500])
+def test_parser_backend_benchmark(sample_html, entries):
+    """Compare time and allocated bytes of all backends on the same pages."""
+    html = _build_page(sample_html, entries)
+    results = {
+        name: _measure(backend, html) for name, backend in PARSER_BACKENDS.items()
+    }
+
+    print(f"\n{len(html) / 1024:.0f} KiB page:")
+    for name, (seconds, peak) in results.items():
+        print(f"  {name:<15} {seconds * 1000:8.2f} ms {peak / 1024:10.0f} KiB peak")
+
+    # The tokenizer never builds a tree, so it must not allocate more
+    assert results["html_parser"][1] <= results["beautifulsoup"][1]
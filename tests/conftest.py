@@ -10,9 +10,13 @@ if tests_dir not in sys.path:
     sys.path.insert(0, tests_dir)
 
 # Now we can import - these will use our mocks
+import json  # noqa: E402
 import pytest  # noqa: E402
+from pathlib import Path  # noqa: E402
 from unittest.mock import MagicMock  # noqa: E402
 
+CORPUS_DIR = Path(tests_dir) / "fixtures" / "corpus"
+
 
 @pytest.fixture
 def mock_hass():
@@ -29,6 +33,19 @@ def mock_hass():
     asyncio.set_event_loop(loop)
     hass.loop = loop
 
+    async def async_add_executor_job(target, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, target, *args)
+
+    hass.async_add_executor_job = async_add_executor_job
+
+    def async_create_background_task(target, name, eager_start=True):
+        # Background work is run explicitly by the tests that cover it
+        target.close()
+
+    hass.async_create_background_task = MagicMock(
+        side_effect=async_create_background_task
+    )
+
     # Set the frame helper's _hass ContextVar to our mock
     # This is required because DataUpdateCoordinator checks for the hass context
     original_hass = getattr(frame._hass, "hass", None)
@@ -57,3 +74,69 @@ def sample_html():
         </body>
     </html>
     """
+
+
+@pytest.fixture(scope="session")
+def corpus():
+    """Return the pages of the corpus and the fields expected from them.
+
+    Returns the version of the corpus and a dict of page name to the raw
+    page and its expected fields. Besides the pages in fixtures/corpus this
+    contains large variants generated as described in corpus.json.
+    """
+    manifest = json.loads((CORPUS_DIR / "corpus.json").read_text(encoding="utf-8"))
+    pages = {
+        name: ((CORPUS_DIR / page["file"]).read_bytes(), page["expected"])
+        for name, page in manifest["pages"].items()
+    }
+    for name, variant in manifest["variants"].items():
+        body, expected = pages[variant["base"]]
+        pages[name] = (_corpus_variant(body.decode(), variant).encode(), expected)
+    return manifest["version"], pages
+
+
+@pytest.fixture(scope="session")
+def page_of_size(corpus):
+    """Return a function blowing the download page of the corpus up to a size.
+
+    The function returns the page and the fields expected from it.
+    """
+    _, pages = corpus
+    body, expected = pages["download_page"]
+    html = body.decode()
+
+    def generate(size):
+        variant = {"dom_factor": max(1, round(size / len(body)))}
+        return _corpus_variant(html, variant).encode(), expected
+
+    return generate
+
+
+def _corpus_variant(html, variant):
+    """Generate a larger or messier variant of a corpus page."""
+    if entries := variant.get("changelog_entries"):
+        # Older versions below the existing entries
+        changelog = "".join(
+            f"<h3>v0.{number}.0 - January 1st, 2020</h3>"
+            f"<ul>{'<li>Fixed a <b>crash</b> on <i>some</i> track.</li>' * 5}</ul>"
+            for number in range(entries)
+        )
+        html = html.replace(
+            "</section>\n  </main>", f"{changelog}</section>\n  </main>"
+        )
+    if factor := variant.get("dom_factor"):
+        # Unrelated markup between the notice and the release block
+        filler = (
+            '<div class="card"><div class="row"><span class="label">Track</span>'
+            '<span class="value">Rainbow Road <em>(retro)</em></span></div>'
+            '<div class="row"><a href="/tracks/42"><img src="/img/42.png" alt=""></a>'
+            "</div></div>\n"
+        )
+        count = (factor - 1) * len(html) // len(filler)
+        html = html.replace(
+            '<section class="card release">',
+            f'{filler * count}<section class="card release">',
+        )
+    if variant.get("messy_whitespace"):
+        html = html.replace("\n", "\r\n\t \r\n").replace(" ", " \t  ")
+    return html
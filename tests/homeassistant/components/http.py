@@ -0,0 +1,9 @@
+"""Mock for homeassistant.components.http."""
+
+
+class HomeAssistantView:
+    """Base class for views of the Home Assistant HTTP server."""
+
+    url = None
+    name = None
+    requires_auth = True
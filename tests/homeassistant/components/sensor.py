@@ -0,0 +1,27 @@
+"""Mock for homeassistant.components.sensor."""
+
+from enum import StrEnum
+
+
+class SensorDeviceClass(StrEnum):
+    """Sensor device classes."""
+
+    DATA_SIZE = "data_size"
+    DURATION = "duration"
+    TIMESTAMP = "timestamp"
+
+
+class SensorStateClass(StrEnum):
+    """Sensor state classes."""
+
+    MEASUREMENT = "measurement"
+
+
+class SensorEntity:
+    """Base class for sensors."""
+
+    _attr_device_info = None
+
+    @property
+    def device_info(self):
+        return self._attr_device_info
@@ -0,0 +1,16 @@
+"""Mock for homeassistant.components.system_health."""
+
+
+class SystemHealthRegistration:
+    """Registration of the system health info of an integration."""
+
+    def __init__(self):
+        self.info_callback = None
+
+    def async_register_info(self, info_callback, manage_url=None):
+        self.info_callback = info_callback
+
+
+async def async_check_can_reach_url(hass, url, more_info=None):
+    """Return whether the URL can be reached."""
+    return "ok"
@@ -0,0 +1,22 @@
+"""Mock for homeassistant.components.update."""
+
+from enum import IntFlag
+
+ATTR_INSTALLED_VERSION = "installed_version"
+
+
+class UpdateEntityFeature(IntFlag):
+    """Supported features of an update entity."""
+
+    INSTALL = 1
+    RELEASE_NOTES = 16
+
+
+class UpdateEntity:
+    """Base class for update entities."""
+
+    _attr_device_info = None
+
+    @property
+    def device_info(self):
+        return self._attr_device_info
@@ -2,3 +2,13 @@ class ConfigEntry:
     def __init__(self):
         self.entry_id = "test"
         self.data = {}
+        self.options = {}
+
+    def add_update_listener(self, listener):
+        return lambda: None
+
+    def async_on_unload(self, func):
+        pass
+
+    def async_create_background_task(self, hass, target, name, eager_start=True):
+        return hass.async_create_background_task(target, name, eager_start)
@@ -3,3 +3,17 @@ from enum import Enum
 
 class Platform(str, Enum):
     SENSOR = "sensor"
+    UPDATE = "update"
+
+
+PERCENTAGE = "%"
+
+
+class UnitOfTime(str, Enum):
+    SECONDS = "s"
+    MINUTES = "min"
+
+
+class UnitOfInformation(str, Enum):
+    BYTES = "B"
+    GIGABYTES = "GB"
@@ -1,7 +1,30 @@
+from enum import Enum
+
+
 class HomeAssistant:
     def __init__(self):
         self.data = {}
 
 
+ServiceResponse = dict | None
+
+
+class SupportsResponse(str, Enum):
+    NONE = "none"
+    OPTIONAL = "optional"
+    ONLY = "only"
+
+
+class ServiceCall:
+    def __init__(self, domain, service, data=None):
+        self.domain = domain
+        self.service = service
+        self.data = data or {}
+
+
 class Platform:
     SENSOR = "sensor"
+
+
+def callback(func):
+    return func
@@ -3,3 +3,7 @@ from unittest.mock import MagicMock
 
 def async_get_clientsession(hass):
     return MagicMock()
+
+
+def async_create_clientsession(hass, verify_ssl=True, auto_cleanup=True, **kwargs):
+    return MagicMock()
@@ -0,0 +1,6 @@
+"""Mock for homeassistant.helpers.config_validation."""
+
+
+def config_entry_only_config_schema(domain):
+    """Return a schema passing the configuration through."""
+    return lambda config: config
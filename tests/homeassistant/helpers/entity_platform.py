@@ -0,0 +1,5 @@
+"""Mock for homeassistant.helpers.entity_platform."""
+
+from collections.abc import Callable
+
+AddEntitiesCallback = Callable
@@ -0,0 +1,11 @@
+"""Mock for homeassistant.helpers.restore_state."""
+
+
+class RestoreEntity:
+    """Entity that restores its state after a restart."""
+
+    async def async_added_to_hass(self):
+        pass
+
+    async def async_get_last_state(self):
+        return None
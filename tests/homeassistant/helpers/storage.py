@@ -0,0 +1,22 @@
+"""Mock for homeassistant.helpers.storage."""
+
+
+class Store:
+    """In-memory stand-in for the Home Assistant JSON store."""
+
+    def __init__(self, hass, version, key, **kwargs):
+        self.hass = hass
+        self.version = version
+        self.key = key
+        self._data = None
+
+    def __class_getitem__(cls, key):
+        return cls
+
+    async def async_load(self):
+        """Return the stored data."""
+        return self._data
+
+    async def async_save(self, data):
+        """Save the data."""
+        self._data = data
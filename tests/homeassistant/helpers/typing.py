@@ -0,0 +1,5 @@
+"""Mock for homeassistant.helpers.typing."""
+
+from typing import Any
+
+ConfigType = dict[str, Any]
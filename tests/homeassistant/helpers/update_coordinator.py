@@ -1,14 +1,60 @@
 class DataUpdateCoordinator:
-    def __init__(self, hass, logger, name, update_interval=None, update_method=None):
+    def __init__(
+        self,
+        hass,
+        logger,
+        name,
+        update_interval=None,
+        update_method=None,
+        always_update=True,
+    ):
         self.hass = hass
         self.logger = logger
         self.name = name
         self.update_interval = update_interval
         self.data = None
+        self.last_update_success = True
 
     def __class_getitem__(cls, key):
         return cls
 
+    def async_set_updated_data(self, data):
+        self.data = data
+        self.last_update_success = True
+
+    def async_update_listeners(self):
+        pass
+
+    async def async_refresh(self):
+        self.data = await self._async_update_data()
+
+    async def async_shutdown(self):
+        pass
+
+
+class CoordinatorEntity:
+    def __init__(self, coordinator):
+        self.coordinator = coordinator
+
+    def __class_getitem__(cls, key):
+        return cls
+
+    @property
+    def available(self):
+        return self.coordinator.last_update_success
+
+    async def async_added_to_hass(self):
+        pass
+
+    def async_on_remove(self, func):
+        self.__dict__.setdefault("_on_remove", []).append(func)
+
+    def _handle_coordinator_update(self):
+        self.async_write_ha_state()
+
+    def async_write_ha_state(self):
+        pass
+
 
 class UpdateFailed(Exception):
     pass
@@ -8,12 +8,35 @@ tests_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "tests
 if tests_dir not in sys.path:
     sys.path.insert(0, tests_dir)
 
+import asyncio  # noqa: E402
 import pytest  # noqa: E402
-from unittest.mock import patch, MagicMock  # noqa: E402
-from custom_components.ctgpdx.coordinator import CtgpdxUpdateCoordinator  # noqa: E402
+from unittest.mock import patch, AsyncMock, MagicMock  # noqa: E402
+from datetime import datetime, timedelta, timezone  # noqa: E402
+from aiohttp import ClientResponseError  # noqa: E402
+from multidict import CIMultiDict  # noqa: E402
+from custom_components.ctgpdx.models import CtgpdxData  # noqa: E402
+from custom_components.ctgpdx.coordinator import (  # noqa: E402
+    CtgpdxUpdateCoordinator,
+    normalize_data,
+    process_page,
+)
+from custom_components.ctgpdx.const import (  # noqa: E402
+    BREAKER_COOLDOWN,
+    BREAKER_THRESHOLD,
+    FETCH_ATTEMPTS,
+    POLL_JITTER,
+    UPDATE_INTERVAL,
+)
 from homeassistant.helpers.update_coordinator import UpdateFailed  # noqa: E402
 
 
+@pytest.fixture
+def no_fetch_interval():
+    """Allow requests in quick succession."""
+    with patch("custom_components.ctgpdx.coordinator.MIN_FETCH_INTERVAL", timedelta(0)):
+        yield
+
+
 @pytest.mark.asyncio
 async def test_coordinator_scraping(mock_hass, sample_html):
     """Test the scraping logic in the coordinator."""
@@ -21,19 +44,21 @@ async def test_coordinator_scraping(mock_hass, sample_html):
 
     # Mock the web request
     with patch(
-        "custom_components.ctgpdx.coordinator.async_get_clientsession"
+        "custom_components.ctgpdx.coordinator.async_create_clientsession"
     ) as mock_session_factory:
         mock_session = MagicMock()
         mock_session_factory.return_value = mock_session
 
         mock_response = MagicMock()
         mock_response.raise_for_status = MagicMock()
+        mock_response.status = 200
+        mock_response.headers = {}
 
         # Async mock for text()
-        async def mock_text():
-            return sample_html
+        async def mock_read():
+            return sample_html.encode()
 
-        mock_response.text = mock_text
+        mock_response.read = mock_read
 
         # Async context manager for session.get()
         class MockContextManager:
@@ -47,10 +72,10 @@ async def test_coordinator_scraping(mock_hass, sample_html):
 
         data = await coordinator._async_update_data()
 
-        assert data["version"] == "1.1.1"
-        assert data["download_size"] == "3.86 GB"
-        assert data["unpacked_size"] == "4.52 GB"
-        assert data["release_date"] == "March 23rd, 2025"
+        assert data.version == "1.1.1"
+        assert data.download_size == 3_860_000_000
+        assert data.unpacked_size == 4_520_000_000
+        assert data.release_date == datetime(2025, 3, 23, tzinfo=timezone.utc)
 
 
 @pytest.mark.asyncio
@@ -59,7 +84,7 @@ async def test_coordinator_scraping_error(mock_hass):
     coordinator = CtgpdxUpdateCoordinator(mock_hass)
 
     with patch(
-        "custom_components.ctgpdx.coordinator.async_get_clientsession"
+        "custom_components.ctgpdx.coordinator.async_create_clientsession"
     ) as mock_session_factory:
         mock_session = MagicMock()
         mock_session_factory.return_value = mock_session
@@ -69,5 +94,727 @@ async def test_coordinator_scraping_error(mock_hass):
 
         mock_session.get.side_effect = ClientError("Connection failed")
 
+        with (
+            patch("custom_components.ctgpdx.coordinator.asyncio.sleep") as mock_sleep,
+            pytest.raises(UpdateFailed),
+        ):
+            await coordinator._async_update_data()
+
+        # Transient errors are retried with backoff within the refresh
+        assert mock_session.get.call_count == FETCH_ATTEMPTS
+        assert mock_sleep.call_count == FETCH_ATTEMPTS - 1
+
+        # The next attempt is retried sooner instead of after the full interval
+        assert coordinator.update_interval < UPDATE_INTERVAL
+
+
+@pytest.mark.asyncio
+async def test_coordinator_retry_after(mock_hass, sample_html, no_fetch_interval):
+    """Test that Retry-After is honoured before retrying a 503."""
+    coordinator = CtgpdxUpdateCoordinator(mock_hass)
+
+    with patch(
+        "custom_components.ctgpdx.coordinator.async_create_clientsession"
+    ) as mock_session_factory:
+        mock_session = MagicMock()
+        mock_session_factory.return_value = mock_session
+
+        def make_response(status, headers, html=""):
+            mock_response = MagicMock()
+            mock_response.status = status
+            mock_response.headers = CIMultiDict(headers)
+            if status >= 400:
+                mock_response.raise_for_status = MagicMock(
+                    side_effect=ClientResponseError(
+                        MagicMock(), (), status=status, headers=mock_response.headers
+                    )
+                )
+
+            async def mock_read():
+                return html.encode()
+
+            mock_response.read = mock_read
+
+            class MockContextManager:
+                async def __aenter__(self):
+                    return mock_response
+
+                async def __aexit__(self, *args):
+                    pass
+
+            return MockContextManager()
+
+        mock_session.get.side_effect = [
+            make_response(503, {"Retry-After": "7"}),
+            make_response(200, {}, sample_html),
+        ]
+
+        with patch("custom_components.ctgpdx.coordinator.asyncio.sleep") as mock_sleep:
+            data = await coordinator._async_update_data()
+
+        mock_sleep.assert_called_once_with(7.0)
+        assert data.version == "1.1.1"
+
+        # A Retry-After beyond one refresh is left to the scheduler
+        mock_session.get.side_effect = [make_response(429, {"Retry-After": "3600"})]
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
+        assert mock_session.get.call_count == 3
+        assert coordinator.update_interval >= timedelta(hours=1)
+
+
+@pytest.mark.asyncio
+async def test_coordinator_circuit_breaker(mock_hass):
+    """Test that repeated failures stop requests until the cool-down ends."""
+    coordinator = CtgpdxUpdateCoordinator(mock_hass)
+
+    with patch(
+        "custom_components.ctgpdx.coordinator.async_create_clientsession"
+    ) as mock_session_factory:
+        mock_session = MagicMock()
+        mock_session_factory.return_value = mock_session
+        mock_session.get.side_effect = Exception("Connection error")
+
+        for _ in range(BREAKER_THRESHOLD):
+            with pytest.raises(UpdateFailed):
+                await coordinator._async_update_data()
+        assert coordinator.breaker.state == "open"
+        assert coordinator.update_interval >= BREAKER_COOLDOWN * 0.9
+
+        mock_session.get.reset_mock()
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
+        mock_session.get.assert_not_called()
+
+        # After the cool-down one trial request is sent
+        coordinator.breaker.open_until = datetime.now(timezone.utc)
+        assert coordinator.breaker.state == "half_open"
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
+        mock_session.get.assert_called_once()
+        assert coordinator.breaker.state == "open"
+
+
+@pytest.mark.asyncio
+async def test_coordinator_conditional_request(
+    mock_hass, sample_html, no_fetch_interval
+):
+    """Test that validators are sent back and a 304 reuses the cached data."""
+    coordinator = CtgpdxUpdateCoordinator(mock_hass)
+
+    with patch(
+        "custom_components.ctgpdx.coordinator.async_create_clientsession"
+    ) as mock_session_factory:
+        mock_session = MagicMock()
+        mock_session_factory.return_value = mock_session
+
+        full_response = MagicMock()
+        full_response.raise_for_status = MagicMock()
+        full_response.status = 200
+        full_response.headers = CIMultiDict(
+            {
+                "ETag": '"abc123"',
+                "Last-Modified": "Sun, 23 Mar 2025 10:00:00 GMT",
+            }
+        )
+
+        async def mock_read():
+            return sample_html.encode()
+
+        full_response.read = mock_read
+
+        not_modified = MagicMock()
+        not_modified.status = 304
+        not_modified.headers = {}
+        not_modified.read = MagicMock(side_effect=AssertionError("body was read"))
+
+        class MockContextManager:
+            def __init__(self, response):
+                self.response = response
+
+            async def __aenter__(self):
+                return self.response
+
+            async def __aexit__(self, *args):
+                pass
+
+        mock_session.get.side_effect = [
+            MockContextManager(full_response),
+            MockContextManager(not_modified),
+        ]
+
+        first = await coordinator._async_update_data()
+
+        with patch("custom_components.ctgpdx.coordinator.BeautifulSoup") as mock_soup:
+            second = await coordinator._async_update_data()
+            mock_soup.assert_not_called()
+
+        assert second == first
+        headers = mock_session.get.call_args.kwargs["headers"]
+        assert headers["If-None-Match"] == '"abc123"'
+        assert headers["If-Modified-Since"] == "Sun, 23 Mar 2025 10:00:00 GMT"
+
+        # Validators and data are persisted so they survive a restart
+        stored = await coordinator._store.async_load()
+        assert stored["etag"] == '"abc123"'
+        assert CtgpdxData.from_dict(normalize_data(stored["data"]), 0) == first
+
+
+@pytest.mark.asyncio
+async def test_coordinator_fresh_cache_skips_request(mock_hass):
+    """Test that a cached copy within max-age is served without a request."""
+    coordinator = CtgpdxUpdateCoordinator(mock_hass)
+    cached = {"version": "1.1.1"}
+    await coordinator._store.async_save(
+        {
+            "etag": None,
+            "last_modified": None,
+            "expires": 4102444800.0,
+            "data": cached,
+            "links": [],
+        }
+    )
+
+    with patch(
+        "custom_components.ctgpdx.coordinator.async_create_clientsession"
+    ) as mock_session_factory:
+        data = await coordinator._async_update_data()
+
+        mock_session_factory.return_value.get.assert_not_called()
+        assert data.version == "1.1.1"
+
+    # The planned poll survives a restart, the cached copy stays as it was
+    stored = await coordinator._store.async_load()
+    assert stored["next_due"] == coordinator.scheduler.next_poll.timestamp()
+    assert stored["expires"] == 4102444800.0
+    assert stored["data"] == cached
+
+
+@pytest.mark.asyncio
+async def test_coordinator_restore(mock_hass, sample_html):
+    """Test that persisted data is published with the time until it is due."""
+    coordinator = CtgpdxUpdateCoordinator(mock_hass)
+    assert await coordinator.async_restore() is None
+
+    with patch(
+        "custom_components.ctgpdx.coordinator.async_create_clientsession"
+    ) as mock_session_factory:
+        mock_session = MagicMock()
+        mock_session_factory.return_value = mock_session
+        mock_response = MagicMock()
+        mock_response.raise_for_status = MagicMock()
+        mock_response.status = 200
+        mock_response.headers = {}
+
+        async def mock_read():
+            return sample_html.encode()
+
+        mock_response.read = mock_read
+
+        class MockContextManager:
+            async def __aenter__(self):
+                return mock_response
+
+            async def __aexit__(self, *args):
+                pass
+
+        mock_session.get.return_value = MockContextManager()
+        data = await coordinator._async_update_data()
+
+    # A restarted coordinator reads the same store without any request
+    restarted = CtgpdxUpdateCoordinator(mock_hass)
+    restarted._store = coordinator._store
+    with patch(
+        "custom_components.ctgpdx.coordinator.async_create_clientsession"
+    ) as mock_session_factory:
+        delay = await restarted.async_restore()
+        mock_session_factory.assert_not_called()
+
+    assert restarted.data == data
+    assert 0 < delay <= UPDATE_INTERVAL.total_seconds() * (1 + POLL_JITTER)
+    # The timer of the coordinator runs until the persisted schedule is due
+    assert restarted.update_interval == timedelta(seconds=max(delay, 1))
+
+    # Once the schedule has passed the refresh is due right away
+    restarted._cache["next_due"] = 0
+    assert await restarted.async_restore() == 0
+    assert restarted.update_interval == timedelta(seconds=1)
+
+
+@pytest.mark.asyncio
+async def test_coordinator_fingerprint_skips_parse(
+    mock_hass, sample_html, no_fetch_interval
+):
+    """Test that an unchanged page with a rotating nonce is not parsed again."""
+    coordinator = CtgpdxUpdateCoordinator(mock_hass)
+
+    pages = [
+        sample_html.replace("<body>", '<body><script nonce="a1">ads()</script>'),
+        sample_html.replace("<body>", '<body><script nonce="b2">ads()</script>'),
+    ]
+
+    with patch(
+        "custom_components.ctgpdx.coordinator.async_create_clientsession"
+    ) as mock_session_factory:
+        mock_session = MagicMock()
+        mock_session_factory.return_value = mock_session
+
+        def make_response(html):
+            mock_response = MagicMock()
+            mock_response.raise_for_status = MagicMock()
+            mock_response.status = 200
+            mock_response.headers = {}
+
+            async def mock_read():
+                return html.encode()
+
+            mock_response.read = mock_read
+
+            class MockContextManager:
+                async def __aenter__(self):
+                    return mock_response
+
+                async def __aexit__(self, *args):
+                    pass
+
+            return MockContextManager()
+
+        mock_session.get.side_effect = [make_response(page) for page in pages]
+
+        first = await coordinator._async_update_data()
+
+        with patch("custom_components.ctgpdx.coordinator.BeautifulSoup") as mock_soup:
+            second = await coordinator._async_update_data()
+            mock_soup.assert_not_called()
+
+        assert second == first
+        assert coordinator.fingerprint_hits == 1
+        assert coordinator.fingerprint_misses == 1
+        assert coordinator.fingerprint_hit_ratio == 0.5
+
+
+@pytest.mark.asyncio
+async def test_coordinator_streaming_stops_early(mock_hass, sample_html):
+    """Test that streaming closes the connection once all fields are found."""
+    coordinator = CtgpdxUpdateCoordinator(mock_hass, streaming=True)
+
+    changelog = "".join(
+        f"<h3>v1.0.{i} - January 1st, 2024</h3><p>{'Fixed things. ' * 50}</p>"
+        for i in range(200)
+    )
+    page = sample_html.replace("</body>", f"{changelog}</body>").encode()
+    chunk_size = 1024
+    chunks = [page[i : i + chunk_size] for i in range(0, len(page), chunk_size)]
+    consumed = []
+
+    with patch(
+        "custom_components.ctgpdx.coordinator.async_create_clientsession"
+    ) as mock_session_factory:
+        mock_session = MagicMock()
+        mock_session_factory.return_value = mock_session
+
+        mock_response = MagicMock()
+        mock_response.raise_for_status = MagicMock()
+        mock_response.status = 200
+        mock_response.headers = {}
+
+        async def mock_iter_chunked(size):
+            for chunk in chunks:
+                consumed.append(chunk)
+                yield chunk
+
+        mock_response.content.iter_chunked = mock_iter_chunked
+
+        class MockContextManager:
+            async def __aenter__(self):
+                return mock_response
+
+            async def __aexit__(self, *args):
+                pass
+
+        mock_session.get.return_value = MockContextManager()
+
+        data = await coordinator._async_update_data()
+
+        assert data.version == "1.1.1"
+        assert data.download_size == 3_860_000_000
+        assert data.unpacked_size == 4_520_000_000
+        assert data.release_date == datetime(2025, 3, 23, tzinfo=timezone.utc)
+        mock_response.close.assert_called_once()
+        assert len(consumed) < len(chunks) / 10
+
+
+def test_parser_backends_agree(sample_html):
+    """Test that the stdlib tokenizer yields the same text as BeautifulSoup."""
+    from custom_components.ctgpdx.coordinator import PARSER_BACKENDS
+
+    page = sample_html.replace(
+        "<body>", "<body><script>var s = 'Version: 9.9.9';</script><style>p{}</style>"
+    )
+    texts = {name: backend.get_text(page) for name, backend in PARSER_BACKENDS.items()}
+
+    assert texts["html_parser"] == texts["beautifulsoup"]
+    assert "9.9.9" not in texts["html_parser"]
+
+
+def test_parser_backend_fallback():
+    """Test that BeautifulSoup is used when the default backend finds nothing."""
+    from custom_components.ctgpdx.coordinator import PARSER_BACKENDS, parse_html
+
+    with patch(
+        "custom_components.ctgpdx.coordinator.HTMLParserBackend.get_text",
+        side_effect=ValueError("broken markup"),
+    ):
+        data = parse_html("<p>Version: 1.1.1</p>", PARSER_BACKENDS["html_parser"])
+
+    assert data == {"version": "1.1.1"}
+
+
+@pytest.mark.asyncio
+async def test_coordinator_does_not_block_event_loop(mock_hass, sample_html):
+    """Test that parsing a large page leaves the event loop responsive."""
+    import asyncio
+    import threading
+    import time
+
+    coordinator = CtgpdxUpdateCoordinator(mock_hass)
+    changelog = "".join(
+        f"<h3>v1.0.{i} - January 1st, 2024</h3><p>{'<b>Fixed</b> things. ' * 50}</p>"
+        for i in range(1000)
+    )
+    page = sample_html.replace("</body>", f"{changelog}</body>").encode()
+    parsed_in = []
+
+    def record_thread(*args):
+        parsed_in.append(threading.get_ident())
+        return process_page(*args)
+
+    with (
+        patch(
+            "custom_components.ctgpdx.coordinator.async_create_clientsession"
+        ) as mock_session_factory,
+        patch(
+            "custom_components.ctgpdx.coordinator.process_page",
+            side_effect=record_thread,
+        ),
+    ):
+        mock_session = MagicMock()
+        mock_session_factory.return_value = mock_session
+        mock_response = MagicMock()
+        mock_response.raise_for_status = MagicMock()
+        mock_response.status = 200
+        mock_response.headers = {}
+
+        async def mock_read():
+            return page
+
+        mock_response.read = mock_read
+
+        class MockContextManager:
+            async def __aenter__(self):
+                return mock_response
+
+            async def __aexit__(self, *args):
+                pass
+
+        mock_session.get.return_value = MockContextManager()
+
+        max_gap = 0.0
+        done = False
+
+        async def heartbeat():
+            nonlocal max_gap
+            last = time.perf_counter()
+            while not done:
+                await asyncio.sleep(0.005)
+                now = time.perf_counter()
+                max_gap = max(max_gap, now - last)
+                last = now
+
+        monitor = asyncio.create_task(heartbeat())
+        start = time.perf_counter()
+        data = await coordinator._async_update_data()
+        elapsed = time.perf_counter() - start
+        done = True
+        await monitor
+
+        assert data.version == "1.1.1"
+        # The page is parsed in the executor, not in the thread of the loop
+        assert parsed_in and threading.get_ident() not in parsed_in
+        # The loop kept running for most of the refresh, however long it took
+        assert max_gap < elapsed / 2
+
+
+@pytest.mark.asyncio
+async def test_coordinator_coalesces_concurrent_refreshes(mock_hass, sample_html):
+    """Test that concurrent refreshes share one request and one result."""
+    coordinator = CtgpdxUpdateCoordinator(mock_hass)
+
+    with patch(
+        "custom_components.ctgpdx.coordinator.async_create_clientsession"
+    ) as mock_session_factory:
+        mock_session = MagicMock()
+        mock_session_factory.return_value = mock_session
+        mock_response = MagicMock()
+        mock_response.raise_for_status = MagicMock()
+        mock_response.status = 200
+        mock_response.headers = {}
+
+        async def mock_read():
+            # Give the other refreshes time to arrive while this one is running
+            await asyncio.sleep(0.05)
+            return sample_html.encode()
+
+        mock_response.read = mock_read
+
+        class MockContextManager:
+            async def __aenter__(self):
+                return mock_response
+
+            async def __aexit__(self, *args):
+                pass
+
+        mock_session.get.side_effect = lambda *args, **kwargs: MockContextManager()
+
+        results = await asyncio.gather(
+            *(coordinator._async_update_data() for _ in range(5))
+        )
+        assert mock_session.get.call_count == 1
+        assert all(result is results[0] for result in results)
+
+        # A refresh right after the last request reuses its data
+        assert await coordinator._async_update_data() is results[0]
+        assert results[0].generation == 1
+        assert mock_session.get.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_coordinator_shutdown_cancels_tasks(mock_hass):
+    """Test that shutting down cancels the running poll and closes the session."""
+    coordinator = CtgpdxUpdateCoordinator(mock_hass)
+    mock_session = MagicMock()
+    mock_session.close = AsyncMock()
+    requested = asyncio.Event()
+
+    class MockContextManager:
+        async def __aenter__(self):
+            requested.set()
+            # The website never answers
+            await asyncio.Event().wait()
+
+        async def __aexit__(self, *args):
+            pass
+
+    mock_session.get.side_effect = lambda *args, **kwargs: MockContextManager()
+    with patch(
+        "custom_components.ctgpdx.coordinator.async_create_clientsession",
+        return_value=mock_session,
+    ):
+        refresh = asyncio.create_task(coordinator._async_update_data())
+        await requested.wait()
+        poll = coordinator._poll_task
+        await coordinator.async_shutdown()
+
+    assert poll.cancelled()
+    assert coordinator._poll_task is None
+    mock_session.close.assert_awaited_once()
+    with pytest.raises(asyncio.CancelledError):
+        await refresh
+
+
+@pytest.mark.asyncio
+async def test_coordinator_failure_not_hidden_by_cache(mock_hass, sample_html):
+    """Test that a refresh right after a failed poll does not reuse the cache."""
+    coordinator = CtgpdxUpdateCoordinator(mock_hass)
+
+    with patch(
+        "custom_components.ctgpdx.coordinator.async_create_clientsession"
+    ) as mock_session_factory:
+        mock_session = MagicMock()
+        mock_session_factory.return_value = mock_session
+        mock_response = MagicMock()
+        mock_response.raise_for_status = MagicMock()
+        mock_response.status = 200
+        mock_response.headers = {}
+
+        async def mock_read():
+            return sample_html.encode()
+
+        mock_response.read = mock_read
+
+        class MockContextManager:
+            async def __aenter__(self):
+                return mock_response
+
+            async def __aexit__(self, *args):
+                pass
+
+        mock_session.get.side_effect = lambda *args, **kwargs: MockContextManager()
+        await coordinator._async_update_data()
+
+        # Fail the next poll, which bypasses the minimum interval
+        coordinator._last_success = None
+        mock_session.get.side_effect = Exception("Connection error")
         with pytest.raises(UpdateFailed):
             await coordinator._async_update_data()
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
+        assert mock_session.get.call_count == 3
+        assert coordinator.metrics.last.outcome == "error"
+
+
+@pytest.mark.asyncio
+async def test_coordinator_release_notes(mock_hass, sample_html):
+    """Test that release notes stop at the entry and are cached."""
+    coordinator = CtgpdxUpdateCoordinator(mock_hass)
+
+    changelog = "".join(
+        f"<h3>v1.0.{i} - January 1st, 2024</h3><ul><li>Change {i}</li>"
+        f"<li>{'Fixed things. ' * 50}</li></ul>"
+        for i in range(200, 0, -1)
+    )
+    page = sample_html.replace(
+        "</h3>",
+        "</h3><ul><li>New tracks</li><li>Bug fixes</li>"
+        "<li>Fixed a <b>crash</b> on <a href='/tracks/42'>Rainbow Road</a>.</li>"
+        "<li>Faster <!-- retro --><i>loading</i><br>of menus</li></ul>"
+        f"{changelog}",
+    ).encode()
+    chunks = [page[i : i + 1024] for i in range(0, len(page), 1024)]
+    consumed = []
+
+    with patch(
+        "custom_components.ctgpdx.coordinator.async_create_clientsession"
+    ) as mock_session_factory:
+        mock_session = MagicMock()
+        mock_session_factory.return_value = mock_session
+
+        mock_response = MagicMock()
+        mock_response.raise_for_status = MagicMock()
+        mock_response.headers = {}
+
+        async def mock_iter_chunked(size):
+            for chunk in chunks:
+                consumed.append(chunk)
+                yield chunk
+
+        mock_response.content.iter_chunked = mock_iter_chunked
+
+        class MockContextManager:
+            async def __aenter__(self):
+                return mock_response
+
+            async def __aexit__(self, *args):
+                pass
+
+        mock_session.get.return_value = MockContextManager()
+
+        notes = await coordinator.async_get_release_notes("1.1.1")
+        assert notes == (
+            "### v1.1.1 - March 23rd, 2025\n\n- New tracks\n- Bug fixes\n"
+            "- Fixed a crash on Rainbow Road.\n- Faster loading\n- of menus"
+        )
+        mock_response.close.assert_called_once()
+        assert len(consumed) < len(chunks) / 10
+
+        assert await coordinator.async_get_release_notes("1.1.1") == notes
+        assert mock_session.get.call_count == 1
+
+
+def _page_session(page):
+    """Return a client session serving a page, whole or in chunks."""
+    mock_session = MagicMock()
+    mock_response = MagicMock()
+    mock_response.raise_for_status = MagicMock()
+    mock_response.status = 200
+    mock_response.headers = {}
+
+    async def mock_read():
+        return page
+
+    async def mock_iter_chunked(size):
+        yield page
+
+    mock_response.read = mock_read
+    mock_response.content.iter_chunked = mock_iter_chunked
+
+    class MockContextManager:
+        async def __aenter__(self):
+            return mock_response
+
+        async def __aexit__(self, *args):
+            pass
+
+    mock_session.get.side_effect = lambda *args, **kwargs: MockContextManager()
+    return mock_session
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("streaming", "parser_backend"),
+    [(False, "html_parser"), (False, "beautifulsoup"), (True, "html_parser")],
+)
+async def test_coordinator_release_links(
+    mock_hass, sample_html, streaming, parser_backend
+):
+    """Test that the poll collects the archive and its fallback mirrors."""
+    coordinator = CtgpdxUpdateCoordinator(
+        mock_hass, streaming=streaming, parser_backend=parser_backend
+    )
+    assert coordinator.download_url is None
+    page = sample_html.replace(
+        "<p>Version: 1.1.1</p>",
+        '<p>Version: 1.1.1</p><a href="/about">About</a>'
+        '<a href="/files/CTGP-DX%201.1.1.zip">Download</a>'
+        "<p>If the link above doesn't work, try this one instead "
+        '(<a href="https://drive.google.com/file/d/abc">Google Drive</a>)</p>'
+        '<a href="https://twitter.com/ctgpdx">Twitter</a>'
+        '<a href="/files/CTGP-DX%201.1.1.zip">Download again</a>',
+    ).encode()
+
+    with patch(
+        "custom_components.ctgpdx.coordinator.async_create_clientsession",
+        return_value=_page_session(page),
+    ):
+        await coordinator._async_update_data()
+
+    assert coordinator.download_url == (
+        "https://www.ctgpdx.com/files/CTGP-DX%201.1.1.zip"
+    )
+    assert coordinator.mirror_urls == [
+        "https://www.ctgpdx.com/files/CTGP-DX%201.1.1.zip",
+        "https://drive.google.com/file/d/abc",
+    ]
+    # The links are persisted with the data
+    restarted = CtgpdxUpdateCoordinator(mock_hass)
+    restarted._store = coordinator._store
+    await restarted.async_restore()
+    assert restarted.mirror_urls == coordinator.mirror_urls
+
+
+@pytest.mark.asyncio
+async def test_coordinator_release_tasks_wait_for_poll(
+    mock_hass, sample_html, no_fetch_interval
+):
+    """Test that the archive is only looked into after a successful poll."""
+    coordinator = CtgpdxUpdateCoordinator(mock_hass)
+    # Persisted before the links were kept
+    await coordinator._store.async_save(
+        {"etag": '"v1"', "fingerprint": {"raw": "x"}, "data": {"version": "1.1.1"}}
+    )
+    await coordinator.async_restore()
+    mock_hass.async_create_background_task.assert_not_called()
+
+    mock_session = _page_session(sample_html.encode())
+    with patch(
+        "custom_components.ctgpdx.coordinator.async_create_clientsession",
+        return_value=mock_session,
+    ):
+        await coordinator._async_update_data()
+
+    # The page is parsed again to collect the links
+    assert "If-None-Match" not in mock_session.get.call_args.kwargs["headers"]
+    assert coordinator._cache["links"] == []
+    assert [
+        call.args[1] for call in mock_hass.async_create_background_task.call_args_list
+    ] == ["ctgpdx_zip_index", "ctgpdx_probe_mirrors"]
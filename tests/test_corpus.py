@@ -0,0 +1,41 @@
+"""Tests extracting the release fields from the page corpus."""
+
+import sys
+import os
+
+# Fail-safe path injection
+tests_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "tests"))
+if tests_dir not in sys.path:
+    sys.path.insert(0, tests_dir)
+
+from custom_components.ctgpdx.coordinator import (  # noqa: E402
+    FALLBACK_PARSER_BACKEND,
+    PARSER_BACKENDS,
+    _finish_stream,
+    _PageStream,
+    process_page,
+)
+
+
+def test_corpus_pages(corpus):
+    """Test that every backend and streaming extract the expected fields."""
+    _, pages = corpus
+    assert {"long_changelog", "dom_10x", "dom_100x", "messy_whitespace"} <= set(pages)
+    assert len(pages["dom_100x"][0]) > 90 * len(pages["download_page"][0])
+
+    for name, (body, expected) in pages.items():
+        for backend in PARSER_BACKENDS.values():
+            # The large variants are left to the benchmarks for the slow fallback
+            if backend is FALLBACK_PARSER_BACKEND and len(body) > 100_000:
+                continue
+            _, data = process_page(body, None, backend)
+            assert data == expected, (name, backend.name)
+
+        # Tiny chunks end within words and tags
+        for chunk_size in (16 * 1024, 7) if len(body) < 100_000 else (16 * 1024,):
+            page = _PageStream(None)
+            for start in range(0, len(body), chunk_size):
+                if page.feed(body[start : start + chunk_size]):
+                    break
+            _, data = _finish_stream(page)
+            assert data == expected, (name, "streaming", chunk_size)
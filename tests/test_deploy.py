@@ -0,0 +1,148 @@
+"""Tests for deploying the CTGP-DX release archive."""
+
+import sys
+import os
+
+# Fail-safe path injection
+tests_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "tests"))
+if tests_dir not in sys.path:
+    sys.path.insert(0, tests_dir)
+
+import json  # noqa: E402
+import zipfile  # noqa: E402
+import pytest  # noqa: E402
+from unittest.mock import patch  # noqa: E402
+from custom_components.ctgpdx.deploy import (  # noqa: E402
+    MANIFEST_NAME,
+    DeployError,
+    deploy_archive,
+)
+
+RELEASE_1 = {
+    "romfs/Course/track1.szs": b"track one" * 1000,
+    "romfs/Course/track2.szs": b"track two" * 1000,
+    "romfs/Old/legacy.bfres": b"legacy",
+    "exefs/main.npdm": b"main",
+}
+RELEASE_2 = {
+    "romfs/Course/track1.szs": b"track one" * 1000,
+    "romfs/Course/track2.szs": b"track two, fixed" * 1000,
+    "romfs/Course/track3.szs": b"track three",
+    "exefs/main.npdm": b"main",
+}
+
+
+def _archive(path, files):
+    """Write a ZIP archive with the given files."""
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return path
+
+
+def _tree(root):
+    """Return the deployed files and their content."""
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in root.rglob("*")
+        if path.is_file() and path.name != MANIFEST_NAME
+    }
+
+
+def test_deploy_extracts_only_changes(tmp_path):
+    """Test that an update extracts changed files and removes old ones."""
+    target = tmp_path / "sdcard"
+
+    result = deploy_archive(_archive(tmp_path / "1.zip", RELEASE_1), target)
+    assert (result.added, result.changed, result.removed) == (4, 0, 0)
+    assert _tree(target) == RELEASE_1
+    unchanged = target / "romfs/Course/track1.szs"
+    os.utime(unchanged, (0, 0))
+
+    result = deploy_archive(_archive(tmp_path / "2.zip", RELEASE_2), target)
+    assert (result.added, result.changed, result.removed) == (1, 1, 1)
+    assert result.unchanged == 2
+    assert result.bytes_written == len(RELEASE_2["romfs/Course/track2.szs"]) + 11
+    assert _tree(target) == RELEASE_2
+    # Untouched files keep their timestamps, empty directories are removed
+    assert unchanged.stat().st_mtime == 0
+    assert not (target / "romfs/Old").exists()
+
+    # The same version again is a no-op
+    result = deploy_archive(tmp_path / "2.zip", target)
+    assert result.unchanged == 4
+    assert result.bytes_written == 0
+
+
+def test_deploy_repairs_modified_files(tmp_path):
+    """Test that files changed on the card are extracted again."""
+    target = tmp_path / "sdcard"
+    archive = _archive(tmp_path / "1.zip", RELEASE_1)
+    deploy_archive(archive, target)
+
+    (target / "exefs/main.npdm").write_bytes(b"corrupted")
+    (target / "romfs/Course/track2.szs").unlink()
+
+    result = deploy_archive(archive, target)
+    assert result.changed == 2
+    assert _tree(target) == RELEASE_1
+
+
+def test_deploy_continues_after_failure(tmp_path):
+    """Test that the manifest lists the files written before a failure."""
+    target = tmp_path / "sdcard"
+    archive = _archive(tmp_path / "1.zip", RELEASE_1)
+
+    original_open = zipfile.ZipFile.open
+
+    def failing_open(self, name, *args, **kwargs):
+        if name == "exefs/main.npdm":
+            raise OSError("card removed")
+        return original_open(self, name, *args, **kwargs)
+
+    with patch.object(zipfile.ZipFile, "open", failing_open):
+        with pytest.raises(DeployError):
+            deploy_archive(archive, target, workers=1)
+
+    manifest = json.loads((target / MANIFEST_NAME).read_text())["files"]
+    assert "exefs/main.npdm" not in manifest
+    assert not list(target.rglob("*.ctgpdx-tmp"))
+
+    result = deploy_archive(archive, target)
+    assert result.added == 1
+    assert result.unchanged == len(manifest)
+    assert _tree(target) == RELEASE_1
+
+
+@pytest.mark.parametrize(
+    "manifest",
+    [
+        "[]",
+        '{"version": 1}',
+        '{"version": 1, "files": []}',
+        '{"version": 1, "files": {"exefs/main.npdm": 4}}',
+        '{"version": 1, "files": {"exefs/main.npdm": ["crc", 4]}}',
+    ],
+)
+def test_deploy_ignores_malformed_manifest(tmp_path, manifest):
+    """Test that a manifest of the wrong structure leads to a full deploy."""
+    target = tmp_path / "sdcard"
+    archive = _archive(tmp_path / "1.zip", RELEASE_1)
+    target.mkdir()
+    (target / MANIFEST_NAME).write_text(manifest)
+
+    result = deploy_archive(archive, target)
+
+    assert result.added == len(RELEASE_1)
+    assert _tree(target) == RELEASE_1
+    assert json.loads((target / MANIFEST_NAME).read_text())["version"] == 1
+
+
+def test_deploy_rejects_paths_outside_target(tmp_path):
+    """Test that archive members cannot escape the target directory."""
+    target = tmp_path / "sdcard"
+    archive = _archive(tmp_path / "evil.zip", {"../outside.txt": b"evil"})
+
+    with pytest.raises(DeployError):
+        deploy_archive(archive, target)
+    assert not (tmp_path / "outside.txt").exists()
@@ -0,0 +1,213 @@
+"""Tests for downloading the CTGP-DX release archive."""
+
+import sys
+import os
+
+# Fail-safe path injection
+tests_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "tests"))
+if tests_dir not in sys.path:
+    sys.path.insert(0, tests_dir)
+
+import hashlib  # noqa: E402
+from contextlib import asynccontextmanager  # noqa: E402
+import time  # noqa: E402
+import pytest  # noqa: E402
+from unittest.mock import MagicMock, patch  # noqa: E402
+from aiohttp import ClientSession, web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+from custom_components.ctgpdx.download import (  # noqa: E402
+    DownloadState,
+    ReleaseDownloader,
+)
+
+PAYLOAD = bytes(range(256)) * 4096  # 1 MiB
+
+
+class ArchiveServer:
+    """Local HTTP server serving the archive with Range support."""
+
+    def __init__(self, fail_after=None, payload=PAYLOAD, etag='"v1"'):
+        """Initialize the server, optionally dropping the first transfer."""
+        self.fail_after = fail_after
+        self.payload = payload
+        self.etag = etag
+        self.content_range = None
+        self.ranges = []
+        app = web.Application()
+        app.router.add_get("/files/{name}", self._handle)
+        self.server = TestServer(app)
+
+    async def __aenter__(self):
+        await self.server.start_server()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.server.close()
+
+    @property
+    def url(self):
+        return str(self.server.make_url("/files/CTGP-DX%201.1.1.zip"))
+
+    async def _handle(self, request):
+        if request.match_info["name"] != "CTGP-DX 1.1.1.zip":
+            raise web.HTTPNotFound
+        payload = self.payload
+        start = 0
+        if value := request.headers.get("Range"):
+            start = int(value.removeprefix("bytes=").rstrip("-"))
+        self.ranges.append(start)
+        if request.headers.get("If-Range", self.etag) != self.etag:
+            # The archive changed, send all of it
+            start = 0
+        if start >= len(payload):
+            return web.Response(
+                status=416, headers={"Content-Range": f"bytes */{len(payload)}"}
+            )
+
+        response = web.StreamResponse(status=206 if start else 200)
+        response.content_length = len(payload) - start
+        response.headers["ETag"] = self.etag
+        if start:
+            response.headers["Content-Range"] = (
+                self.content_range or f"bytes {start}-{len(payload) - 1}/{len(payload)}"
+            )
+        await response.prepare(request)
+        body = payload[start:]
+        if self.fail_after is not None:
+            # Drop the connection in the middle of the first transfer
+            await response.write(body[: self.fail_after])
+            self.fail_after = None
+            request.transport.close()
+            return response
+        await response.write(body)
+        await response.write_eof()
+        return response
+
+
+@asynccontextmanager
+async def client_session():
+    """Provide a real client session to the downloader."""
+    async with ClientSession() as session:
+        with patch(
+            "custom_components.ctgpdx.download.async_get_clientsession",
+            return_value=session,
+        ):
+            yield session
+
+
+@pytest.mark.asyncio
+async def test_download_streams_to_disk(mock_hass, tmp_path):
+    """Test that the archive ends up complete with its hash reported."""
+    downloader = ReleaseDownloader(mock_hass, str(tmp_path))
+    listener = MagicMock()
+    downloader.async_add_listener(listener)
+
+    async with client_session(), ArchiveServer() as server:
+        path = await downloader.async_download(server.url)
+
+    assert path == tmp_path / "CTGP-DX 1.1.1.zip"
+    assert path.read_bytes() == PAYLOAD
+    assert not (tmp_path / "CTGP-DX 1.1.1.zip.part").exists()
+    progress = downloader.progress
+    assert progress.state is DownloadState.COMPLETE
+    assert progress.percentage == 100
+    assert progress.sha256 == hashlib.sha256(PAYLOAD).hexdigest()
+    assert listener.called
+
+
+@pytest.mark.asyncio
+async def test_download_resumes_interrupted_transfer(mock_hass, tmp_path):
+    """Test that a dropped connection is continued with a Range request."""
+    downloader = ReleaseDownloader(mock_hass, str(tmp_path))
+
+    async with client_session(), ArchiveServer(fail_after=300_000) as server:
+        with patch("custom_components.ctgpdx.download.retry_delay", return_value=0):
+            path = await downloader.async_download(server.url)
+
+    assert server.ranges[0] == 0
+    assert 0 < server.ranges[1] <= 300_000
+    assert path.read_bytes() == PAYLOAD
+    assert downloader.progress.sha256 == hashlib.sha256(PAYLOAD).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_download_restarts_replaced_archive(mock_hass, tmp_path):
+    """Test that a part of a replaced archive is not continued."""
+    downloader = ReleaseDownloader(mock_hass, str(tmp_path))
+    replaced = PAYLOAD[::-1]
+
+    async with client_session(), ArchiveServer(fail_after=300_000) as server:
+        with patch("custom_components.ctgpdx.download.retry_delay", return_value=None):
+            assert await downloader.async_download(server.url) is None
+        assert (tmp_path / "CTGP-DX 1.1.1.zip.part.validator").read_text() == '"v1"'
+
+        server.payload = replaced
+        server.etag = '"v2"'
+        path = await downloader.async_download(server.url)
+
+    assert 0 < server.ranges[1] <= 300_000
+    assert path.read_bytes() == replaced
+    assert downloader.progress.sha256 == hashlib.sha256(replaced).hexdigest()
+    assert not (tmp_path / "CTGP-DX 1.1.1.zip.part.validator").exists()
+
+
+@pytest.mark.asyncio
+async def test_download_partial_response_without_range(mock_hass, tmp_path):
+    """Test that a partial response needs a Content-Range to be appended."""
+    (tmp_path / "CTGP-DX 1.1.1.zip.part").write_bytes(PAYLOAD[:400_000])
+    downloader = ReleaseDownloader(mock_hass, str(tmp_path))
+
+    async with client_session(), ArchiveServer() as server:
+        server.content_range = "bytes garbage"
+        with patch("custom_components.ctgpdx.download.retry_delay", return_value=None):
+            assert await downloader.async_download(server.url) is None
+
+    assert "without a valid Content-Range" in downloader.progress.error
+    assert (tmp_path / "CTGP-DX 1.1.1.zip.part").stat().st_size == 400_000
+
+
+@pytest.mark.asyncio
+async def test_download_continues_part_file(mock_hass, tmp_path):
+    """Test that a part file left behind is hashed and continued."""
+    (tmp_path / "CTGP-DX 1.1.1.zip.part").write_bytes(PAYLOAD[:400_000])
+    downloader = ReleaseDownloader(mock_hass, str(tmp_path))
+
+    async with client_session(), ArchiveServer() as server:
+        path = await downloader.async_download(server.url)
+        assert server.ranges == [400_000]
+
+        # A complete part file only needs to be renamed
+        path.rename(path.with_name(f"{path.name}.part"))
+        assert await downloader.async_download(server.url) == path
+        assert server.ranges[-1] == len(PAYLOAD)
+
+    assert path.read_bytes() == PAYLOAD
+    assert downloader.progress.sha256 == hashlib.sha256(PAYLOAD).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_download_rate_limit(mock_hass, tmp_path):
+    """Test that the transfer keeps below the rate limit."""
+    downloader = ReleaseDownloader(mock_hass, str(tmp_path), rate_limit=2_000_000)
+
+    async with client_session(), ArchiveServer() as server:
+        started = time.monotonic()
+        await downloader.async_download(server.url)
+        elapsed = time.monotonic() - started
+
+    # 1 MiB at 2 MB/s
+    assert elapsed >= 0.45
+    assert downloader.progress.state is DownloadState.COMPLETE
+
+
+@pytest.mark.asyncio
+async def test_download_failure(mock_hass, tmp_path):
+    """Test that a missing archive is reported as failed."""
+    downloader = ReleaseDownloader(mock_hass, str(tmp_path))
+
+    async with client_session(), ArchiveServer() as server:
+        assert await downloader.async_download(f"{server.url}.missing") is None
+
+    assert downloader.progress.state is DownloadState.FAILED
+    assert "404" in downloader.progress.error
+    assert not downloader.running
@@ -8,10 +8,26 @@ tests_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "tests
 if tests_dir not in sys.path:
     sys.path.insert(0, tests_dir)
 
+import asyncio  # noqa: E402
+import zipfile  # noqa: E402
 import pytest  # noqa: E402
 from unittest.mock import AsyncMock, patch, MagicMock  # noqa: E402
-from custom_components.ctgpdx import async_setup_entry  # noqa: E402
+from custom_components.ctgpdx import (  # noqa: E402
+    async_setup_entry,
+    async_unload_entry,
+)
+from custom_components.ctgpdx.download import DownloadState  # noqa: E402
 from homeassistant.config_entries import ConfigEntry  # noqa: E402
+from homeassistant.core import ServiceCall  # noqa: E402
+from homeassistant.exceptions import HomeAssistantError  # noqa: E402
+
+
+def _service_handler(hass, name):
+    """Return the handler of a registered service."""
+    for call in hass.services.async_register.call_args_list:
+        if call.args[:2] == ("ctgpdx", name):
+            return call.args[2]
+    raise AssertionError(f"Service {name} is not registered")
 
 
 @pytest.mark.asyncio
@@ -19,6 +35,7 @@ async def test_async_setup_entry(mock_hass):
     """Test that async_setup_entry completes without errors."""
     entry = MagicMock(spec=ConfigEntry)
     entry.entry_id = "test_entry"
+    entry.options = {}
 
     # Mock the coordinator and its methods
     mock_hass.config_entries.async_forward_entry_setups = AsyncMock()
@@ -27,6 +44,7 @@ async def test_async_setup_entry(mock_hass):
         "custom_components.ctgpdx.CtgpdxUpdateCoordinator"
     ) as mock_coordinator_class:
         mock_coordinator = mock_coordinator_class.return_value
+        mock_coordinator.async_restore = AsyncMock(return_value=None)
         mock_coordinator.async_config_entry_first_refresh = AsyncMock()
 
         # Call the setup function
@@ -40,3 +58,168 @@ async def test_async_setup_entry(mock_hass):
 
         # Verify platforms are forwarded
         mock_hass.config_entries.async_forward_entry_setups.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_async_setup_entry_restores_data(mock_hass):
+    """Test that setup publishes persisted data without waiting for a fetch."""
+    entry = MagicMock(spec=ConfigEntry)
+    entry.entry_id = "test_entry"
+    entry.options = {}
+
+    mock_hass.config_entries.async_forward_entry_setups = AsyncMock()
+
+    with patch(
+        "custom_components.ctgpdx.CtgpdxUpdateCoordinator"
+    ) as mock_coordinator_class:
+        mock_coordinator = mock_coordinator_class.return_value
+        mock_coordinator.async_restore = AsyncMock(return_value=3600.0)
+        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
+        mock_coordinator.async_refresh = AsyncMock()
+
+        result = await async_setup_entry(mock_hass, entry)
+
+        assert result is True
+        # The timer of the coordinator refreshes once the schedule is due
+        mock_coordinator.async_config_entry_first_refresh.assert_not_called()
+        mock_coordinator.async_refresh.assert_not_called()
+        mock_hass.config_entries.async_forward_entry_setups.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_async_unload_entry_shuts_down_coordinator(mock_hass):
+    """Test that unloading stops the background work of the coordinator."""
+    entry = MagicMock(spec=ConfigEntry)
+    entry.entry_id = "test_entry"
+    entry.options = {}
+    mock_hass.data = {}
+    mock_hass.config_entries.async_forward_entry_setups = AsyncMock()
+    mock_hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
+
+    with patch(
+        "custom_components.ctgpdx.CtgpdxUpdateCoordinator"
+    ) as mock_coordinator_class:
+        mock_coordinator = mock_coordinator_class.return_value
+        mock_coordinator.async_restore = AsyncMock(return_value=3600.0)
+        mock_coordinator.async_shutdown = AsyncMock()
+
+        await async_setup_entry(mock_hass, entry)
+        assert await async_unload_entry(mock_hass, entry) is True
+
+    mock_coordinator.async_shutdown.assert_awaited_once()
+    assert mock_hass.data["ctgpdx"] == {}
+
+
+@pytest.mark.asyncio
+async def test_async_setup_entry_download_service(mock_hass, tmp_path):
+    """Test that the download service starts a download in the background."""
+    entry = ConfigEntry()
+    entry.options = {"download_dir": str(tmp_path), "download_rate_limit": 500}
+    mock_hass.config_entries.async_forward_entry_setups = AsyncMock()
+
+    with patch(
+        "custom_components.ctgpdx.CtgpdxUpdateCoordinator"
+    ) as mock_coordinator_class:
+        mock_coordinator = mock_coordinator_class.return_value
+        mock_coordinator.async_restore = AsyncMock(return_value=None)
+        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
+        mock_coordinator.download_url = "https://www.ctgpdx.com/files/CTGP-DX.zip"
+
+        await async_setup_entry(mock_hass, entry)
+
+    downloader = mock_coordinator.downloader
+    assert downloader.directory == tmp_path
+    assert downloader.rate_limit == 500_000
+
+    domain, service = "ctgpdx", "download_release"
+    handler = _service_handler(mock_hass, service)
+
+    with patch.object(downloader, "async_download", MagicMock()) as mock_download:
+        mock_hass.config.is_allowed_path.return_value = False
+        with pytest.raises(HomeAssistantError):
+            await handler(ServiceCall(domain, service))
+        mock_download.assert_not_called()
+
+        mock_hass.config.is_allowed_path.return_value = True
+        await handler(ServiceCall(domain, service))
+        mock_download.assert_called_once_with(
+            "https://www.ctgpdx.com/files/CTGP-DX.zip"
+        )
+        mock_hass.async_create_background_task.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_async_setup_entry_download_service_runs_once(mock_hass, tmp_path):
+    """Test that calls close together start only one download."""
+    entry = ConfigEntry()
+    entry.options = {"download_dir": str(tmp_path)}
+    mock_hass.config_entries.async_forward_entry_setups = AsyncMock()
+    mock_hass.config.is_allowed_path.return_value = True
+
+    with patch(
+        "custom_components.ctgpdx.CtgpdxUpdateCoordinator"
+    ) as mock_coordinator_class:
+        mock_coordinator = mock_coordinator_class.return_value
+        mock_coordinator.async_restore = AsyncMock(return_value=None)
+        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
+        mock_coordinator.download_url = "https://www.ctgpdx.com/files/CTGP-DX.zip"
+
+        await async_setup_entry(mock_hass, entry)
+
+    downloader = mock_coordinator.downloader
+    handler = _service_handler(mock_hass, "download_release")
+
+    def start_download(url):
+        # Like the eagerly started task, running before the first await
+        downloader.progress.state = DownloadState.DOWNLOADING
+        return MagicMock()
+
+    with patch.object(
+        downloader, "async_download", MagicMock(side_effect=start_download)
+    ) as mock_download:
+        calls = [
+            asyncio.create_task(handler(ServiceCall("ctgpdx", "download_release")))
+            for _ in range(2)
+        ]
+        results = await asyncio.gather(*calls, return_exceptions=True)
+
+    assert results.count(None) == 1
+    assert isinstance(results[1], HomeAssistantError)
+    mock_download.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_async_setup_entry_deploy_service(mock_hass, tmp_path):
+    """Test that the deploy service extracts an archive and reports the result."""
+    archive = tmp_path / "release.zip"
+    with zipfile.ZipFile(archive, "w") as release:
+        release.writestr("romfs/track.szs", b"track")
+    entry = ConfigEntry()
+    entry.options = {"download_dir": str(tmp_path)}
+    mock_hass.config_entries.async_forward_entry_setups = AsyncMock()
+
+    with patch(
+        "custom_components.ctgpdx.CtgpdxUpdateCoordinator"
+    ) as mock_coordinator_class:
+        mock_coordinator = mock_coordinator_class.return_value
+        mock_coordinator.async_restore = AsyncMock(return_value=None)
+        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
+
+        await async_setup_entry(mock_hass, entry)
+
+    handler = _service_handler(mock_hass, "deploy_release")
+    target = tmp_path / "sdcard"
+
+    # Nothing has been downloaded yet
+    with pytest.raises(HomeAssistantError):
+        await handler(ServiceCall("ctgpdx", "deploy_release", {"target": str(target)}))
+
+    response = await handler(
+        ServiceCall(
+            "ctgpdx",
+            "deploy_release",
+            {"target": str(target), "archive": str(archive)},
+        )
+    )
+    assert response["added"] == 1
+    assert (target / "romfs" / "track.szs").read_bytes() == b"track"
@@ -0,0 +1,116 @@
+"""Tests of the memory processing pages of growing size allocates."""
+
+import sys
+import os
+
+# Fail-safe path injection
+tests_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "tests"))
+if tests_dir not in sys.path:
+    sys.path.insert(0, tests_dir)
+
+import tracemalloc  # noqa: E402
+import pytest  # noqa: E402
+from custom_components.ctgpdx.const import (  # noqa: E402
+    DEFAULT_PARSER_BACKEND,
+    STREAM_CHUNK_SIZE,
+)
+from custom_components.ctgpdx.coordinator import (  # noqa: E402
+    FALLBACK_PARSER_BACKEND,
+    PARSER_BACKENDS,
+    _finish_stream,
+    _PageStream,
+    process_page,
+)
+from custom_components.ctgpdx.metrics import BufferMeter  # noqa: E402
+
+KB = 1024
+MB = 1024 * 1024
+# Allocated at most besides the downloaded page, in multiples of its size.
+# Decoding a page that is not ASCII briefly takes two copies of it.
+PROCESS_PAGE_BUDGET = 2.5
+BEAUTIFULSOUP_BUDGET = 50
+# Compiled patterns, parser state and the like
+FIXED_ALLOWANCE = 1 * MB
+# Streaming only keeps a chunk and a short tail, whatever the size of the page
+STREAMING_BUDGET = 1 * MB
+
+# Tracing slows processing down about fivefold. 5 MB is part of every run, as
+# memory growing with the page only shows on large pages. 20 MB takes minutes
+# and runs with -m benchmark.
+SIZES = [
+    pytest.param(100 * KB, id="100KB"),
+    pytest.param(1 * MB, id="1MB"),
+    pytest.param(5 * MB, id="5MB"),
+    pytest.param(20 * MB, id="20MB", marks=pytest.mark.benchmark),
+]
+
+
+def _peak(func, *args):
+    """Call a function and return its result and the peak memory it allocated."""
+    tracemalloc.start()
+    try:
+        result = func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+def _stream(body):
+    """Process a page like a refresh with streaming enabled."""
+    page = _PageStream(None)
+    for start in range(0, len(body), STREAM_CHUNK_SIZE):
+        if page.feed(body[start : start + STREAM_CHUNK_SIZE]):
+            break
+    return _finish_stream(page)[1], page.buffers, page.links
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_process_page_memory_budget(page_of_size, size):
+    """Test that a regular refresh holds about one copy of the page."""
+    body, expected = page_of_size(size)
+    buffers = BufferMeter()
+    links = []
+
+    (_, data), peak = _peak(
+        process_page,
+        body,
+        None,
+        PARSER_BACKENDS[DEFAULT_PARSER_BACKEND],
+        None,
+        None,
+        buffers,
+        links,
+    )
+
+    assert data == expected
+    assert len(links) == 2
+    assert peak <= PROCESS_PAGE_BUDGET * len(body) + FIXED_ALLOWANCE
+    # The meter only counts the downloaded page, its decoded text and the
+    # visible text by their object size, tracemalloc is the measured peak
+    assert 2 * len(body) < buffers.peak <= peak + len(body)
+    assert buffers.held == 0
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_streaming_memory_budget(page_of_size, size):
+    """Test that streaming needs the same memory for every size of page."""
+    body, expected = page_of_size(size)
+
+    (data, buffers, links), peak = _peak(_stream, body)
+
+    assert data == expected
+    assert len(links) == 2
+    assert peak <= STREAMING_BUDGET
+    # A chunk and its text, which takes up to four bytes per character
+    assert STREAM_CHUNK_SIZE < buffers.peak <= 5 * STREAM_CHUNK_SIZE + KB
+
+
+def test_beautifulsoup_memory_budget(page_of_size):
+    """Test the memory of the fallback, which builds a tree of the page."""
+    body, expected = page_of_size(100 * KB)
+
+    (_, data), peak = _peak(process_page, body, None, FALLBACK_PARSER_BACKEND)
+
+    assert data == expected
+    assert peak <= BEAUTIFULSOUP_BUDGET * len(body) + FIXED_ALLOWANCE
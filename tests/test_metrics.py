@@ -0,0 +1,214 @@
+"""Tests for the CTGP-DX refresh metrics, diagnostics and system health."""
+
+import sys
+import os
+
+# Fail-safe path injection
+tests_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "tests"))
+if tests_dir not in sys.path:
+    sys.path.insert(0, tests_dir)
+
+import json  # noqa: E402
+import pytest  # noqa: E402
+from datetime import datetime, timedelta, timezone  # noqa: E402
+from unittest.mock import MagicMock, patch  # noqa: E402
+from aiohttp import ClientSession, web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+from custom_components.ctgpdx.const import DOMAIN  # noqa: E402
+from custom_components.ctgpdx.coordinator import CtgpdxUpdateCoordinator  # noqa: E402
+from custom_components.ctgpdx.diagnostics import (  # noqa: E402
+    async_get_config_entry_diagnostics,
+)
+from custom_components.ctgpdx.metrics import (  # noqa: E402
+    PHASE_CONNECT,
+    PHASE_DNS,
+    PHASES,
+    RefreshMetrics,
+    RefreshSample,
+)
+from custom_components.ctgpdx.system_health import (  # noqa: E402
+    async_register,
+    system_health_info,
+)
+from homeassistant.components.system_health import (  # noqa: E402
+    SystemHealthRegistration,
+)
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+from homeassistant.helpers.update_coordinator import UpdateFailed  # noqa: E402
+
+
+def _session(html):
+    """Return a client session serving a page."""
+    session = MagicMock()
+    response = MagicMock()
+    response.status = 200
+    response.headers = {}
+
+    async def read():
+        return html.encode()
+
+    async def iter_chunked(size):
+        body = html.encode()
+        for offset in range(0, len(body), 1024):
+            yield body[offset : offset + 1024]
+
+    response.read = read
+    response.content.iter_chunked = iter_chunked
+
+    class MockContextManager:
+        async def __aenter__(self):
+            return response
+
+        async def __aexit__(self, *args):
+            pass
+
+    session.get.return_value = MockContextManager()
+    return session
+
+
+def test_metrics_ring_buffer():
+    """Test that only the last samples are kept and summarized."""
+    metrics = RefreshMetrics(size=20)
+    started = datetime.now(timezone.utc)
+    for number in range(1, 31):
+        metrics.record(
+            RefreshSample(
+                started,
+                outcome="updated" if number % 10 else "error",
+                duration=number / 100,
+                bytes_received=number * 1000,
+                phases={"ttfb": number / 1000},
+                peak_buffer_bytes=number * 3000 if number % 10 else None,
+            )
+        )
+
+    assert len(metrics.samples) == 20
+    assert metrics.last.duration == 0.3
+    summary = metrics.summary()
+    assert summary["samples"] == 20
+    assert summary["outcomes"] == {"updated": 18, "error": 2}
+    assert summary["duration"] == {"p50": 0.2, "p95": 0.29}
+    assert summary["phases"]["ttfb"] == {"p50": 0.02, "p95": 0.029}
+    assert summary["phases"]["parse"] is None
+    assert summary["bytes_received"]["p95"] == 29_000
+    assert summary["peak_buffer_bytes"] == {"p50": 57_000, "p95": 87_000}
+    assert RefreshMetrics().summary()["duration"] is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("streaming", [False, True])
+async def test_coordinator_records_refresh(mock_hass, sample_html, streaming):
+    """Test that every phase of a refresh is timed."""
+    coordinator = CtgpdxUpdateCoordinator(mock_hass, streaming=streaming)
+
+    with patch(
+        "custom_components.ctgpdx.coordinator.async_create_clientsession",
+        return_value=_session(sample_html),
+    ):
+        await coordinator._async_update_data()
+
+    sample = coordinator.metrics.last
+    assert sample.outcome == "updated"
+    assert sample.attempts == 1
+    assert sample.bytes_received == len(sample_html.encode())
+    # At least the page and its decoded text
+    assert sample.peak_buffer_bytes > 2 * len(sample_html)
+    # The mocked session does not connect
+    assert set(sample.phases) == set(PHASES) - {PHASE_DNS, PHASE_CONNECT}
+    assert sum(sample.phases.values()) <= sample.duration
+
+
+@pytest.mark.asyncio
+async def test_coordinator_traces_connection(mock_hass, sample_html):
+    """Test that resolving the host and connecting are timed on their own."""
+    app = web.Application()
+
+    async def handle(request):
+        return web.Response(text=sample_html, content_type="text/html")
+
+    app.router.add_get("/download", handle)
+    coordinator = CtgpdxUpdateCoordinator(mock_hass)
+    async with TestServer(app, host="localhost") as server:
+        with (
+            patch(
+                "custom_components.ctgpdx.coordinator.URL",
+                str(server.make_url("/download")),
+            ),
+            patch(
+                "custom_components.ctgpdx.coordinator.async_create_clientsession",
+                side_effect=lambda hass, **kwargs: ClientSession(**kwargs),
+            ),
+            patch(
+                "custom_components.ctgpdx.coordinator.MIN_FETCH_INTERVAL",
+                timedelta(0),
+            ),
+        ):
+            await coordinator._async_update_data()
+            first = coordinator.metrics.last
+            await coordinator._async_update_data()
+            second = coordinator.metrics.last
+        await coordinator.async_shutdown()
+
+    assert set(first.phases) == set(PHASES)
+    assert first.phases[PHASE_CONNECT] > 0
+    assert sum(first.phases.values()) <= first.duration
+    # The second request reuses the connection
+    assert PHASE_DNS not in second.phases
+    assert PHASE_CONNECT not in second.phases
+    assert second.fetch_time == second.phases["ttfb"] + second.phases["transfer"]
+
+
+@pytest.mark.asyncio
+async def test_coordinator_records_failed_refresh(mock_hass):
+    """Test that a failed refresh is recorded with its error."""
+    coordinator = CtgpdxUpdateCoordinator(mock_hass)
+    session = MagicMock()
+    session.get.side_effect = Exception("Connection error")
+
+    with patch(
+        "custom_components.ctgpdx.coordinator.async_create_clientsession",
+        return_value=session,
+    ):
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
+
+    sample = coordinator.metrics.last
+    assert sample.outcome == "error"
+    assert "Connection error" in sample.error
+    assert coordinator.metrics.summary()["outcomes"] == {"error": 1}
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_and_system_health(mock_hass, sample_html):
+    """Test that the metrics are exposed to diagnostics and system health."""
+    coordinator = CtgpdxUpdateCoordinator(mock_hass)
+    entry = ConfigEntry()
+    entry.options = {"streaming": False}
+    mock_hass.data = {DOMAIN: {entry.entry_id: coordinator}}
+
+    with patch(
+        "custom_components.ctgpdx.coordinator.async_create_clientsession",
+        return_value=_session(sample_html),
+    ):
+        coordinator.async_set_updated_data(await coordinator._async_update_data())
+
+    diagnostics = await async_get_config_entry_diagnostics(mock_hass, entry)
+    assert diagnostics["data"]["version"] == "1.1.1"
+    assert diagnostics["breaker"]["state"] == "closed"
+    assert diagnostics["metrics"]["summary"]["outcomes"] == {"updated": 1}
+    assert diagnostics["metrics"]["samples"][0]["outcome"] == "updated"
+    assert diagnostics["metrics"]["peak_buffer_bytes"] > len(sample_html)
+    json.dumps(diagnostics, default=str)
+
+    registration = SystemHealthRegistration()
+    async_register(mock_hass, registration)
+    info = await registration.info_callback(mock_hass)
+    assert await info.pop("can_reach_server") == "ok"
+    assert info["last_refresh"] == "updated"
+    assert info["refresh_success_rate"] == "100 %"
+    assert info["refresh_duration_p50"].endswith(" ms")
+
+    mock_hass.data = {}
+    info = await system_health_info(mock_hass)
+    info.pop("can_reach_server").close()
+    assert info == {}
@@ -0,0 +1,147 @@
+"""Tests for probing the CTGP-DX download mirrors."""
+
+import sys
+import os
+
+# Fail-safe path injection
+tests_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "tests"))
+if tests_dir not in sys.path:
+    sys.path.insert(0, tests_dir)
+
+import asyncio  # noqa: E402
+import time  # noqa: E402
+import pytest  # noqa: E402
+from contextlib import asynccontextmanager  # noqa: E402
+from unittest.mock import AsyncMock, MagicMock, patch  # noqa: E402
+from aiohttp import ClientSession, web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+from custom_components.ctgpdx.coordinator import CtgpdxUpdateCoordinator  # noqa: E402
+from custom_components.ctgpdx.mirrors import (  # noqa: E402
+    MirrorProbe,
+    async_probe_mirrors,
+    fastest_mirror,
+)
+from custom_components.ctgpdx.models import CtgpdxData  # noqa: E402
+
+PAYLOAD = b"\x00" * (512 * 1024)
+
+
+@asynccontextmanager
+async def mirror_server():
+    """Serve mirrors of different speed locally."""
+    active = []
+    peak = []
+
+    async def handle(request):
+        active.append(request)
+        peak.append(len(active))
+        try:
+            kind = request.match_info["kind"]
+            if kind == "missing":
+                raise web.HTTPNotFound
+            if kind == "hanging":
+                await asyncio.sleep(10)
+            if kind == "page":
+                return web.Response(text="<html>Confirm the download</html>")
+            response = web.StreamResponse(status=206)
+            response.headers["Content-Range"] = (
+                f"bytes 0-{256 * 1024 - 1}/{len(PAYLOAD)}"
+            )
+            await response.prepare(request)
+            for offset in range(0, 256 * 1024, 64 * 1024):
+                if kind == "slow":
+                    await asyncio.sleep(0.05)
+                await response.write(PAYLOAD[offset : offset + 64 * 1024])
+            await response.write_eof()
+            return response
+        finally:
+            active.remove(request)
+
+    app = web.Application()
+    app.router.add_get("/{kind}/release.zip", handle)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        async with ClientSession() as session:
+            with patch(
+                "custom_components.ctgpdx.mirrors.async_get_clientsession",
+                return_value=session,
+            ):
+                yield (lambda kind: str(server.make_url(f"/{kind}/release.zip"))), peak
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_probe_mirrors(mock_hass):
+    """Test that mirrors are measured and the fastest one is picked."""
+    async with mirror_server() as (url, peak):
+        with patch("custom_components.ctgpdx.mirrors.MIRROR_PROBE_CONCURRENCY", 2):
+            probes = await async_probe_mirrors(
+                mock_hass, [url("slow"), url("fast"), url("missing"), url("page")]
+            )
+
+    slow, fast, missing, page = probes
+    assert fast.reachable and slow.reachable and page.reachable
+    assert fast.throughput > slow.throughput
+    assert "404" in missing.error
+    assert page.throughput is None
+    assert fastest_mirror(probes) is fast
+    assert max(peak) <= 2
+
+
+@pytest.mark.asyncio
+async def test_probe_mirrors_time_budget(mock_hass):
+    """Test that a hanging mirror does not hold up the others."""
+    async with mirror_server() as (url, _):
+        started = time.monotonic()
+        probes = await async_probe_mirrors(
+            mock_hass, [url("hanging"), url("fast")], budget=0.5
+        )
+        assert time.monotonic() - started < 2
+
+    assert "budget" in probes[0].error
+    assert probes[1].reachable
+    assert fastest_mirror(probes) is probes[1]
+
+
+def test_fastest_mirror_without_throughput():
+    """Test that latency decides if no mirror delivered data."""
+    probes = [
+        MirrorProbe("https://a.example/x.zip", latency=0.5),
+        MirrorProbe("https://b.example/x.zip", latency=0.1),
+        MirrorProbe("https://c.example/x.zip", error="Timeout"),
+    ]
+    assert fastest_mirror(probes).host == "b.example"
+    assert fastest_mirror(probes[2:]) is None
+
+
+@pytest.mark.asyncio
+async def test_coordinator_estimated_download_time(mock_hass):
+    """Test that the download time follows the fastest mirror and rate limit."""
+    coordinator = CtgpdxUpdateCoordinator(mock_hass)
+    coordinator._model = CtgpdxData(
+        generation=1, version="1.1.1", download_size=3_860_000_000
+    )
+    assert coordinator.estimated_download_time is None
+
+    # Collected by the last poll
+    urls = ["https://a.example/x.zip", "https://b.example/x.zip"]
+    coordinator._cache = {"links": urls}
+    with patch(
+        "custom_components.ctgpdx.coordinator.async_probe_mirrors",
+        AsyncMock(
+            return_value=[
+                MirrorProbe("https://a.example/x.zip", 0.1, 10_000_000),
+                MirrorProbe("https://b.example/x.zip", 0.1, 20_000_000),
+            ]
+        ),
+    ) as mock_probe:
+        await coordinator._async_probe_mirrors("1.1.1")
+    mock_probe.assert_awaited_once_with(mock_hass, urls)
+
+    assert coordinator.fastest_mirror.host == "b.example"
+    assert coordinator.estimated_download_time == 193
+
+    coordinator.downloader = MagicMock(rate_limit=1_000_000)
+    assert coordinator.estimated_download_time == 3860
@@ -0,0 +1,124 @@
+"""Tests for the CTGP-DX OpenMetrics endpoint."""
+
+import sys
+import os
+
+# Fail-safe path injection
+tests_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "tests"))
+if tests_dir not in sys.path:
+    sys.path.insert(0, tests_dir)
+
+import pytest  # noqa: E402
+from datetime import datetime, timedelta, timezone  # noqa: E402
+from unittest.mock import MagicMock, patch  # noqa: E402
+from custom_components.ctgpdx import async_setup  # noqa: E402
+from custom_components.ctgpdx.const import DOMAIN  # noqa: E402
+from custom_components.ctgpdx.coordinator import CtgpdxUpdateCoordinator  # noqa: E402
+from custom_components.ctgpdx.metrics import RefreshSample  # noqa: E402
+from custom_components.ctgpdx.openmetrics import (  # noqa: E402
+    CONTENT_TYPE,
+    CtgpdxMetricsView,
+)
+
+
+def _samples(text):
+    """Return the samples of an OpenMetrics text by name and labels."""
+    return {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+        for line in text.splitlines()
+        if not line.startswith("#")
+    }
+
+
+@pytest.mark.asyncio
+async def test_metrics_view(mock_hass):
+    """Test that refreshes are served as counters and histograms."""
+    coordinator = CtgpdxUpdateCoordinator(mock_hass)
+    mock_hass.data = {DOMAIN: {"test": coordinator}}
+    view = CtgpdxMetricsView(mock_hass)
+    started = datetime.now(timezone.utc) - timedelta(minutes=5)
+
+    metrics = coordinator.metrics
+    metrics.record(
+        RefreshSample(
+            started,
+            outcome="updated",
+            duration=0.4,
+            bytes_received=20_000,
+            phases={"ttfb": 0.2, "transfer": 0.1, "decode": 0.01, "parse": 0.05},
+        )
+    )
+    metrics.record(
+        RefreshSample(
+            started,
+            outcome="not_modified",
+            conditional=True,
+            phases={"ttfb": 0.03},
+        )
+    )
+    metrics.record(
+        RefreshSample(
+            started,
+            conditional=True,
+            error="Error communicating with CTGP-DX server",
+            error_type="ClientConnectorError",
+            phases={"ttfb": 12.0},
+        )
+    )
+
+    response = await view.get(MagicMock())
+    text = response.body.decode()
+    assert response.headers["Content-Type"] == CONTENT_TYPE
+    assert text.endswith("# EOF\n")
+
+    samples = _samples(text)
+    assert samples['ctgpdx_refreshes_total{outcome="updated"}'] == 1
+    assert samples['ctgpdx_refreshes_total{outcome="error"}'] == 1
+    assert (
+        samples['ctgpdx_refresh_failures_total{exception="ClientConnectorError"}'] == 1
+    )
+    assert samples['ctgpdx_conditional_requests_total{result="hit"}'] == 1
+    assert samples['ctgpdx_conditional_requests_total{result="miss"}'] == 0
+    assert samples['ctgpdx_fetch_duration_seconds_bucket{le="0.05"}'] == 1
+    assert samples['ctgpdx_fetch_duration_seconds_bucket{le="0.5"}'] == 2
+    assert samples['ctgpdx_fetch_duration_seconds_bucket{le="+Inf"}'] == 3
+    assert samples["ctgpdx_fetch_duration_seconds_count"] == 3
+    assert samples["ctgpdx_parse_duration_seconds_count"] == 1
+    assert samples["ctgpdx_parse_duration_seconds_sum"] == pytest.approx(0.06)
+    assert samples['ctgpdx_received_bytes_bucket{le="16384.0"}'] == 1
+    assert samples['ctgpdx_received_bytes_bucket{le="65536.0"}'] == 2
+    assert 299 < samples["ctgpdx_time_since_last_success_seconds"] < 310
+
+
+@pytest.mark.asyncio
+async def test_metrics_view_renders_once_per_refresh(mock_hass):
+    """Test that scrapes between refreshes reuse the rendered text."""
+    coordinator = CtgpdxUpdateCoordinator(mock_hass)
+    mock_hass.data = {DOMAIN: {"test": coordinator}}
+    view = CtgpdxMetricsView(mock_hass)
+    sample = RefreshSample(datetime.now(timezone.utc), outcome="updated")
+    coordinator.metrics.record(sample)
+
+    with patch(
+        "custom_components.ctgpdx.openmetrics.render_metrics", return_value=""
+    ) as mock_render:
+        for _ in range(3):
+            await view.get(MagicMock())
+        assert mock_render.call_count == 1
+
+        coordinator.metrics.record(sample)
+        await view.get(MagicMock())
+        assert mock_render.call_count == 2
+
+    mock_hass.data = {}
+    response = await view.get(MagicMock())
+    assert response.status == 404
+
+
+@pytest.mark.asyncio
+async def test_async_setup_registers_view(mock_hass):
+    """Test that the endpoint is registered once for the integration."""
+    assert await async_setup(mock_hass, {})
+    view = mock_hass.http.register_view.call_args.args[0]
+    assert isinstance(view, CtgpdxMetricsView)
+    assert view.requires_auth
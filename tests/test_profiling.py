@@ -0,0 +1,135 @@
+"""Tests for profiling a CTGP-DX refresh."""
+
+import sys
+import os
+
+# Fail-safe path injection
+tests_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "tests"))
+if tests_dir not in sys.path:
+    sys.path.insert(0, tests_dir)
+
+import json  # noqa: E402
+import pstats  # noqa: E402
+import tracemalloc  # noqa: E402
+import pytest  # noqa: E402
+from pathlib import Path  # noqa: E402
+from unittest.mock import AsyncMock, patch  # noqa: E402
+from aiohttp import ClientConnectionError  # noqa: E402
+from custom_components.ctgpdx import async_setup_entry  # noqa: E402
+from custom_components.ctgpdx.coordinator import (  # noqa: E402
+    PARSER_BACKENDS,
+    CtgpdxUpdateCoordinator,
+)
+from custom_components.ctgpdx.profiling import (  # noqa: E402
+    async_profile_refresh,
+    profile_page,
+)
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+from homeassistant.core import ServiceCall  # noqa: E402
+from homeassistant.exceptions import HomeAssistantError  # noqa: E402
+
+
+@pytest.mark.parametrize("backend", ["html_parser", "beautifulsoup"])
+def test_profile_page(sample_html, tmp_path, backend):
+    """Test that the profile covers the backends and every pattern."""
+    summary = profile_page(
+        sample_html.encode(), None, PARSER_BACKENDS[backend], tmp_path / "profile"
+    )
+
+    assert summary["data"]["version"] == "1.1.1"
+    assert pstats.Stats(summary["profile"]).total_calls > 0
+    assert "coordinator.py" in Path(summary["allocations"]).read_text()
+    assert summary["get_text"] > 0
+    assert summary["extraction"] > 0
+    assert summary["get_text"] + summary["extraction"] <= summary["duration"]
+    if backend == "beautifulsoup":
+        assert 0 < summary["beautifulsoup"] <= summary["get_text"]
+    else:
+        assert summary["beautifulsoup"] == 0
+    assert set(summary["patterns"]) >= {
+        "region_release",
+        "region_changelog",
+        "version_0",
+        "release_date_0",
+    }
+    assert summary["hot_functions"]
+    assert any("coordinator.py:" in hot["function"] for hot in summary["hot_functions"])
+    assert summary["peak_memory"] > 0
+    assert summary["top_allocations"]
+    # Tracing is only enabled while profiling
+    assert not tracemalloc.is_tracing()
+    json.dumps(summary)
+
+
+def test_profile_page_keeps_running_trace(sample_html, tmp_path):
+    """Test that the peak of a trace started by someone else is left alone."""
+    body = sample_html.encode()
+    tracemalloc.start()
+    try:
+        ballast = bytearray(4 * 1024 * 1024)
+        del ballast
+        _, peak_before = tracemalloc.get_traced_memory()
+
+        summary = profile_page(
+            body, None, PARSER_BACKENDS["html_parser"], tmp_path / "profile"
+        )
+
+        assert tracemalloc.is_tracing()
+        assert tracemalloc.get_traced_memory()[1] >= peak_before
+        assert summary["peak_memory"] is None
+        assert summary["top_allocations"]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.asyncio
+async def test_async_profile_refresh(mock_hass, sample_html, tmp_path):
+    """Test that profiling fetches the page without touching the schedule."""
+    coordinator = CtgpdxUpdateCoordinator(mock_hass)
+    mock_hass.config.path = lambda name: str(tmp_path / name)
+
+    async def fetch_page(phases):
+        phases["ttfb"] = 0.1
+        return sample_html.encode(), "utf-8"
+
+    with patch.object(coordinator, "async_fetch_page", side_effect=fetch_page):
+        summary = await async_profile_refresh(mock_hass, coordinator)
+
+    assert summary["fetch"]["ttfb"] == 0.1
+    assert summary["fetch"]["bytes_received"] == len(sample_html.encode())
+    assert summary["profile"].startswith(str(tmp_path / "ctgpdx_profile_"))
+    assert coordinator.metrics.samples == []
+    assert coordinator.data is None
+
+
+@pytest.mark.asyncio
+async def test_profile_refresh_service(mock_hass):
+    """Test that the service is always registered and reports fetch errors."""
+    entry = ConfigEntry()
+    mock_hass.config_entries.async_forward_entry_setups = AsyncMock()
+
+    with patch(
+        "custom_components.ctgpdx.CtgpdxUpdateCoordinator"
+    ) as mock_coordinator_class:
+        mock_coordinator = mock_coordinator_class.return_value
+        mock_coordinator.async_restore = AsyncMock(return_value=None)
+        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
+
+        await async_setup_entry(mock_hass, entry)
+
+    call = mock_hass.services.async_register.call_args
+    assert call.args[:2] == ("ctgpdx", "profile_refresh")
+    handler = call.args[2]
+
+    with patch(
+        "custom_components.ctgpdx.async_profile_refresh",
+        AsyncMock(return_value={"duration": 0.01}),
+    ) as mock_profile:
+        assert await handler(ServiceCall("ctgpdx", "profile_refresh")) == {
+            "duration": 0.01
+        }
+        mock_profile.assert_called_once_with(mock_hass, mock_coordinator)
+
+        mock_profile.side_effect = ClientConnectionError("Connection refused")
+        with pytest.raises(HomeAssistantError):
+            await handler(ServiceCall("ctgpdx", "profile_refresh"))
@@ -19,12 +19,13 @@ async def test_repair_issue_creation(mock_hass):
     """Test that a repair issue is created after 24 hours of failure."""
     coordinator = CtgpdxUpdateCoordinator(mock_hass)
 
-    # Set last success to 25 hours ago
-    coordinator._last_success_time = datetime.now(timezone.utc) - timedelta(hours=25)
+    # The server has been failing for 25 hours
+    coordinator.breaker.failures = 1
+    coordinator.breaker.failing_since = datetime.now(timezone.utc) - timedelta(hours=25)
 
     with (
         patch(
-            "custom_components.ctgpdx.coordinator.async_get_clientsession"
+            "custom_components.ctgpdx.coordinator.async_create_clientsession"
         ) as mock_session_factory,
         patch(
             "custom_components.ctgpdx.coordinator.async_create_issue"
@@ -41,6 +42,29 @@ async def test_repair_issue_creation(mock_hass):
         assert mock_create_issue.call_args[0][2] == "website_change"
 
 
+@pytest.mark.asyncio
+async def test_repair_issue_not_created_for_single_failure(mock_hass):
+    """Test that one failed poll after a long quiet period raises no issue."""
+    coordinator = CtgpdxUpdateCoordinator(mock_hass)
+
+    with (
+        patch(
+            "custom_components.ctgpdx.coordinator.async_create_clientsession"
+        ) as mock_session_factory,
+        patch(
+            "custom_components.ctgpdx.coordinator.async_create_issue"
+        ) as mock_create_issue,
+    ):
+        mock_session = MagicMock()
+        mock_session_factory.return_value = mock_session
+        mock_session.get.side_effect = Exception("Connection error")
+
+        with pytest.raises(Exception):
+            await coordinator._async_update_data()
+
+        mock_create_issue.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_repair_issue_deletion(mock_hass):
     """Test that a repair issue is deleted after a successful update."""
@@ -48,7 +72,7 @@ async def test_repair_issue_deletion(mock_hass):
 
     with (
         patch(
-            "custom_components.ctgpdx.coordinator.async_get_clientsession"
+            "custom_components.ctgpdx.coordinator.async_create_clientsession"
         ) as mock_session_factory,
         patch(
             "custom_components.ctgpdx.coordinator.async_delete_issue"
@@ -58,11 +82,13 @@ async def test_repair_issue_deletion(mock_hass):
         mock_session_factory.return_value = mock_session
         mock_response = MagicMock()
 
-        async def mock_text():
-            return "Version: 1.1.1"
+        async def mock_read():
+            return b"Version: 1.1.1"
 
-        mock_response.text = mock_text
+        mock_response.read = mock_read
         mock_response.raise_for_status = MagicMock()
+        mock_response.status = 200
+        mock_response.headers = {}
 
         class MockContextManager:
             async def __aenter__(self):
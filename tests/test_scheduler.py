@@ -0,0 +1,163 @@
+"""Tests for the CTGP-DX polling scheduler."""
+
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+# Fail-safe path injection
+tests_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "tests"))
+if tests_dir not in sys.path:
+    sys.path.insert(0, tests_dir)
+
+import pytest  # noqa: E402
+from unittest.mock import MagicMock  # noqa: E402
+from custom_components.ctgpdx.const import (  # noqa: E402
+    BREAKER_COOLDOWN,
+    BREAKER_THRESHOLD,
+    HOT_UPDATE_INTERVAL,
+    MAX_UPDATE_INTERVAL,
+    POLL_JITTER,
+    RETRY_INTERVAL,
+    UPDATE_INTERVAL,
+)
+from custom_components.ctgpdx.scheduler import (  # noqa: E402
+    CircuitBreaker,
+    PollScheduler,
+)
+
+
+class SimulatedClock:
+    """Clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, interval):
+        self.now += interval
+
+
+@pytest.fixture
+def clock():
+    """Return a simulated clock."""
+    return SimulatedClock()
+
+
+@pytest.fixture
+def scheduler(clock):
+    """Return a scheduler without jitter."""
+    rng = MagicMock()
+    rng.uniform.return_value = 1.0
+    return PollScheduler(clock=clock, rng=rng)
+
+
+def test_default_interval_without_history(scheduler, clock):
+    """Test that the default interval is used until a release is observed."""
+    assert scheduler.record_success(changed=False) == UPDATE_INTERVAL
+    assert scheduler.next_poll == clock.now + UPDATE_INTERVAL
+
+
+def test_hot_interval_after_change(scheduler, clock):
+    """Test that the page is polled often right after a change."""
+    assert scheduler.record_success(changed=True) == HOT_UPDATE_INTERVAL
+    clock.advance(timedelta(hours=12))
+    assert scheduler.record_success(changed=False) == HOT_UPDATE_INTERVAL
+    clock.advance(timedelta(days=1))
+    assert scheduler.record_success(changed=False) == UPDATE_INTERVAL
+
+
+def test_interval_grows_while_quiet(scheduler, clock):
+    """Test that the interval grows with the time since the last change."""
+    scheduler.record_success(changed=True)
+    clock.advance(timedelta(days=15))
+    assert scheduler.record_success(changed=False) == timedelta(hours=12)
+    clock.advance(timedelta(days=100))
+    assert scheduler.record_success(changed=False) == MAX_UPDATE_INTERVAL
+
+
+def test_polls_near_expected_release(scheduler, clock):
+    """Test that polling speeds up around the expected next release."""
+    for _ in range(3):
+        clock.advance(timedelta(days=30))
+        scheduler.record_success(changed=True)
+    # Releases came every 30 days
+    assert scheduler.expected_release == clock.now + timedelta(days=30)
+
+    # The quiet interval stops at the start of the release window
+    clock.advance(timedelta(days=28, hours=12))
+    assert scheduler.record_success(changed=False) == timedelta(hours=12)
+
+    clock.advance(timedelta(hours=12))
+    assert scheduler.record_success(changed=False) == HOT_UPDATE_INTERVAL
+
+
+def test_failures_back_off_exponentially(scheduler, clock):
+    """Test that failures back off exponentially up to the maximum."""
+    assert scheduler.record_failure() == RETRY_INTERVAL
+    assert scheduler.record_failure() == RETRY_INTERVAL * 2
+    assert scheduler.record_failure() == RETRY_INTERVAL * 4
+    for _ in range(20):
+        scheduler.record_failure()
+    assert scheduler.record_failure() == MAX_UPDATE_INTERVAL
+
+    # A success resets the backoff
+    scheduler.record_success(changed=False)
+    assert scheduler.record_failure() == RETRY_INTERVAL
+
+
+def test_intervals_are_jittered(clock):
+    """Test that every interval is jittered within bounds."""
+    scheduler = PollScheduler(clock=clock)
+    intervals = {scheduler.record_success(changed=False) for _ in range(20)}
+
+    assert len(intervals) > 1
+    for interval in intervals:
+        assert abs(interval - UPDATE_INTERVAL) <= UPDATE_INTERVAL * POLL_JITTER
+
+
+def test_history_round_trip(scheduler, clock):
+    """Test that the release history survives a restart."""
+    scheduler.record_success(changed=True)
+    clock.advance(timedelta(days=10))
+    scheduler.record_success(changed=True)
+
+    restored = PollScheduler(clock=clock)
+    restored.restore(scheduler.as_timestamps())
+
+    assert restored.changes == scheduler.changes
+    assert restored.expected_release == clock.now + timedelta(days=10)
+
+
+def test_retry_after_is_a_lower_bound(scheduler, clock):
+    """Test that a failure never plans a poll before the server asked."""
+    interval = scheduler.record_failure(not_before=timedelta(hours=2))
+    assert interval == timedelta(hours=2)
+    assert scheduler.next_poll == clock.now + timedelta(hours=2)
+
+
+def test_circuit_breaker(clock):
+    """Test that the breaker opens, probes and backs off its cool-down."""
+    breaker = CircuitBreaker(clock=clock)
+    for _ in range(BREAKER_THRESHOLD - 1):
+        breaker.record_failure()
+    assert breaker.state == "closed"
+    clock.advance(timedelta(minutes=10))
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow_request()
+    assert breaker.outage == timedelta(minutes=10)
+    assert breaker.cooldown_remaining == BREAKER_COOLDOWN
+
+    # A failed trial doubles the cool-down
+    clock.advance(BREAKER_COOLDOWN)
+    assert breaker.state == "half_open"
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.cooldown_remaining == BREAKER_COOLDOWN * 2
+
+    clock.advance(BREAKER_COOLDOWN * 2)
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.outage == timedelta(0)
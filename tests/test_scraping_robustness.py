@@ -2,6 +2,7 @@
 
 import sys
 import os
+from datetime import datetime, timezone
 
 # Fail-safe path injection
 tests_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "tests"))
@@ -35,17 +36,19 @@ async def test_robustness_varied_html(mock_hass):
     """
 
     with patch(
-        "custom_components.ctgpdx.coordinator.async_get_clientsession"
+        "custom_components.ctgpdx.coordinator.async_create_clientsession"
     ) as mock_session_factory:
         mock_session = MagicMock()
         mock_session_factory.return_value = mock_session
         mock_response = MagicMock()
 
-        async def mock_text():
-            return varied_html
+        async def mock_read():
+            return varied_html.encode()
 
-        mock_response.text = mock_text
+        mock_response.read = mock_read
         mock_response.raise_for_status = MagicMock()
+        mock_response.status = 200
+        mock_response.headers = {}
 
         class MockContextManager:
             async def __aenter__(self):
@@ -58,10 +61,10 @@ async def test_robustness_varied_html(mock_hass):
 
         data = await coordinator._async_update_data()
 
-        assert data["version"] == "1.2.3b"
-        assert data["download_size"] == "1.5 GB"
-        assert data["unpacked_size"] == "2.0 gb"
-        assert data["release_date"] == "April 10th, 2025"
+        assert data.version == "1.2.3b"
+        assert data.download_size == 1_500_000_000
+        assert data.unpacked_size == 2_000_000_000
+        assert data.release_date == datetime(2025, 4, 10, tzinfo=timezone.utc)
 
 
 @pytest.mark.asyncio
@@ -79,17 +82,19 @@ async def test_robustness_fallback_date(mock_hass):
     """
 
     with patch(
-        "custom_components.ctgpdx.coordinator.async_get_clientsession"
+        "custom_components.ctgpdx.coordinator.async_create_clientsession"
     ) as mock_session_factory:
         mock_session = MagicMock()
         mock_session_factory.return_value = mock_session
         mock_response = MagicMock()
 
-        async def mock_text():
-            return html
+        async def mock_read():
+            return html.encode()
 
-        mock_response.text = mock_text
+        mock_response.read = mock_read
         mock_response.raise_for_status = MagicMock()
+        mock_response.status = 200
+        mock_response.headers = {}
 
         class MockContextManager:
             async def __aenter__(self):
@@ -102,8 +107,8 @@ async def test_robustness_fallback_date(mock_hass):
 
         data = await coordinator._async_update_data()
 
-        assert data["version"] == "2.0"
-        assert data["release_date"] == "January 1st, 2026"
+        assert data.version == "2.0"
+        assert data.release_date == datetime(2026, 1, 1, tzinfo=timezone.utc)
 
 
 @pytest.mark.asyncio
@@ -127,17 +132,19 @@ async def test_robustness_messy_whitespace(mock_hass):
     """
 
     with patch(
-        "custom_components.ctgpdx.coordinator.async_get_clientsession"
+        "custom_components.ctgpdx.coordinator.async_create_clientsession"
     ) as mock_session_factory:
         mock_session = MagicMock()
         mock_session_factory.return_value = mock_session
         mock_response = MagicMock()
 
-        async def mock_text():
-            return html
+        async def mock_read():
+            return html.encode()
 
-        mock_response.text = mock_text
+        mock_response.read = mock_read
         mock_response.raise_for_status = MagicMock()
+        mock_response.status = 200
+        mock_response.headers = {}
 
         class MockContextManager:
             async def __aenter__(self):
@@ -150,8 +157,8 @@ async def test_robustness_messy_whitespace(mock_hass):
 
         data = await coordinator._async_update_data()
 
-        assert data["version"] == "3.4.5"
-        assert data["download_size"] == "100 MB"
+        assert data.version == "3.4.5"
+        assert data.download_size == 100_000_000
 
 
 @pytest.mark.asyncio
@@ -171,17 +178,19 @@ async def test_robustness_live_site_messy_data(mock_hass):
     """
 
     with patch(
-        "custom_components.ctgpdx.coordinator.async_get_clientsession"
+        "custom_components.ctgpdx.coordinator.async_create_clientsession"
     ) as mock_session_factory:
         mock_session = MagicMock()
         mock_session_factory.return_value = mock_session
         mock_response = MagicMock()
 
-        async def mock_text():
-            return html
+        async def mock_read():
+            return html.encode()
 
-        mock_response.text = mock_text
+        mock_response.read = mock_read
         mock_response.raise_for_status = MagicMock()
+        mock_response.status = 200
+        mock_response.headers = {}
 
         class MockContextManager:
             async def __aenter__(self):
@@ -194,6 +203,128 @@ async def test_robustness_live_site_messy_data(mock_hass):
 
         data = await coordinator._async_update_data()
 
-        assert data["version"] == "1.1.1"
-        assert data["download_size"] == "3.86 GB"
-        assert data["unpacked_size"] == "4.52 GB"
+        assert data.version == "1.1.1"
+        assert data.download_size == 3_860_000_000
+        assert data.unpacked_size == 4_520_000_000
+
+
+def test_extraction_single_scan():
+    """Test that all fields and fallback tiers are filled by one scan."""
+    from custom_components.ctgpdx import coordinator
+
+    text = (
+        "CTGP Deluxe (2.0.1) is out. Download size: 1 GB "
+        "Changelog v2.0.1 - June 3rd, 2025 July 4th, 2024 Version: 2.0.1 "
+        "Unpacked size: 2 GB"
+    )
+
+    patterns = {
+        name: MagicMock(wraps=pattern)
+        for name, pattern in coordinator._FIELD_PATTERNS.items()
+    }
+    with patch.dict(coordinator._FIELD_PATTERNS, patterns):
+        data = coordinator._extract_fields(text)
+
+    # One scan per region, as the windows of repeated anchors are merged
+    for pattern in patterns.values():
+        assert pattern.finditer.call_count == 1
+        assert pattern.search.call_count == 0
+    assert data == {
+        "version": "2.0.1",
+        "download_size": "1 GB",
+        "unpacked_size": "2 GB",
+        "release_date": "June 3rd, 2025",
+    }
+
+
+@pytest.mark.parametrize("piece_size", [1, 7, 64, 500])
+def test_extraction_in_pieces(piece_size):
+    """Test that scanning streamed text gives the same result as one scan."""
+    from custom_components.ctgpdx.coordinator import _FieldScanner, _extract_fields
+
+    text = (
+        "Latest Release If the link above doesn't work, try this one instead "
+        "(Google Drive). Version: 1. 1.1 Download size : 3.86 GB Unpacked s ize: "
+        "4.52 GB Changelogs v1.1.1 - March 23rd, 2025 v1.1.0 - February 2nd, 2025"
+    )
+
+    scanner = _FieldScanner()
+    for start in range(0, len(text), piece_size):
+        scanner.feed(text[start : start + piece_size])
+    scanner.feed("", final=True)
+
+    assert scanner.result() == _extract_fields(text)
+    assert scanner.result()["release_date"] == "March 23rd, 2025"
+
+
+def test_extraction_ignores_distant_keywords():
+    """Test that keywords only match values within a bounded window."""
+    from custom_components.ctgpdx.coordinator import _extract_fields
+
+    text = (
+        "Download " * 1000
+        + "and then, much further down the page, the size: 3 GB Version: 1.0"
+    )
+
+    assert _extract_fields(text) == {"version": "1.0"}
+
+
+def test_extraction_only_in_regions():
+    """Test that fields are only extracted from the located page sections."""
+    from custom_components.ctgpdx.coordinator import _FieldScanner
+
+    filler = "Lorem ipsum dolor sit amet. " * 200
+    text = (
+        "v0.1 released January 1st, 2020 "
+        + filler
+        + "Latest Release Version: 1.1.1 Download size: 3.86 GB "
+        + filler
+        + "Changelogs v1.1.1 - March 23rd, 2025 "
+        + filler
+        + "v9.9 - April 1st, 2030"
+    )
+
+    scanner = _FieldScanner()
+    scanner.feed(text, final=True)
+
+    release = text.index("Latest Release")
+    # "Version:" and "Download" extend the window of "Latest Release"
+    release_end = text.index("Download size") + 1024
+    changelog = text.index("Changelogs")
+    assert scanner.regions == {
+        "release": [(release, release_end)],
+        "changelog": [(changelog, changelog + 2048)],
+    }
+    assert scanner.result() == {
+        "version": "1.1.1",
+        "download_size": "3.86 GB",
+        "release_date": "March 23rd, 2025",
+    }
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ({"download_size": "3.86 GB"}, {"download_size": 3_860_000_000}),
+        ({"unpacked_size": "4.52gb"}, {"unpacked_size": 4_520_000_000}),
+        ({"download_size": "512 kB"}, {"download_size": 512_000}),
+        ({"download_size": "1.5 TB"}, {"download_size": 1_500_000_000_000}),
+        ({"download_size": "100 B"}, {"download_size": 100}),
+        ({"download_size": "1.2.3 GB"}, {}),
+        (
+            {"release_date": "March 23rd, 2025"},
+            {"release_date": datetime(2025, 3, 23, tzinfo=timezone.utc)},
+        ),
+        (
+            {"release_date": "Sept 2nd,  2025"},
+            {"release_date": datetime(2025, 9, 2, tzinfo=timezone.utc)},
+        ),
+        ({"release_date": "Someday 1, 2025"}, {}),
+        ({"version": "1.1.1"}, {"version": "1.1.1"}),
+    ],
+)
+def test_normalize_data(raw, expected):
+    """Test that sizes become bytes and release dates datetimes."""
+    from custom_components.ctgpdx.coordinator import normalize_data
+
+    assert normalize_data(raw) == expected
@@ -0,0 +1,82 @@
+"""Tests for the CTGP-DX sensors."""
+
+import sys
+import os
+from dataclasses import replace
+from datetime import datetime, timezone
+
+# Fail-safe path injection
+tests_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "tests"))
+if tests_dir not in sys.path:
+    sys.path.insert(0, tests_dir)
+
+from unittest.mock import MagicMock  # noqa: E402
+from custom_components.ctgpdx.models import CtgpdxData  # noqa: E402
+from custom_components.ctgpdx.sensor import CtgpdxSensor  # noqa: E402
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+
+DATA = CtgpdxData(
+    generation=1,
+    version="1.1.1",
+    download_size=3_860_000_000,
+    release_date=datetime(2025, 3, 23, tzinfo=timezone.utc),
+)
+
+
+def _sensor(sensor_type):
+    """Return a sensor with a mocked state writer."""
+    coordinator = MagicMock()
+    coordinator.data = DATA
+    coordinator.last_update_success = True
+    sensor = CtgpdxSensor(coordinator, ConfigEntry(), sensor_type, "Test", "mdi:test")
+    sensor.async_write_ha_state = MagicMock()
+    return sensor
+
+
+def _update(sensor, **changes):
+    """Publish a new generation of data with some values changed."""
+    data = sensor.coordinator.data
+    sensor.coordinator.data = replace(data, generation=data.generation + 1, **changes)
+    sensor._handle_coordinator_update()
+
+
+def test_sensor_writes_only_changes():
+    """Test that an update with unchanged values writes no state."""
+    sensor = _sensor("version")
+
+    sensor._handle_coordinator_update()
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 1
+
+    # Other fields changing do not concern this sensor
+    _update(sensor, download_size=4_000_000_000)
+    assert sensor.async_write_ha_state.call_count == 1
+
+    # Attributes and availability do
+    _update(sensor, release_date=datetime(2025, 4, 1, tzinfo=timezone.utc))
+    assert sensor.async_write_ha_state.call_count == 2
+    sensor.coordinator.last_update_success = False
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 3
+
+
+def test_sensor_values_are_typed():
+    """Test that the sensors report the normalized values."""
+    assert _sensor("download_size").native_value == 3_860_000_000
+    assert _sensor("unpacked_size").native_value is None
+    assert _sensor("release_date").native_value == DATA.release_date
+    assert _sensor("version").extra_state_attributes["release_date"] == (
+        DATA.release_date
+    )
+
+
+def test_sensor_attributes_cached_per_generation():
+    """Test that attributes are only rebuilt for a new data generation."""
+    sensor = _sensor("version")
+    attributes = sensor.extra_state_attributes
+    assert sensor.extra_state_attributes is attributes
+    assert sensor.device_info is sensor.device_info
+
+    _update(sensor, version="1.1.2")
+    assert sensor.extra_state_attributes is not attributes
+    assert sensor.extra_state_attributes == attributes
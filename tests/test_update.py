@@ -0,0 +1,70 @@
+"""Tests for the CTGP-DX update entity."""
+
+import sys
+import os
+
+# Fail-safe path injection
+tests_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "tests"))
+if tests_dir not in sys.path:
+    sys.path.insert(0, tests_dir)
+
+import pytest  # noqa: E402
+from dataclasses import replace  # noqa: E402
+from unittest.mock import AsyncMock, MagicMock, patch  # noqa: E402
+from custom_components.ctgpdx.models import CtgpdxData  # noqa: E402
+from custom_components.ctgpdx.update import CtgpdxUpdateEntity  # noqa: E402
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+
+DATA = CtgpdxData(generation=1, version="1.1.1")
+
+
+def _entity():
+    """Return an update entity with a mocked state writer."""
+    coordinator = MagicMock()
+    coordinator.data = DATA
+    coordinator.async_get_release_notes = AsyncMock(return_value="### v1.1.1")
+    entity = CtgpdxUpdateEntity(coordinator, ConfigEntry())
+    entity.async_write_ha_state = MagicMock()
+    return entity
+
+
+@pytest.mark.asyncio
+async def test_update_installed_version():
+    """Test that the first seen version counts as installed until installed."""
+    entity = _entity()
+    await entity.async_added_to_hass()
+    assert entity.installed_version == "1.1.1"
+
+    entity.coordinator.data = replace(DATA, generation=2, version="1.2.0")
+    entity._handle_coordinator_update()
+    assert entity.installed_version == "1.1.1"
+    assert entity.latest_version == "1.2.0"
+
+    await entity.async_install(None, False)
+    assert entity.installed_version == "1.2.0"
+    entity.async_write_ha_state.assert_called()
+
+
+@pytest.mark.asyncio
+async def test_update_restores_installed_version():
+    """Test that the installed version survives a restart."""
+    entity = _entity()
+    last_state = MagicMock()
+    last_state.attributes = {"installed_version": "1.0.0"}
+    with patch.object(
+        entity, "async_get_last_state", AsyncMock(return_value=last_state)
+    ):
+        await entity.async_added_to_hass()
+    assert entity.installed_version == "1.0.0"
+
+
+@pytest.mark.asyncio
+async def test_update_release_notes():
+    """Test that release notes are fetched for the latest version."""
+    entity = _entity()
+    assert await entity.async_release_notes() == "### v1.1.1"
+    entity.coordinator.async_get_release_notes.assert_awaited_once_with("1.1.1")
+
+    entity.coordinator.data = None
+    assert entity.latest_version is None
+    assert await entity.async_release_notes() is None
@@ -0,0 +1,174 @@
+"""Tests for indexing the CTGP-DX release archive."""
+
+import sys
+import os
+
+# Fail-safe path injection
+tests_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "tests"))
+if tests_dir not in sys.path:
+    sys.path.insert(0, tests_dir)
+
+import io  # noqa: E402
+import zipfile  # noqa: E402
+import zlib  # noqa: E402
+import pytest  # noqa: E402
+from contextlib import asynccontextmanager  # noqa: E402
+from unittest.mock import patch  # noqa: E402
+from aiohttp import ClientSession, web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+from custom_components.ctgpdx.coordinator import CtgpdxUpdateCoordinator  # noqa: E402
+from custom_components.ctgpdx.zip_index import (  # noqa: E402
+    ZipIndex,
+    ZipIndexError,
+    async_read_zip_index,
+    parse_central_directory,
+)
+
+
+def _archive(files, comment=b"", force_zip64=False):
+    """Build a ZIP archive in memory."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.comment = comment
+        archive.mkdir("romfs")
+        for name, content in files.items():
+            with archive.open(name, "w", force_zip64=force_zip64) as file:
+                file.write(content)
+    return buffer.getvalue()
+
+
+@asynccontextmanager
+async def archive_server(archive, ranges=True):
+    """Serve an archive locally, recording the bytes sent."""
+    sent = []
+
+    async def handle(request):
+        if not ranges or not (value := request.headers.get("Range")):
+            response = web.StreamResponse()
+            response.content_length = len(archive)
+            await response.prepare(request)
+            # The client is expected to give up before reading all of it
+            sent.append(0)
+            return response
+        first, last = value.removeprefix("bytes=").split("-")
+        if not first:
+            first, last = max(0, len(archive) - int(last)), len(archive) - 1
+        first, last = int(first), min(int(last or len(archive) - 1), len(archive) - 1)
+        sent.append(last - first + 1)
+        return web.Response(
+            status=206,
+            body=archive[first : last + 1],
+            headers={"Content-Range": f"bytes {first}-{last}/{len(archive)}"},
+        )
+
+    app = web.Application()
+    app.router.add_get("/release.zip", handle)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        async with ClientSession() as session:
+            with patch(
+                "custom_components.ctgpdx.zip_index.async_get_clientsession",
+                return_value=session,
+            ):
+                yield str(server.make_url("/release.zip")), sent
+    finally:
+        await server.close()
+
+
+FILES = {
+    "romfs/Course/track.szs": os.urandom(300_000),
+    "romfs/UI/text.msbt": b"Hello " * 10_000,
+    "exefs/main.npdm": b"\x00" * 10,
+}
+
+
+@pytest.mark.asyncio
+async def test_zip_index_reads_central_directory(mock_hass):
+    """Test that sizes and CRCs come from the tail of the archive only."""
+    archive = _archive(FILES, comment=b"PK\x05\x06 in a comment")
+
+    async with archive_server(archive) as (url, sent):
+        index = await async_read_zip_index(mock_hass, url, "1.1.1")
+
+    assert index.version == "1.1.1"
+    assert index.archive_size == len(archive)
+    assert index.file_count == 3
+    assert index.unpacked_size == sum(len(content) for content in FILES.values())
+    assert {entry.name: entry.crc32 for entry in index.entries} == {
+        "romfs/": 0,
+        **{name: zlib.crc32(content) for name, content in FILES.items()},
+    }
+    # Only the tail was requested
+    assert sent == [65_577]
+    assert ZipIndex.from_dict(index.as_dict()) == index
+
+
+@pytest.mark.asyncio
+async def test_zip_index_large_central_directory(mock_hass):
+    """Test that a central directory outside of the tail is requested."""
+    files = {f"romfs/Course/{number:05}.szs": b"track" for number in range(1500)}
+    archive = _archive(files)
+
+    async with archive_server(archive) as (url, sent):
+        index = await async_read_zip_index(mock_hass, url, "1.1.1")
+
+    assert index.file_count == 1500
+    assert index.unpacked_size == 1500 * 5
+    # The tail, then exactly the central directory
+    directory_size = len(archive) - 22 - archive.index(b"PK\x01\x02")
+    assert sent == [65_577, directory_size]
+
+
+@pytest.mark.asyncio
+async def test_zip_index_without_range_support(mock_hass):
+    """Test that a server ignoring ranges is not read to the end."""
+    archive = _archive(FILES)
+
+    async with archive_server(archive, ranges=False) as (url, _):
+        with pytest.raises(ZipIndexError):
+            await async_read_zip_index(mock_hass, url, "1.1.1")
+
+
+def test_zip_index_zip64_sizes():
+    """Test that ZIP64 sizes are read from the extra field."""
+    archive = _archive(FILES, force_zip64=True)
+    with zipfile.ZipFile(io.BytesIO(archive)) as reference:
+        expected = [(info.filename, info.file_size) for info in reference.infolist()]
+    start = archive.index(b"PK\x01\x02")
+
+    entries = parse_central_directory(archive[start:], len(expected))
+    assert [(entry.name, entry.size) for entry in entries] == expected
+
+    with pytest.raises(ZipIndexError):
+        parse_central_directory(archive[start : start + 60], len(expected))
+
+
+@pytest.mark.asyncio
+async def test_coordinator_uses_zip_index(mock_hass):
+    """Test that the indexed unpacked size replaces the scraped one."""
+    coordinator = CtgpdxUpdateCoordinator(mock_hass)
+    await coordinator._store.async_save(
+        {"data": {"version": "1.1.1", "unpacked_size": "4.52 GB"}}
+    )
+    await coordinator.async_restore()
+    assert coordinator.data.unpacked_size == 4_520_000_000
+    assert coordinator.data.file_count is None
+
+    archive = _archive(FILES)
+    async with archive_server(archive) as (url, _):
+        # Collected by the last poll
+        coordinator._cache["links"] = [url]
+        await coordinator._async_update_zip_index("1.1.1")
+
+    assert coordinator.data.unpacked_size == 360_010
+    assert coordinator.data.file_count == 3
+    assert coordinator.data.generation == 2
+
+    # The index is read from storage after a restart
+    restarted = CtgpdxUpdateCoordinator(mock_hass)
+    restarted._store = coordinator._store
+    restarted._zip_index_store = coordinator._zip_index_store
+    await restarted.async_restore()
+    assert restarted.data.unpacked_size == 360_010
+    assert restarted.zip_index.version == "1.1.1"